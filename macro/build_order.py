@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+
+from micro.census import get_census
+from micro.production import count_structure, count_units
+
+
+@dataclass
+class BuildOrderEntry:
+    position: int  # position in the compiled entries
+    unit_type: UnitTypeId = None  # None for time gates
+    target: Optional[int] = None
+    time: float = None  # game seconds of a time gate
+    structure: bool = False
+
+
+class BuildOrderExecutor:
+    """
+    Build order compiled into a cursor over its entries.
+    Entries: {type: n} blocks until n are counted, {type: -n} produces up to n without blocking,
+    {type: None} produces without limit, {type: 0} is skipped, an int waits until that game time.
+
+    Every entry before the cursor is done: time gates that passed, skipped entries, and blocking entries whose
+    units/structures exist. Non-blocking and unlimited entries before the cursor stay in a watch list.
+    A retired blocking entry is only looked at again when a unit of its type is lost (rewind).
+    """
+
+    def __init__(self, build_order: list[Union[int, dict[UnitTypeId, int]]], structures: set[UnitTypeId]):
+        self.entries: list[BuildOrderEntry] = []
+        for order in build_order:
+            if isinstance(order, int):
+                self.entries.append(BuildOrderEntry(len(self.entries), time=order))
+            elif isinstance(order, dict):
+                unit_type, target = next(iter(order.items()))
+                self.entries.append(BuildOrderEntry(len(self.entries), unit_type, target, structure=unit_type in structures))
+
+        self.cursor = 0
+        self.watch: list[BuildOrderEntry] = []  # non-blocking/unlimited entries before the cursor
+        self.retired: dict[UnitTypeId, list[int]] = {}  # unit type -> positions of retired blocking entries
+
+    def _count(self, bot: BotAI, entry: BuildOrderEntry) -> int:
+        return count_structure(bot, entry.unit_type) if entry.structure else count_units(bot, entry.unit_type)
+
+    def _settled(self, bot: BotAI, entry: BuildOrderEntry) -> bool:
+        """Whether the target is met by existing units/structures (no queued order or worker en route)."""
+        census = get_census(bot)
+        if entry.structure:
+            return census.structures[entry.unit_type] >= entry.target
+        return census.units[entry.unit_type] + census.loaded[entry.unit_type] >= entry.target
+
+    def due(self, bot: BotAI) -> list[BuildOrderEntry]:
+        """Entries to produce this step, in build order."""
+        due = [entry for entry in self.watch if entry.target is None or self._count(bot, entry) < -entry.target]
+
+        advancing = True  # the cursor moves over the done prefix only
+        for position in range(self.cursor, len(self.entries)):
+            entry = self.entries[position]
+            done = True
+
+            if entry.time is not None:
+                if bot.time < entry.time:
+                    break
+            elif entry.target == 0:
+                pass
+            elif entry.target is None:
+                due.append(entry)
+                if advancing:
+                    self.watch.append(entry)
+            elif entry.target < 0:
+                if self._count(bot, entry) < -entry.target:
+                    due.append(entry)
+                if advancing:
+                    self.watch.append(entry)
+            else:
+                if self._count(bot, entry) < entry.target:
+                    due.append(entry)
+                    break
+                done = self._settled(bot, entry)
+                if done and advancing:
+                    self.retired.setdefault(entry.unit_type, []).append(position)
+
+            advancing = advancing and done
+            if advancing:
+                self.cursor = position + 1
+
+        return due
+
+    def rewind(self, unit_type: UnitTypeId) -> None:
+        """A unit/structure of this type was lost, its retired blocking entries are counted again."""
+        positions = self.retired.get(unit_type)
+        if not positions:
+            return
+        self.cursor = min(self.cursor, positions[0])
+        self.watch = [entry for entry in self.watch if entry.position < self.cursor]
+        for retired_type in list(self.retired):
+            self.retired[retired_type] = [position for position in self.retired[retired_type] if position < self.cursor]
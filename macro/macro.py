@@ -3,8 +3,11 @@ from sc2.position import Point2
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.ability_id import AbilityId
 
-from micro.production import count_units, create_unit, count_structure
+from micro.production import create_unit, count_planned_structures
+from micro.placement import build, free_geyser
+from micro.worker import mule_drop
 from strategy.map_analysis import MapAnalysis
+from .build_order import BuildOrderExecutor
 
 PRODUCTION_STRUCTURES = {
     UnitTypeId.BARRACKS, UnitTypeId.FACTORY, UnitTypeId.STARPORT,
@@ -33,7 +36,7 @@ BUILD_ORDER = [
             {UnitTypeId.FACTORYTECHLAB: -1},
             {UnitTypeId.STARPORTTECHLAB: -1},
             {UnitTypeId.SIEGETANK: 1},
-            {UnitTypeId.VIKING: 1},
+            {UnitTypeId.VIKINGFIGHTER: 1},
             {UnitTypeId.BARRACKS: 5},
             {UnitTypeId.BARRACKSTECHLAB: 2},
             {UnitTypeId.BARRACKS: 5},
@@ -48,12 +51,14 @@ BUILD_ORDER = [
 UPGRADE_ORDER = []
 
 class Macro():
+    # Class name -> Macro subclass, filled at import. Types only, no game state: shared by every bot in the process
     registry: dict[str, type['Macro']] = {}
 
     def __init__(self, bot: BotAI, build_order = BUILD_ORDER, update_order = UPGRADE_ORDER) -> None:
         self.bot = bot
         self.build_order = build_order
         self.update_order = update_order
+        self.executor = BuildOrderExecutor(build_order, {UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED} | PRODUCTION_STRUCTURES)
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -63,38 +68,19 @@ class Macro():
         await self.produce()
         await self.upgrade()
 
+    def schedule(self, scheduler) -> None:
+        """Register the macro's own subsystems in the bot's scheduler, none by default."""
+
+    def on_unit_lost(self, unit_type: UnitTypeId) -> None:
+        """An own unit/structure was destroyed or morphed away, its build order entries are counted again."""
+        self.executor.rewind(unit_type)
+
     async def produce(self):
-        for i, order in enumerate(self.build_order):
-            if isinstance(order, int):
-                # Wait until game time (in game seconds)
-                if self.bot.time < order:
-                    break  # Stop processing if we haven't reached this time yet
-                continue
-
-            elif isinstance(order, dict):
-                unit_type, target = next(iter(order.items()))
-
-                if target == 0:
-                    continue  # skip
-
-                # if unit is a structure
-                if unit_type in {UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED} | PRODUCTION_STRUCTURES:
-                    if target is None:  # Unlimited production
-                        await self.produce_structure(unit_type)
-                        continue
-                    elif count_structure(self.bot, unit_type) < abs(target):
-                        await self.produce_structure(unit_type)
-                        if target > 0:
-                            break
-
-                else:  # Regular units
-                    if target is None:  # Unlimited production
-                        await create_unit(self.bot, unit_type)
-                        continue
-                    elif count_units(self.bot, unit_type) < abs(target):
-                        await create_unit(self.bot, unit_type)
-                        if target > 0:
-                            break
+        for entry in self.executor.due(self.bot):
+            if entry.structure:
+                await self.produce_structure(entry.unit_type)
+            else:
+                await create_unit(self.bot, entry.unit_type)
 
     async def produce_structure(self, unit_type: UnitTypeId):
         townhall = self.bot.townhalls.first
@@ -103,10 +89,15 @@ class Macro():
             return
 
         if unit_type is UnitTypeId.REFINERY:
-            vespene = self.bot.vespene_geyser.closest_to(townhall)
-            await self.bot.build(UnitTypeId.REFINERY, vespene)
+            vespene = free_geyser(self.bot, townhall)
+            if vespene is not None:
+                await build(self.bot, UnitTypeId.REFINERY, vespene)
         elif unit_type is UnitTypeId.ORBITALCOMMAND:
              townhall.build(UnitTypeId.ORBITALCOMMAND)
+        elif unit_type is UnitTypeId.BARRACKSTECHLAB:
+            barracks = [barrack for barrack in self.bot.structures(UnitTypeId.BARRACKS).ready.idle if barrack.add_on_tag == 0]
+            if barracks:
+                barracks[0](AbilityId.BUILD_TECHLAB_BARRACKS)
         elif unit_type is UnitTypeId.FACTORYTECHLAB:
             if self.bot.structures(UnitTypeId.FACTORY).ready:
                 starport = self.bot.structures(UnitTypeId.FACTORY).ready.first
@@ -120,13 +111,13 @@ class Macro():
         else:
             location = townhall
             if hasattr(self.bot, 'map_analysis'):
+                # Skip the slots that workers en route are about to take
+                planned = count_planned_structures(self.bot, unit_type)
                 if unit_type in PRODUCTION_STRUCTURES:
-                    map_analysis: MapAnalysis = self.bot.map_analysis
-                    location = self.valid_location(map_analysis.unit_placement.get("barracks", []))
+                    location = self.valid_location("barracks", skip=planned)
                 if unit_type in {UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED}:
-                    map_analysis: MapAnalysis = self.bot.map_analysis
-                    location = self.valid_location(map_analysis.unit_placement.get("supply", []))
-            await self.bot.build(unit_type, near=location)
+                    location = self.valid_location("supply", skip=planned)
+            await build(self.bot, unit_type, near=location)
 
     async def produce_unit(self, unit_type: UnitTypeId):
         townhall = self.bot.townhalls.first
@@ -135,20 +126,16 @@ class Macro():
             return
 
         if unit_type is UnitTypeId.MULE:
-            for oc in self.bot.structures(UnitTypeId.ORBITALCOMMAND).ready:
-                if oc.energy >= 50:
-                    mfs = self.bot.mineral_field.closer_than(10, oc)
-                    if mfs:
-                        oc(AbilityId.CALLDOWNMULE_CALLDOWNMULE, mfs.random)
+            await mule_drop(self.bot)
         else:
             self.bot.build(unit_type, near=townhall)
     
-    def valid_location(self, locations):
-        if locations:
-            for loc in locations:
-                # Check if location is free (no structures nearby)
-                if not self.bot.structures.closer_than(3, loc):
-                    return Point2((loc[0], loc[1]))
+    def valid_location(self, kind: str, skip: int = 0):
+        # First placement slot no structure was started on
+        map_analysis: MapAnalysis = self.bot.map_analysis
+        slot = map_analysis.next_free_slot(kind, skip)
+        if slot is not None:
+            return Point2((slot[0], slot[1]))
                 
         return self.bot.townhalls.first.position
     
@@ -4,7 +4,8 @@ from sc2.ids.ability_id import AbilityId
 from sc2.unit import Unit
 
 from macro.macro import Macro
-from micro.worker import saturate_gas, back_to_mining, balance_workers, mule_drop
+from micro.mining import manage_mining
+from micro.worker import mule_drop
 from micro.production import count_structure, count_units, create_unit
 from tactical.tactical import bunker_micro, handle_ramp_depots, siege_on_enemy, rally_on_ramp
 
@@ -41,9 +42,7 @@ class MacroOneBase(Macro):
 
         # Base production
         await create_unit(self.bot, UnitTypeId.SCV, count=self.target_n_worker)
-        await saturate_gas(self.bot)
-        await back_to_mining(self.bot)
-        # await balance_workers(self)
+        await manage_mining(self.bot)
         await mule_drop(self.bot)
         await create_unit(self.bot, UnitTypeId.MARINE, count=self.target_n_marine)
 
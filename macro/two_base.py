@@ -6,17 +6,17 @@ from sc2.unit import Unit
 from sc2.position import Point2
 
 from macro.macro import Macro
-from micro.worker import back_to_mining, mule_drop
+from micro.registry import get_registry
+from micro.worker import mule_drop
+from micro.placement import build
 from micro.production import count_structure, count_units, create_expansion, create_unit, maintain_supply, natural_location
-from tactical.worker import saturate_gas, balance_workers
-from micro.bunker import bunker_micro
-from micro.tank import siege_on_enemy
 from tactical.tactical import manage_army_positioning, medivac_support_marine, marine_guard_tank
-from tactical.ramp import handle_ramp_depots, rally_on_ramp
+from strategy.scheduler import TaskScheduler, HIGH, NORMAL
 
 
 class MacroTwoBase(Macro):
     def __init__(self, bot: BotAI, build_order: list[Union[int, dict[UnitTypeId, int]]], update: list[AbilityId]) -> None:
+        super().__init__(bot, build_order, update)
         self.bot: BotAI = bot
         self.build_order: list[Union[int, dict[UnitTypeId, int]]] = build_order
         self.update: list[AbilityId] = update
@@ -28,16 +28,42 @@ class MacroTwoBase(Macro):
         self.early_build_order: bool = True
         self.early_worker_spray: bool = True
         self.early_rallypoint: bool = True
-        self.early_worker: Unit = None
-        self.early_vespene: Unit = None
-        self.early_vespene_worker: Unit = None
+        self.early_vespene: Unit = None  # a geyser, only its tag and position are used
         self.early_time_to_vespene: float = None
-        self.early_vespene_workers: list[Unit] = []
-        self.early_factory_worker: Unit = None
+        # The early workers are registry roles ("builder", "vespene_builder", "vespene_transfer", "factory_builder"),
+        # resolved every step so a dead or stale Unit is never kept
 
         self.corner_depots = list(bot.main_base_ramp.corner_depots)
 
+        self.handed_over: bool = False  # 5 barracks this step, the hand-over subsystems run
+
+    def schedule(self, scheduler: TaskScheduler) -> None:
+        """
+        Hand-over subsystems by frequency (steps), economy first to be deferred when a step is over budget.
+        Mining, rallies, depots, bunkers and sieges are run by the strategy, SCVs, marines and MULEs by on_step.
+        """
+        handed_over = lambda: self.handed_over
+        # strategy
+        scheduler.add("manage_army_positioning", manage_army_positioning, period=4, when=handed_over)
+        # Supply
+        scheduler.add("maintain_supply", maintain_supply, period=2, when=handed_over)
+        # Units
+        scheduler.add("create_siegetank", lambda bot: create_unit(bot, UnitTypeId.SIEGETANK), when=handed_over)
+        scheduler.add("create_medivac", lambda bot: create_unit(bot, UnitTypeId.MEDIVAC), when=handed_over)
+        # Rebuild Expansions
+        scheduler.add("rebuild_expansions", self.rebuild_expansions, period=8, when=handed_over)
+        # micro
+        scheduler.add("marine_guard_tank", lambda bot: marine_guard_tank(bot, support=4), period=2, priority=HIGH, when=handed_over)
+        scheduler.add("medivac_support_marine", medivac_support_marine, period=2, priority=NORMAL, when=handed_over)
+
+    async def rebuild_expansions(self, bot: BotAI) -> None:
+        n_cc = count_structure(bot, UnitTypeId.COMMANDCENTER)
+        if n_cc < 5:
+            self.target_n_worker = n_cc * 22
+            await create_expansion(bot)
+
     async def on_step(self, iteration: int) -> None:
+        self.handed_over = False
         if len(self.bot.townhalls) == 0:
             return
 
@@ -45,7 +71,10 @@ class MacroTwoBase(Macro):
         townhall = self.bot.townhalls.closest_to(self.bot.start_location)
         natural = self.bot.townhalls.closest_to(natural_position)
         natural = None if natural_position.distance_to(natural) > 2 else natural
-        depots = self.bot.structures.of_type({UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED})
+        registry = get_registry(self.bot)
+        depots = registry.units(self.bot, {UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED})
+        early_worker = registry.first(self.bot, "builder")
+        early_vespene_worker = registry.first(self.bot, "vespene_builder")
 
         # Unit Production
         await mule_drop(self.bot)
@@ -69,41 +98,43 @@ class MacroTwoBase(Macro):
 
         #2- Send next workers to mineral
         if self.bot.supply_workers == 13:
-            if self.bot.townhalls.ready and self.early_worker is None:
+            if self.bot.townhalls.ready and early_worker is None:
                 print("2- Sending next worker to minerals")
                 townhall(AbilityId.RALLY_COMMANDCENTER, self.bot.mineral_field.closest_to(townhall))
-                self.early_worker = self.bot.workers.sorted(lambda w: w.tag)[-1]
+                early_worker = self.bot.workers.sorted(lambda w: w.tag)[-1]
+                registry.assign(early_worker, "builder", exclusive=True)
 
         #3- Build Ramp Depot#1
-        if self.early_worker and len(depots) == 0:
+        if early_worker and len(depots) == 0:
             if self.bot.can_afford(UnitTypeId.SUPPLYDEPOT):
                 print("3- Building Depot#1")
-                self.early_worker.build(UnitTypeId.SUPPLYDEPOT, self.corner_depots[0])
-                self.early_worker.move(self.bot.main_base_ramp.barracks_correct_placement, queue=True)
+                early_worker.build(UnitTypeId.SUPPLYDEPOT, self.corner_depots[0])
+                early_worker.move(self.bot.main_base_ramp.barracks_correct_placement, queue=True)
 
         #4- Build Ramp Barrack
-        if self.early_worker and len(depots.ready) > 0 and count_structure(self.bot, UnitTypeId.BARRACKS) == 0:
-            if self.bot.can_afford(UnitTypeId.BARRACKS) and not self.early_worker.is_constructing_scv:
+        if early_worker and len(depots.ready) > 0 and count_structure(self.bot, UnitTypeId.BARRACKS) == 0:
+            if self.bot.can_afford(UnitTypeId.BARRACKS) and not early_worker.is_constructing_scv:
                 print("4- Building Barracks")
                 natural_position = natural_location(self.bot)
-                self.early_worker.build(UnitTypeId.BARRACKS, self.bot.main_base_ramp.barracks_correct_placement)
-                halfway_pos = natural_position.towards(self.early_worker.position, 0.5)
+                early_worker.build(UnitTypeId.BARRACKS, self.bot.main_base_ramp.barracks_correct_placement)
+                halfway_pos = natural_position.towards(early_worker.position, 0.5)
                 mineral_patch = self.bot.mineral_field.closest_to(halfway_pos)
-                self.early_worker.gather(mineral_patch, queue=True)
-                self.early_worker.move(natural_position, queue=True)
+                early_worker.gather(mineral_patch, queue=True)
+                early_worker.move(natural_position, queue=True)
 
         #5- Build Refinery
         if self.bot.structures(UnitTypeId.BARRACKS) and count_structure(self.bot, UnitTypeId.REFINERY) == 0:
             if self.early_vespene is None:
                self.early_vespene = self.bot.vespene_geyser.closest_to(townhall)
-            if self.early_vespene and self.early_vespene_worker is None:
+            if self.early_vespene and early_vespene_worker is None:
                 available_workers = self.bot.workers.filter(lambda w: not w.is_carrying_minerals and not w.is_constructing_scv)
-                self.early_vespene_worker = available_workers.closest_to(self.early_vespene) if available_workers else None
-            if self.early_vespene and self.early_vespene_worker and self.bot.can_afford(UnitTypeId.REFINERY):
+                early_vespene_worker = available_workers.closest_to(self.early_vespene) if available_workers else None
+                registry.assign(early_vespene_worker, "vespene_builder", exclusive=True)
+            if self.early_vespene and early_vespene_worker and self.bot.can_afford(UnitTypeId.REFINERY):
                 print("5- Building Refinery")
-                self.early_vespene_worker.build(UnitTypeId.REFINERY, self.early_vespene)
+                early_vespene_worker.build(UnitTypeId.REFINERY, self.early_vespene)
                 self.early_time_to_vespene = self.bot.time + 20
-                self.early_vespene_worker.move(self.early_vespene.position.towards(townhall, 2), queue=True)
+                early_vespene_worker.move(self.early_vespene.position.towards(townhall, 2), queue=True)
 
         #6- Pre-saturate the Refinery
         if self.early_time_to_vespene is not None and self.early_time_to_vespene < self.bot.time:
@@ -115,17 +146,19 @@ class MacroTwoBase(Macro):
                 available_workers.remove(worker)
                 if worker:
                     worker.move(self.early_vespene.position.towards(townhall, 1), queue=True)
-                    self.early_vespene_workers.append(worker)
+                    registry.assign(worker, "vespene_transfer")
 
         #7- Saturate the Refinery
-        if self.bot.structures(UnitTypeId.REFINERY) and len(self.early_vespene_workers) > 0:
+        vespene_workers = registry.role(self.bot, "vespene_transfer")
+        if self.bot.structures(UnitTypeId.REFINERY) and vespene_workers:
             print("7- Saturating Refinery")
             refinery = self.bot.structures(UnitTypeId.REFINERY).first
-            self.early_vespene_worker.move(self.early_vespene.position.towards(townhall, 2))
-            self.early_vespene_worker.gather(refinery, queue=True)
-            for worker in self.early_vespene_workers:
+            if early_vespene_worker:
+                early_vespene_worker.move(self.early_vespene.position.towards(townhall, 2))
+                early_vespene_worker.gather(refinery, queue=True)
+            for worker in vespene_workers:
                 worker.gather(refinery)
-            del self.early_vespene_workers[:]
+            registry.clear_role("vespene_transfer")
 
         #8- Build Scout Reaper
         if self.bot.structures(UnitTypeId.BARRACKS).ready and count_units(self.bot, UnitTypeId.REAPER) == 0:
@@ -148,9 +181,10 @@ class MacroTwoBase(Macro):
             if self.bot.can_afford(UnitTypeId.COMMANDCENTER):
                 print("10- Building Expansion Command Center")
                 natural_position = natural_location(self.bot)
-                self.early_worker.build(UnitTypeId.COMMANDCENTER, natural_position)
-                mineral_position = self.bot.mineral_field.closest_to(natural_position)
-                self.early_worker.gather(mineral_position, queue=True)
+                if early_worker:
+                    early_worker.build(UnitTypeId.COMMANDCENTER, natural_position)
+                    mineral_position = self.bot.mineral_field.closest_to(natural_position)
+                    early_worker.gather(mineral_position, queue=True)
 
         if natural is None:
             return  # wait for natural expansion
@@ -160,9 +194,10 @@ class MacroTwoBase(Macro):
             if self.bot.can_afford(UnitTypeId.SUPPLYDEPOT):
                 print("Building Depot#2")
                 available_workers = self.bot.workers.filter(lambda w: not w.is_carrying_minerals and not w.is_constructing_scv)
-                self.early_worker = available_workers.closest_to(self.corner_depots[1]) if available_workers else None
-                if self.early_worker:
-                    self.early_worker.build(UnitTypeId.SUPPLYDEPOT, self.corner_depots[1])
+                early_worker = available_workers.closest_to(self.corner_depots[1]) if available_workers else None
+                registry.assign(early_worker, "builder", exclusive=True)
+                if early_worker:
+                    early_worker.build(UnitTypeId.SUPPLYDEPOT, self.corner_depots[1])
 
         #11- Build Ramp Barrack Reactor
         if self.bot.structures(UnitTypeId.BARRACKS).ready:
@@ -173,12 +208,12 @@ class MacroTwoBase(Macro):
 
         #12- Build Safety Bunker
         if count_structure(self.bot, UnitTypeId.BUNKER) == 0 and len(depots.ready) >= 2:
-            if self.bot.can_afford(UnitTypeId.BUNKER) and not self.early_worker.is_constructing_scv:
+            if self.bot.can_afford(UnitTypeId.BUNKER) and early_worker and not early_worker.is_constructing_scv:
                 print("Building Safety Bunker")
                 bunker_placement = natural_location(self.bot).towards(self.bot.enemy_start_locations[0], 5)
-                if self.early_worker.build(UnitTypeId.BUNKER, bunker_placement):
+                if early_worker.build(UnitTypeId.BUNKER, bunker_placement):
                     mineral_position = self.bot.mineral_field.closest_to(natural)
-                    self.early_worker.gather(mineral_position, queue=True)
+                    early_worker.gather(mineral_position, queue=True)
                     self.target_n_marine = 4
 
         #13- Build Factory
@@ -186,10 +221,11 @@ class MacroTwoBase(Macro):
             if self.bot.can_afford(UnitTypeId.FACTORY):
                 print("Building Factory")
                 available_workers = self.bot.workers.filter(lambda w: not w.is_carrying_minerals and not w.is_constructing_scv)
-                self.early_factory_worker = available_workers.closest_to(self.bot.start_location) if available_workers else None
-                if self.early_factory_worker:
+                factory_worker = available_workers.closest_to(self.bot.start_location) if available_workers else None
+                registry.assign(factory_worker, "factory_builder", exclusive=True)
+                if factory_worker:
                     placement = self.bot.map_analysis.unit_placement["barracks"][0]
-                    await self.bot.build(UnitTypeId.FACTORY, near=Point2((placement[0], placement[1])), max_distance=1)
+                    await build(self.bot, UnitTypeId.FACTORY, near=Point2((placement[0], placement[1])), max_distance=1)
 
         #14- Build Refinery
         if self.bot.structures(UnitTypeId.FACTORY) and count_structure(self.bot, UnitTypeId.REFINERY) == 1:
@@ -198,10 +234,11 @@ class MacroTwoBase(Macro):
             free_geysers = [g for g in geysers if g.position not in taken_geysers]
             self.early_vespene = free_geysers[0] if free_geysers else None
             available_workers = self.bot.workers.filter(lambda w: not w.is_carrying_minerals and not w.is_constructing_scv)
-            self.early_vespene_worker = available_workers.closest_to(self.early_vespene) if available_workers else None
-            if self.early_vespene and self.early_vespene_worker and self.bot.can_afford(UnitTypeId.REFINERY):
+            early_vespene_worker = available_workers.closest_to(self.early_vespene) if available_workers and self.early_vespene else None
+            registry.assign(early_vespene_worker, "vespene_builder", exclusive=True)
+            if self.early_vespene and early_vespene_worker and self.bot.can_afford(UnitTypeId.REFINERY):
                 print("Building Refinery")
-                self.early_vespene_worker.build(UnitTypeId.REFINERY, self.early_vespene)
+                early_vespene_worker.build(UnitTypeId.REFINERY, self.early_vespene)
 
         #15- Build Starport
         if self.bot.structures(UnitTypeId.FACTORY).ready and not self.bot.structures(UnitTypeId.STARPORT).exists:
@@ -209,7 +246,7 @@ class MacroTwoBase(Macro):
                 print("Building Starport")
                 factory = self.bot.structures(UnitTypeId.FACTORY).ready.first
                 placement = self.bot.map_analysis.unit_placement["barracks"][1]
-                await self.bot.build(UnitTypeId.STARPORT, near=Point2((placement[0], placement[1])), max_distance=1)
+                await build(self.bot, UnitTypeId.STARPORT, near=Point2((placement[0], placement[1])), max_distance=1)
 
         #16- Build Factory Tech Lab
         if self.bot.structures(UnitTypeId.STARPORT):
@@ -234,7 +271,7 @@ class MacroTwoBase(Macro):
             for vespene in vespenes:
                 if self.bot.can_afford(UnitTypeId.REFINERY) and not self.bot.structures(UnitTypeId.REFINERY).closer_than(1, vespene):
                     print("Building Refinery")
-                    await self.bot.build(UnitTypeId.REFINERY, vespene)
+                    await build(self.bot, UnitTypeId.REFINERY, vespene)
 
         #19- Build a engineering bay
         if (
@@ -243,7 +280,7 @@ class MacroTwoBase(Macro):
         ):
             if self.bot.can_afford(UnitTypeId.ENGINEERINGBAY):
                 print("Building Engineering Bay")
-                await self.bot.build(UnitTypeId.ENGINEERINGBAY, near=natural.position.towards(self.bot.enemy_start_locations[0], -10))
+                await build(self.bot, UnitTypeId.ENGINEERINGBAY, near=natural.position.towards(self.bot.enemy_start_locations[0], -10))
 
         #20- Build 4 Barracks in a line (Make sure to have the 500minerals)
         n_barrack = count_structure(self.bot, UnitTypeId.BARRACKS)
@@ -255,7 +292,7 @@ class MacroTwoBase(Macro):
             print("Building Barracks")
             barrack = self.bot.structures(UnitTypeId.BARRACKS).ready.first
             placement = self.bot.map_analysis.unit_placement["barracks"][1 + n_barrack]
-            await self.bot.build(UnitTypeId.BARRACKS, near=Point2((placement[0], placement[1])), max_distance=1)
+            await build(self.bot, UnitTypeId.BARRACKS, near=Point2((placement[0], placement[1])), max_distance=1)
 
         #21- Build 4 Reactors
         if self.bot.structures(UnitTypeId.BARRACKS).ready and self.bot.can_afford(UnitTypeId.REACTOR):
@@ -268,35 +305,4 @@ class MacroTwoBase(Macro):
         if count_structure(self.bot, UnitTypeId.BARRACKS) >= 5:
             self.target_n_marine = 100
             self.early_build_order = False
-
-            # strategy
-            await manage_army_positioning(self.bot)
-
-            # Workers
-            await saturate_gas(self.bot)
-            await back_to_mining(self.bot)
-            await balance_workers(self.bot)
-            await mule_drop(self.bot)
-
-            # Supply
-            await maintain_supply(self.bot)
-
-            # Units
-            await rally_on_ramp(self.bot)
-            await create_unit(self.bot, UnitTypeId.SCV, self.target_n_worker)
-            await create_unit(self.bot, UnitTypeId.SIEGETANK)
-            await create_unit(self.bot, UnitTypeId.MARINE, self.target_n_marine)
-            await create_unit(self.bot, UnitTypeId.MEDIVAC)
-
-            # Rebuild Expansions
-            n_cc = count_structure(self.bot, UnitTypeId.COMMANDCENTER)
-            if n_cc < 5:
-                self.target_n_worker = n_cc * 22
-                await create_expansion(self.bot)
-
-            # micro
-            await bunker_micro(self.bot)
-            await handle_ramp_depots(self.bot)
-            await siege_on_enemy(self.bot)
-            await marine_guard_tank(self.bot, support=4)
-            await medivac_support_marine(self.bot)
+            self.handed_over = True
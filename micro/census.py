@@ -0,0 +1,75 @@
+from collections import Counter
+
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+
+from .terran_data import MORPHS, PRODUCTION_STRUCTURES, get_creation_tables
+
+WORKER_TYPES = {UnitTypeId.SCV, UnitTypeId.MULE}
+TRANSPORT_TYPES = {UnitTypeId.MEDIVAC, UnitTypeId.BUNKER}
+
+
+class UnitCensus:
+    """
+    Counts of own units and structures, built in a single pass over the observation.
+    Orders are counted by the unit type they create so every count is a dictionary lookup afterwards.
+    """
+
+    def __init__(self, bot: BotAI):
+        self.game_loop = bot.state.game_loop
+        self.created_units = get_creation_tables(bot).created_units
+
+        self.units = Counter()  # unit type -> units on the map
+        self.structures = Counter()  # structure type -> structures, ready or not
+        self.not_ready = Counter()  # structure type -> structures under construction
+        self.planned = Counter()  # structure type -> worker orders to build it
+        self.orders = Counter()  # (unit/structure type, created type) -> queued orders (production, morphs)
+        self.loaded = Counter()  # unit type -> units inside medivacs and bunkers
+
+        for unit in bot.units:
+            self.units[unit.type_id] += 1
+            self._count_orders(unit, self.planned if unit.type_id in WORKER_TYPES else None)
+            if unit.type_id in TRANSPORT_TYPES:
+                self._count_passengers(unit)
+
+        for structure in bot.structures:
+            self.structures[structure.type_id] += 1
+            if not structure.is_ready:
+                self.not_ready[structure.type_id] += 1
+            self._count_orders(structure)
+            if structure.type_id in TRANSPORT_TYPES:
+                self._count_passengers(structure)
+
+    def _count_orders(self, unit, planned: Counter = None) -> None:
+        for order in unit.orders:
+            created_type = self.created_units.get(order.ability.id)
+            if created_type is None:
+                continue
+            if planned is not None:
+                planned[created_type] += 1
+            else:
+                self.orders[(unit.type_id, created_type)] += 1
+
+    def _count_passengers(self, transport) -> None:
+        for passenger in transport.passengers:
+            self.loaded[passenger.type_id] += 1
+
+    def in_production(self, unit_type: UnitTypeId) -> int:
+        """Units queued in their production structures."""
+        return sum(self.orders[(structure_type, unit_type)] for structure_type in PRODUCTION_STRUCTURES.get(unit_type, []))
+
+    def morphing(self, unit_type: UnitTypeId) -> int:
+        """Units and structures being upgraded/morphed to a type."""
+        if unit_type not in MORPHS:
+            return 0
+        source_type, _ = MORPHS[unit_type]
+        return self.orders[(source_type, unit_type)]
+
+
+def get_census(bot: BotAI) -> UnitCensus:
+    """The census of the current step, built on first use."""
+    census = getattr(bot, "_census", None)
+    if census is None or census.game_loop != bot.state.game_loop:
+        census = UnitCensus(bot)
+        bot._census = census
+    return census
@@ -0,0 +1,114 @@
+from collections import Counter
+from typing import Union
+
+from sc2.bot_ai import BotAI
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2
+from sc2.unit import Unit
+
+# Abilities compared against the structure's rally targets instead of its orders
+RALLY_ABILITIES = {
+    AbilityId.RALLY_BUILDING,
+    AbilityId.RALLY_UNITS,
+    AbilityId.RALLY_WORKERS,
+    AbilityId.RALLY_COMMANDCENTER,
+    AbilityId.RALLY_MORPHING_UNIT,
+}
+
+
+class CommandFilter:
+    """
+    Drops unit commands that would not change anything.
+    A command is a duplicate when the unit is already executing it (first order, or rally target for rallies),
+    or when the same (ability, target) was sent to the unit less than `window` seconds ago.
+    Points closer than `tolerance` are the same target. Queued commands always pass.
+    """
+
+    def __init__(self, bot: BotAI, window: float = 2.0, tolerance: float = 0.5):
+        self.bot = bot
+        self.window = window
+        self.tolerance = tolerance
+        self.last: dict[int, tuple] = {}  # tag -> (generic ability, target, time) of the last command sent
+
+        # Statistics
+        self.sent: Counter = Counter()  # generic ability -> commands sent
+        self.saved: Counter = Counter()  # generic ability -> duplicates dropped
+
+    def _generic(self, ability: AbilityId) -> AbilityId:
+        """Remapped ability id, as found in unit orders."""
+        data = self.bot.game_data.abilities.get(ability.value)
+        return data.id if data is not None else ability
+
+    def _target(self, target) -> Union[int, Point2, None]:
+        if isinstance(target, Unit):
+            return target.tag
+        if isinstance(target, Point2):
+            return target.to2
+        return target
+
+    def _same(self, a, b) -> bool:
+        if isinstance(a, Point2) and isinstance(b, Point2):
+            return a.distance_to_point2(b) < self.tolerance
+        return a == b
+
+    def _executing(self, unit: Unit, ability: AbilityId, target) -> bool:
+        if ability in RALLY_ABILITIES:
+            if len(unit.rally_targets) != 1:
+                return False
+            rally = unit.rally_targets[0]
+            return self._same(rally.tag if isinstance(target, int) else rally.point, target)
+        if not unit.orders:
+            return False
+        order = unit.orders[0]
+        return order.ability.id == ability and self._same(order.target, target)
+
+    def duplicate(self, unit: Unit, ability: AbilityId, target=None) -> bool:
+        """Whether the command would repeat the unit's current order or its last command within the window."""
+        ability = self._generic(ability)
+        target = self._target(target)
+        if self._executing(unit, ability, target):
+            return True
+        last = self.last.get(unit.tag)
+        return (
+            last is not None
+            and last[0] == ability
+            and self.bot.time - last[2] < self.window
+            and self._same(last[1], target)
+        )
+
+    def issue(self, unit: Unit, ability: AbilityId, target=None, queue: bool = False) -> bool:
+        """Send the command unless it is a duplicate. Returns whether it was sent."""
+        generic = self._generic(ability)
+        if not queue and self.duplicate(unit, ability, target):
+            self.saved[generic] += 1
+            return False
+        if target is None:
+            unit(ability, queue=queue)
+        else:
+            unit(ability, target, queue=queue)
+        self.last[unit.tag] = (generic, self._target(target), self.bot.time)
+        self.sent[generic] += 1
+        return True
+
+    def forget(self, tag: int) -> None:
+        """Drop the memory of a destroyed unit."""
+        self.last.pop(tag, None)
+
+    def report(self) -> None:
+        sent, saved = sum(self.sent.values()), sum(self.saved.values())
+        total = sent + saved
+        print(f"Commands: {sent} sent, {saved} duplicates dropped ({100.0 * saved / total if total else 0.0:.1f}%)")
+        for ability, count in self.saved.most_common():
+            print(f"  {ability.name}: {count} dropped, {self.sent[ability]} sent")
+
+
+def command(bot: BotAI, unit: Unit, ability: AbilityId, target=None, queue: bool = False) -> bool:
+    """unit(ability, target) through the bot's command filter when it has one. Returns whether it was sent."""
+    commands: CommandFilter = getattr(bot, "commands", None)
+    if commands is None:
+        if target is None:
+            unit(ability, queue=queue)
+        else:
+            unit(ability, target, queue=queue)
+        return True
+    return commands.issue(unit, ability, target, queue)
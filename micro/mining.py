@@ -0,0 +1,298 @@
+from collections import Counter
+
+from sc2.bot_ai import BotAI
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+
+from strategy.mineral_lines import position_key
+
+from .commands import command
+
+MINERAL_SATURATION = 2  # workers per patch before the mining rate stops growing
+MINERAL_SINGLE = 1  # a lone worker never waits for its patch, the second one sometimes does
+MINERAL_OVERSATURATION = 3
+GAS_SATURATION = 3
+BASE_RADIUS = 10  # resources closer than this to a townhall belong to its base
+HARVEST_ABILITIES = {AbilityId.HARVEST_GATHER, AbilityId.HARVEST_RETURN}
+
+
+def _mineral_line(bot: BotAI, townhall: Unit) -> list[int]:
+    """Mineral tags of the townhall's expansion, shortest trip first, from the map analysis geometry.
+    None when the townhall is not on an expansion location or the map was not analyzed."""
+    map_analysis = getattr(bot, "map_analysis", None)
+    if map_analysis is None or len(map_analysis.mineral_lines.mineral_positions) == 0:
+        return None
+    expansion_id = map_analysis.expansion_id(townhall.position)
+    if expansion_id is None:
+        return None
+    lines = map_analysis.mineral_lines
+    patches = lines.patches(expansion_id)
+    rows = {position_key(p): row for row, p in zip(patches, lines.mineral_positions[patches.start:patches.stop].tolist())}
+    minerals = [(rows[position_key(m.position)], m.tag) for m in bot.mineral_field if position_key(m.position) in rows]
+    return [tag for _, tag in sorted(minerals)]
+
+
+class WorkerAssignment:
+    """
+    Persistent worker -> resource assignment, kept in tag tables updated from unit created/destroyed events.
+    Each step only the changes are handled: new or idle workers, lost patches and bases, refineries missing workers,
+    and bases over their saturation while another base has room.
+    """
+
+    def __init__(self):
+        self.assignments: dict[int, int] = {}  # worker tag -> resource tag
+        self.workers: dict[int, set[int]] = {}  # resource tag -> worker tags
+        self.bases: dict[int, list[int]] = {}  # townhall tag -> mineral tags, shortest trip first
+        self.base_positions: dict[int, tuple] = {}  # townhall tag -> position
+        self.base_of: dict[int, int] = {}  # resource tag -> townhall tag (None for a refinery without base)
+        self.base_workers = Counter()  # townhall tag -> workers assigned to its minerals
+        self.gas: set[int] = set()  # refinery tags
+        self.pending: set[int] = set()  # worker tags to (re)assign
+        self.started = False
+
+        # Statistics
+        self.moves = 0
+
+    # Events
+
+    def on_unit_created(self, unit: Unit) -> None:
+        if unit.type_id == UnitTypeId.SCV:
+            self.pending.add(unit.tag)
+
+    def on_unit_destroyed(self, tag: int) -> None:
+        self.pending.discard(tag)
+        if tag in self.assignments:
+            self._release(tag)
+        elif tag in self.bases:
+            self._remove_base(tag)
+        elif tag in self.workers:
+            self._remove_resource(tag)
+
+    # Tables
+
+    def _assign(self, worker: int, resource: int) -> None:
+        if worker in self.assignments:
+            self._release(worker)
+        self.assignments[worker] = resource
+        self.workers[resource].add(worker)
+        if resource not in self.gas and self.base_of.get(resource) is not None:
+            self.base_workers[self.base_of[resource]] += 1
+
+    def _release(self, worker: int) -> int:
+        resource = self.assignments.pop(worker)
+        self.workers[resource].discard(worker)
+        if resource not in self.gas and self.base_of.get(resource) is not None:
+            self.base_workers[self.base_of[resource]] -= 1
+        return resource
+
+    def _add_resource(self, resource: int, base: int) -> None:
+        self.workers.setdefault(resource, set())
+        self.base_of[resource] = base
+
+    def _remove_resource(self, resource: int) -> None:
+        for worker in list(self.workers[resource]):
+            self._release(worker)
+            self.pending.add(worker)
+        base = self.base_of.pop(resource)
+        del self.workers[resource]
+        self.gas.discard(resource)
+        if base in self.bases and resource in self.bases[base]:
+            self.bases[base].remove(resource)
+
+    def _add_base(self, bot: BotAI, townhall: Unit) -> None:
+        minerals = _mineral_line(bot, townhall)
+        if minerals is None:
+            minerals = [m.tag for m in bot.mineral_field.closer_than(BASE_RADIUS, townhall).sorted_by_distance_to(townhall)]
+        self.bases[townhall.tag] = [mineral for mineral in minerals if mineral not in self.base_of]
+        self.base_positions[townhall.tag] = townhall.position
+        for mineral in self.bases[townhall.tag]:
+            self._add_resource(mineral, townhall.tag)
+
+    def _remove_base(self, townhall: int) -> None:
+        for mineral in list(self.bases[townhall]):
+            self._remove_resource(mineral)
+        for refinery in self.gas:
+            if self.base_of[refinery] == townhall:
+                self.base_of[refinery] = None
+        del self.bases[townhall]
+        del self.base_positions[townhall]
+        del self.base_workers[townhall]
+
+    def _sync_structures(self, bot: BotAI) -> None:
+        """Register new bases and refineries (a handful of structures, compared by tag)."""
+        for townhall in bot.townhalls.ready:
+            if townhall.tag not in self.bases:
+                self._add_base(bot, townhall)
+        for refinery in bot.gas_buildings.ready:
+            if refinery.tag not in self.gas and refinery.has_vespene:
+                base = min(
+                    (tag for tag, position in self.base_positions.items() if position.distance_to(refinery) < BASE_RADIUS),
+                    key=lambda tag: self.base_positions[tag].distance_to(refinery),
+                    default=None,
+                )
+                self.gas.add(refinery.tag)
+                self._add_resource(refinery.tag, base)
+            elif refinery.tag in self.gas and not refinery.has_vespene:
+                self._remove_resource(refinery.tag)
+            elif refinery.tag in self.gas and refinery.assigned_harvesters > len(self.workers[refinery.tag]):
+                self._adopt(bot, refinery)
+
+    def _adopt(self, bot: BotAI, refinery: Unit) -> None:
+        """Take over workers sent to the refinery by other code (scripted openings)."""
+        for worker in bot.workers:
+            if worker.orders and worker.orders[0].target == refinery.tag and self.assignments.get(worker.tag) != refinery.tag:
+                self._assign(worker.tag, refinery.tag)
+                self.pending.discard(worker.tag)
+
+    # Decisions
+
+    def _capacity(self, base: int) -> int:
+        return MINERAL_SATURATION * len(self.bases[base])
+
+    def _patch(self, base: int, limit: int):
+        """Least loaded patch of the base under `limit` workers, shortest trips first."""
+        patch = min(self.bases[base], key=lambda mineral: len(self.workers[mineral]), default=None)
+        return patch if patch is not None and len(self.workers[patch]) < limit else None
+
+    def _choose(self, position) -> int:
+        """
+        Mineral patch for a worker: the closest base with an empty patch, then the closest with room, oversaturating
+        only when every base is full (the walk to another base costs less than waiting behind a second miner).
+        """
+        bases = sorted(self.bases, key=lambda base: self.base_positions[base].distance_to(position))
+        for limit in (MINERAL_SINGLE, MINERAL_SATURATION, MINERAL_OVERSATURATION):
+            for base in bases:
+                patch = self._patch(base, limit)
+                if patch is not None:
+                    return patch
+        return self._patch(bases[0], float("inf")) if bases else None
+
+    @staticmethod
+    def _free(bot: BotAI, worker: Unit) -> bool:
+        """Idle, or harvesting without a registry role: orders from the manager override nothing scripted."""
+        if not worker.orders:
+            return True
+        if worker.orders[0].ability.id not in HARVEST_ABILITIES:
+            return False  # building, moving on a rally, repairing...
+        registry = getattr(bot, "unit_registry", None)
+        return registry is None or worker.tag not in registry.role_of
+
+    def _take_worker(self, bot: BotAI, base: int, units: dict):
+        """A worker mining the base's minerals, from its most loaded patch (empty-handed first), None if there is none."""
+        candidates = []
+        for other in ([base] if base in self.bases else list(self.bases)):
+            minerals = set(self.bases[other])
+            for mineral in minerals:
+                for tag in self.workers[mineral]:
+                    worker = units.get(tag)
+                    if worker is None or not worker.orders or not self._free(bot, worker):
+                        continue
+                    order = worker.orders[0]
+                    if order.ability.id == AbilityId.HARVEST_GATHER and order.target not in minerals:
+                        continue
+                    candidates.append((-len(self.workers[mineral]), worker.is_carrying_resource, tag))
+        if not candidates:
+            return None
+        worker = min(candidates)[2]
+        self._release(worker)
+        return worker
+
+    def _take_pending(self, bot: BotAI, units: dict):
+        """A pending worker free for orders, None if there is none."""
+        for tag in sorted(self.pending):
+            if tag in units and self._free(bot, units[tag]):
+                self.pending.discard(tag)
+                return tag
+        return None
+
+    def _gather(self, bot: BotAI, worker: Unit, resources: dict) -> None:
+        if worker.tag not in self.assignments:
+            return
+        resource = resources.get(self.assignments[worker.tag])
+        if resource is None:
+            # Depleted without a destroyed event, the worker is assigned again next step
+            self._remove_resource(self.assignments[worker.tag])
+            return
+        if worker.is_carrying_resource:
+            command(bot, worker, AbilityId.HARVEST_RETURN)
+            command(bot, worker, AbilityId.HARVEST_GATHER, resource, queue=True)
+        else:
+            command(bot, worker, AbilityId.HARVEST_GATHER, resource)
+
+    async def step(self, bot: BotAI) -> None:
+        if not self.started:
+            self.started = True
+            self.pending.update(worker.tag for worker in bot.workers)
+
+        self._sync_structures(bot)
+        units = {worker.tag: worker for worker in bot.workers}
+
+        # Idle workers go back to their resource, or get one
+        changed = set()
+        for worker in units.values():
+            if worker.is_idle:
+                changed.add(worker.tag)
+                if worker.tag not in self.assignments:
+                    self.pending.add(worker.tag)
+
+        # Refineries first, with workers from their own base
+        for refinery in self.gas:
+            while len(self.workers[refinery]) < GAS_SATURATION:
+                worker = self._take_worker(bot, self.base_of[refinery], units) or self._take_pending(bot, units)
+                if worker is None:
+                    break
+                self._assign(worker, refinery)
+                changed.add(worker)
+
+        # Then minerals, new workers on a scripted order (rally to the ramp) wait until they are idle
+        if self.pending:
+            for worker in sorted(self.pending):
+                if worker not in units:
+                    continue  # inside a refinery or not seen yet
+                if not self._free(bot, units[worker]):
+                    continue
+                patch = self._choose(units[worker].position)
+                if patch is None:
+                    break
+                self._assign(worker, patch)
+                self.pending.discard(worker)
+                changed.add(worker)
+
+        # Move workers from oversaturated bases to bases with room
+        for base in list(self.bases):
+            surplus = self.base_workers[base] - self._capacity(base)
+            while surplus > 0:
+                targets = [other for other in self.bases if self.base_workers[other] < self._capacity(other)]
+                if not targets:
+                    break
+                target = min(targets, key=lambda other: self.base_positions[other].distance_to(self.base_positions[base]))
+                worker = self._take_worker(bot, base, units)
+                if worker is None:
+                    break
+                self._assign(worker, self._patch(target, MINERAL_SATURATION))
+                changed.add(worker)
+                self.moves += 1
+                surplus -= 1
+
+        # Orders for the workers whose assignment changed
+        changed = {worker for worker in changed if worker in self.assignments}
+        if changed:
+            resources = {resource.tag: resource for resource in bot.resources}
+            resources.update((refinery.tag, refinery) for refinery in bot.gas_buildings)
+            for worker in changed:
+                if worker in units:
+                    self._gather(bot, units[worker], resources)
+
+
+def get_worker_assignment(bot: BotAI) -> WorkerAssignment:
+    """The bot's worker assignment, created on first use (without events, only idle workers are noticed)."""
+    mining = getattr(bot, "mining", None)
+    if mining is None:
+        mining = bot.mining = WorkerAssignment()
+    return mining
+
+
+async def manage_mining(bot: BotAI):
+    """Assign workers to minerals and gas, and keep bases evenly saturated."""
+    await get_worker_assignment(bot).step(bot)
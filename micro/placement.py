@@ -0,0 +1,232 @@
+import random
+from dataclasses import dataclass
+from typing import Union
+
+from s2clientprotocol import query_pb2 as query_pb
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from .terran_data import get_creation_tables
+
+GAS_BUILDINGS = {UnitTypeId.REFINERY, UnitTypeId.REFINERYRICH}
+
+
+@dataclass
+class PlacementRequest:
+    building: UnitTypeId
+    near: Point2
+    max_distance: int
+    build_worker: Unit
+    random_alternative: bool
+    placement_step: int
+    ring: int = 0  # next ring of candidates to try, 0 is `near` itself
+    reserved_loop: int = -1  # game loop the cost was taken from bot.minerals / bot.vespene
+
+
+class PlacementService:
+    """
+    Per-step batching of bot.build calls.
+    Requests are collected during the step and resolved by flush(): each round sends the next ring of candidate
+    positions of every pending request in a single placement query. Answers are cached until a structure is
+    started or destroyed.
+    The cost of a request is taken from the bot's minerals and gas when it is queued, like bot.build does, so
+    production later in the step can not spend it; it is given back if the build is not ordered.
+    """
+
+    def __init__(self, bot: BotAI, claim_timeout: float = 20.0):
+        self.bot = bot
+        self.claim_timeout = claim_timeout
+        self.pending: list[PlacementRequest] = []
+        self.cache: dict[tuple, bool] = {}  # (ability id, x, y) -> placeable
+        self.claims: list[tuple] = []  # (position, footprint radius, time) of issued but not started builds
+
+        # Statistics
+        self.queries = 0
+        self.queried_positions = 0
+        self.cache_hits = 0
+
+    def request(
+        self,
+        building: UnitTypeId,
+        near: Union[Unit, Point2],
+        max_distance: int = 20,
+        build_worker: Unit = None,
+        random_alternative: bool = True,
+        placement_step: int = 2,
+    ) -> bool:
+        """Queue a build, same arguments as bot.build. Returns False if it can not be queued."""
+        if not self.bot.can_afford(building):
+            return False
+
+        # Gas buildings target the geyser unit, no placement query needed
+        if building in GAS_BUILDINGS:
+            builder = build_worker or self.bot.select_build_worker(near)
+            if builder is None:
+                return False
+            builder.build_gas(near)
+            return True
+
+        near = near.position.to2 if isinstance(near, Unit) else near.to2
+        request = PlacementRequest(building, near, max_distance, build_worker, random_alternative, placement_step)
+        self._reserve(request)
+        self.pending.append(request)
+        return True
+
+    @property
+    def reserved(self) -> tuple[int, int]:
+        """Minerals and gas held by the pending requests of this step."""
+        minerals = vespene = 0
+        for request in self.pending:
+            if request.reserved_loop == self.bot.state.game_loop:
+                cost = self.bot.calculate_cost(request.building)
+                minerals, vespene = minerals + cost.minerals, vespene + cost.vespene
+        return minerals, vespene
+
+    def _reserve(self, request: PlacementRequest) -> None:
+        cost = self.bot.calculate_cost(request.building)
+        self.bot.minerals -= cost.minerals
+        self.bot.vespene -= cost.vespene
+        request.reserved_loop = self.bot.state.game_loop
+
+    def _release(self, request: PlacementRequest) -> None:
+        """Give the reserved cost back (only within its step, the next observation resets the resources)."""
+        if request.reserved_loop == self.bot.state.game_loop:
+            cost = self.bot.calculate_cost(request.building)
+            self.bot.minerals += cost.minerals
+            self.bot.vespene += cost.vespene
+        request.reserved_loop = -1
+
+    def invalidate(self) -> None:
+        """Forget cached answers, called when a structure is started or destroyed."""
+        self.cache.clear()
+        self._expire_claims()
+
+    def _expire_claims(self) -> None:
+        """Drop the claims of builds that never started (worker killed or blocked)."""
+        self.claims = [claim for claim in self.claims if self.bot.time - claim[2] < self.claim_timeout]
+
+    def _ring(self, request: PlacementRequest) -> list:
+        """Candidate positions of the request's current ring, in the same order as bot.find_placement."""
+        if request.ring == 0:
+            return [request.near]
+        distance, step = request.ring * request.placement_step, request.placement_step
+        offsets = (
+            [(dx, -distance) for dx in range(-distance, distance + 1, step)]
+            + [(dx, distance) for dx in range(-distance, distance + 1, step)]
+            + [(-distance, dy) for dy in range(-distance, distance + 1, step)]
+            + [(distance, dy) for dy in range(-distance, distance + 1, step)]
+        )
+        return [Point2(offset).offset(request.near).to2 for offset in offsets]
+
+    def _exhausted(self, request: PlacementRequest) -> bool:
+        if request.ring == 0:
+            return False
+        return request.max_distance == 0 or request.ring * request.placement_step >= request.max_distance
+
+    def _ability(self, building: UnitTypeId):
+        return get_creation_tables(self.bot).abilities.get(building)
+
+    def _claimed(self, position: Point2, radius: float) -> bool:
+        for claimed, claimed_radius, _ in self.claims:
+            reach = radius + claimed_radius
+            if abs(claimed.x - position.x) < reach and abs(claimed.y - position.y) < reach:
+                return True
+        return False
+
+    async def _query(self, keys: list) -> None:
+        """Resolve all uncached (ability, x, y) keys with one placement query."""
+        missing = list(dict.fromkeys(key for key in keys if key not in self.cache))
+        self.cache_hits += len(keys) - len(missing)
+        if not missing:
+            return
+
+        result = await self.bot.client._execute(
+            query=query_pb.RequestQuery(
+                placements=(
+                    query_pb.RequestQueryBuildingPlacement(ability_id=ability.value, target_pos=Point2((x, y)).as_Point2D)
+                    for ability, x, y in missing
+                ),
+                ignore_resource_requirements=True,
+            )
+        )
+        self.queries += 1
+        self.queried_positions += len(missing)
+        # Success enum value is 1
+        for key, placement in zip(missing, result.query.placements):
+            self.cache[key] = placement.result == 1
+
+    async def flush(self) -> None:
+        """Resolve every pending request and order the builds."""
+        self._expire_claims()
+        requests = []
+        for request in self.pending:
+            if self._ability(request.building) is not None:
+                requests.append(request)
+            else:
+                self._release(request)
+        self.pending = []
+
+        while requests:
+            rings = {id(request): self._ring(request) for request in requests}
+            await self._query([
+                (self._ability(request.building), p.x, p.y) for request in requests for p in rings[id(request)]
+            ])
+
+            unresolved = []
+            for request in requests:
+                ability = self._ability(request.building)
+                radius = self.bot.game_data.units[request.building.value].footprint_radius or 0
+                possible = [
+                    p for p in rings[id(request)]
+                    if self.cache[(ability, p.x, p.y)] and not self._claimed(p, radius)
+                ]
+
+                if possible:
+                    if request.random_alternative:
+                        position = random.choice(possible)
+                    else:
+                        position = min(possible, key=lambda p: p.distance_to_point2(request.near))
+                    self._issue(request, position, radius)
+                else:
+                    request.ring += 1
+                    if not self._exhausted(request):
+                        unresolved.append(request)
+                    else:
+                        self._release(request)
+            requests = unresolved
+
+    def _issue(self, request: PlacementRequest, position: Point2, radius: float) -> None:
+        # The reserved cost is handed back and subtracted again by the build command
+        self._release(request)
+        if not self.bot.can_afford(request.building):
+            return  # reserved in an earlier step, the money was spent since
+        builder = request.build_worker or self.bot.select_build_worker(position)
+        if builder is None:
+            return
+        self.bot.do(builder.build(request.building, position), subtract_cost=True, ignore_warning=True)
+        self.claims.append((position, radius, self.bot.time))
+
+
+async def build(bot: BotAI, building: UnitTypeId, near: Union[Unit, Point2], **kwargs) -> bool:
+    """bot.build through the bot's placement service (resolved at the end of the step) when it has one."""
+    service: PlacementService = getattr(bot, "placement", None)
+    if service is None:
+        return await bot.build(building, near, **kwargs)
+    return service.request(building, near, **kwargs)
+
+
+def free_geyser(bot: BotAI, near: Union[Unit, Point2], distance: float = 10) -> Unit:
+    """
+    The geyser closest to `near` among those next to a townhall, skipping geysers that have a gas building or a
+    worker ordered to build one (the order targets the geyser tag, or its position). None if all are taken.
+    """
+    taken = {gas.position for gas in bot.gas_buildings}
+    targets = {order.target for worker in bot.workers for order in worker.orders}
+    for geyser in bot.vespene_geyser.sorted_by_distance_to(near):
+        if geyser.position in taken or geyser.tag in targets or geyser.position in targets:
+            continue
+        if bot.townhalls.closer_than(distance, geyser):
+            return geyser
+    return None
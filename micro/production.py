@@ -4,9 +4,14 @@ from sc2.unit import Unit
 from sc2.position import Point2
 from sc2.ids.unit_typeid import UnitTypeId
 
+from .census import get_census
+from .placement import build
 from .terran_data import PRODUCTION_STRUCTURES, TERRAN_UNIT_INFO
 
 def natural_location(bot: BotAI) -> Point2:
+    if hasattr(bot, 'map_analysis') and bot.map_analysis.natural_location is not None:
+        return bot.map_analysis.natural_location.position
+
     ramp_pos = bot.main_base_ramp.top_center
 
     expansion_locations = bot.expansion_locations_list
@@ -18,110 +23,37 @@ def count_planned_structures(bot: BotAI, structure_type: UnitTypeId) -> int:
     """
     Count structures that workers are en route to build.
     """
-    planned_count = 0
-
-    # Count planned structures (workers en route)
-    for worker in bot.workers:
-        if worker.orders:
-            for order in worker.orders:
-                # Check if worker is going to build this structure type
-                creation_ability = bot.game_data.units[structure_type.value].creation_ability
-                if creation_ability and order.ability.id == creation_ability.id:
-                    planned_count += 1
-    
-    return planned_count
+    return get_census(bot).planned[structure_type]
 
 def count_structure(bot: BotAI, structure_type: UnitTypeId) -> int:
     """
     Count structures in ALL states including workers en route, upgrades, etc.
     """
-    total_count = 0
-    
-    # 1. Count completed structures
-    total_count += bot.structures(structure_type).amount
-    
-    # 2. Count planned structures (workers en route)
-    total_count += count_planned_structures(bot, structure_type)
-
-    # 3. Remove the double counting of planned/being built structures
-    total_count -= bot.structures(structure_type).not_ready.amount
-
-    # 4. Count structures being upgraded/morphed TO this type
-    upgrade_mappings = {
-        UnitTypeId.ORBITALCOMMAND: UnitTypeId.COMMANDCENTER,
-        UnitTypeId.PLANETARYFORTRESS: UnitTypeId.COMMANDCENTER,
-        UnitTypeId.SUPPLYDEPOTLOWERED: UnitTypeId.SUPPLYDEPOT,
-        # Add more upgrade mappings as needed
-    }
-    
-    if structure_type in upgrade_mappings:
-        source_type = upgrade_mappings[structure_type]
-        for structure in bot.structures(source_type):
-            if structure.orders:
-                for order in structure.orders:
-                    creation_ability = bot.game_data.units[structure_type.value].creation_ability
-                    if creation_ability and order.ability.id == creation_ability.id:
-                        total_count += 1
-    
-    return total_count
+    census = get_census(bot)
+
+    # 1. Completed structures, 2. planned structures (workers en route),
+    # 3. minus the double counting of planned/being built structures,
+    # 4. structures being upgraded/morphed TO this type
+    return (
+        census.structures[structure_type]
+        + census.planned[structure_type]
+        - census.not_ready[structure_type]
+        + census.morphing(structure_type)
+    )
 
 def count_units(bot: BotAI, unit_type: UnitTypeId) -> int:
     """
     Count all units of a specific type including:
     - Completed units on the map
     - Units currently in production
-    - Units loaded in transports (Medivacs, Bunkers, Command Centers)
+    - Units loaded in transports (Medivacs, Bunkers)
     - Units being morphed/transformed
     """
-    total_count = 0
-
     if unit_type is UnitTypeId.SCV:
         return bot.supply_workers
-    
-    # 1. Count completed units on the map
-    total_count += bot.units(unit_type).amount
-    
-    # 2. Count units in production queues
-    if unit_type in PRODUCTION_STRUCTURES:
-        for structure_type in PRODUCTION_STRUCTURES[unit_type]:
-            for structure in bot.structures(structure_type):
-                # Count units in production queue
-                for order in structure.orders:
-                    creation_ability = bot.game_data.units[unit_type.value].creation_ability
-                    if creation_ability and order.ability.id == creation_ability.id:
-                        total_count += 1
-    
-    # 3. Count units loaded in transports and bunkers
-    # Check Medivacs
-    for medivac in bot.units(UnitTypeId.MEDIVAC):
-        if hasattr(medivac, 'passengers') and medivac.passengers:
-            for passenger in medivac.passengers:
-                if passenger.type_id == unit_type:
-                    total_count += 1
 
-    # Check Bunkers
-    for bunker in bot.structures(UnitTypeId.BUNKER):
-        if hasattr(bunker, 'passengers') and bunker.passengers:
-            for passenger in bunker.passengers:
-                if passenger.type_id == unit_type:
-                    total_count += 1
-
-    # Check Command Centers (SCVs can be inside)
-    if unit_type == UnitTypeId.SCV:
-        for cc in bot.structures({UnitTypeId.COMMANDCENTER, UnitTypeId.ORBITALCOMMAND, UnitTypeId.PLANETARYFORTRESS}):
-            if hasattr(cc, 'passengers') and cc.passengers:
-                for passenger in cc.passengers:
-                    if passenger.type_id == unit_type:
-                        total_count += 1
-    
-    # 4. Count units being morphed/transformed (e.g., Hellion -> Hellbat)
-    if unit_type == UnitTypeId.HELLIONTANK:
-        # Count Hellions that are morphing to Hellbats
-        for hellion in bot.units(UnitTypeId.HELLION):
-            if hellion.orders and any(order.ability.id == bot.game_data.abilities[UnitTypeId.HELLIONTANK.value].id for order in hellion.orders):
-                total_count += 1
-    
-    return total_count
+    census = get_census(bot)
+    return census.units[unit_type] + census.in_production(unit_type) + census.loaded[unit_type] + census.morphing(unit_type)
 
 async def create_unit(bot: BotAI, unit_type: UnitTypeId, count: int = None, target: Union[Unit, Point2] = None):
     """
@@ -183,17 +115,18 @@ async def create_unit(bot: BotAI, unit_type: UnitTypeId, count: int = None, targ
 async def maintain_supply(bot: BotAI, supply_threshold: int = 12, max_simultaneous: int = 2):
     """Maintain supply by building depots when needed."""
     count_planned = count_planned_structures(bot, UnitTypeId.SUPPLYDEPOT)
-    count = count_structure(bot, UnitTypeId.SUPPLYDEPOT) + count_structure(bot, UnitTypeId.SUPPLYDEPOTLOWERED)
     if bot.supply_left < supply_threshold and count_planned < max_simultaneous:
         if bot.can_afford(UnitTypeId.SUPPLYDEPOT):
-            placement = bot.map_analysis.unit_placement["supply"][count]
-            await create_supply(bot, near=Point2((placement[0], placement[1])))
+            # First free depot slot, skipping the ones workers en route will take
+            placement = bot.map_analysis.next_free_slot("supply", skip=count_planned)
+            near = Point2((placement[0], placement[1])) if placement is not None else None
+            await create_supply(bot, near=near)
 
 async def create_supply(bot_instance: BotAI, near=None):
     """Create a supply depot at a given location (default: near first townhall)."""
     if near is None:
         near = bot_instance.townhalls.first
-    await bot_instance.build(UnitTypeId.SUPPLYDEPOT, near=near, max_distance=8)
+    await build(bot_instance, UnitTypeId.SUPPLYDEPOT, near=near, max_distance=8)
 
 async def next_expansion(bot_instance: BotAI):
     """
@@ -244,17 +177,28 @@ async def next_expansion(bot_instance: BotAI):
     else:
         ramp_pos = bot_instance.start_location
 
+    # Walking distance tables when the map analysis is available, straight-line otherwise
+    map_analysis = getattr(bot_instance, "map_analysis", None)
+    use_tables = map_analysis is not None and map_analysis.expansion_distances is not None
+
     # Sort expansion locations by distance to ramp
-    sorted_by_ramp = sorted(expansion_locations, key=lambda p: ramp_pos.distance_to(p))
+    if use_tables:
+        sorted_by_ramp = [map_analysis.expansion_locations_list[i] for i in map_analysis.nearest_bases("ramp")]
+    else:
+        sorted_by_ramp = sorted(expansion_locations, key=lambda p: ramp_pos.distance_to(p))
     for loc in sorted_by_ramp:
         if is_location_free(loc):
             return loc
 
     # 2. Otherwise, pick the one closest to all CCs combined
     if ccs:
-        def total_cc_distance(loc):
-            return sum(cc.position.distance_to(loc) for cc in ccs)
-        sorted_by_ccs = sorted(expansion_locations, key=total_cc_distance)
+        cc_ids = [map_analysis.expansion_id(cc.position) for cc in ccs] if use_tables else [None]
+        if None not in cc_ids:
+            sorted_by_ccs = [map_analysis.expansion_locations_list[i] for i in map_analysis.nearest_bases(cc_ids)]
+        else:
+            def total_cc_distance(loc):
+                return sum(cc.position.distance_to(loc) for cc in ccs)
+            sorted_by_ccs = sorted(expansion_locations, key=total_cc_distance)
         for loc in sorted_by_ccs:
             if is_location_free(loc):
                 return loc
@@ -274,6 +218,6 @@ async def create_expansion(bot: BotAI, worker: Unit=None):
 
         if expansion_location:
             if worker is not None:
-                await bot.build(UnitTypeId.COMMANDCENTER, near=expansion_location, build_worker=worker, max_distance=1)
+                await build(bot, UnitTypeId.COMMANDCENTER, near=expansion_location, build_worker=worker, max_distance=1)
             else:
-                await bot.build(UnitTypeId.COMMANDCENTER, near=expansion_location, max_distance=1)
+                await build(bot, UnitTypeId.COMMANDCENTER, near=expansion_location, max_distance=1)
@@ -0,0 +1,174 @@
+from collections import defaultdict
+from typing import Iterable, Union
+
+import numpy as np
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+from sc2.units import Units
+
+BASE_RADIUS = 15  # structures closer than this to an expansion location belong to its base
+
+
+class UnitRegistry:
+    """
+    Own units and structures indexed by tag: by type, by role and by base (expansion id, structures only).
+    The indexes are updated from the unit events, so lookups never filter bot.units / bot.structures.
+    Tags resolve to the Unit objects of the current step, units out of sight (in a transport) resolve to nothing.
+    """
+
+    def __init__(self):
+        self.type_of: dict[int, UnitTypeId] = {}
+        self.by_type: dict[UnitTypeId, set[int]] = defaultdict(set)
+        self.ready: set[int] = set()  # finished structures and all units
+        self.role_of: dict[int, str] = {}
+        self.by_role: dict[str, dict[int, None]] = defaultdict(dict)  # role -> tags, in assignment order
+        self.base_of: dict[int, int] = {}  # structure tag -> expansion id
+        self.by_base: dict[int, set[int]] = defaultdict(set)
+        self._bases: np.ndarray = None  # expansion locations [n, 2]
+        self.polled = False  # no events forwarded: resync from the observation every step
+        self._game_loop = -1
+        self._units: dict[int, Unit] = {}  # tag -> Unit of the current step
+
+    # Events
+
+    def on_unit_created(self, unit: Unit) -> None:
+        self._add(unit, ready=True)
+
+    def on_building_construction_started(self, unit: Unit, bot: BotAI = None) -> None:
+        self._add(unit, ready=False, bot=bot)
+
+    def on_building_construction_complete(self, unit: Unit, bot: BotAI = None) -> None:
+        if unit.tag not in self.type_of:
+            self._add(unit, ready=True, bot=bot)  # starting townhall
+        self.ready.add(unit.tag)
+
+    def on_unit_type_changed(self, unit: Unit, previous_type: UnitTypeId) -> None:
+        self.by_type[previous_type].discard(unit.tag)
+        self.by_type[unit.type_id].add(unit.tag)
+        self.type_of[unit.tag] = unit.type_id
+
+    def on_unit_destroyed(self, unit_tag: int) -> None:
+        unit_type = self.type_of.pop(unit_tag, None)
+        if unit_type is None:
+            return
+        self.by_type[unit_type].discard(unit_tag)
+        self.ready.discard(unit_tag)
+        self.release(unit_tag)
+        base = self.base_of.pop(unit_tag, None)
+        if base is not None:
+            self.by_base[base].discard(unit_tag)
+
+    def sync(self, bot: BotAI) -> None:
+        """Catch up with the observation: new units, type changes, finished structures and units no longer seen."""
+        seen = set()
+        for unit in bot.units:
+            seen.add(unit.tag)
+            if unit.tag not in self.type_of:
+                self._add(unit, ready=True)
+            elif self.type_of[unit.tag] != unit.type_id:
+                self.on_unit_type_changed(unit, self.type_of[unit.tag])
+        for structure in bot.structures:
+            seen.add(structure.tag)
+            if structure.tag not in self.type_of:
+                self._add(structure, ready=structure.is_ready, bot=bot)
+            elif self.type_of[structure.tag] != structure.type_id:
+                self.on_unit_type_changed(structure, self.type_of[structure.tag])
+            if structure.is_ready:
+                self.ready.add(structure.tag)
+        for tag in self.type_of.keys() - seen:
+            self.on_unit_destroyed(tag)
+
+    def _add(self, unit: Unit, ready: bool, bot: BotAI = None) -> None:
+        self.type_of[unit.tag] = unit.type_id
+        self.by_type[unit.type_id].add(unit.tag)
+        if ready:
+            self.ready.add(unit.tag)
+        if unit.is_structure and bot is not None:
+            base = self._base(bot, unit)
+            if base is not None:
+                self.base_of[unit.tag] = base
+                self.by_base[base].add(unit.tag)
+
+    def _base(self, bot: BotAI, unit: Unit) -> int:
+        if self._bases is None:
+            map_analysis = getattr(bot, "map_analysis", None)
+            locations = map_analysis.expansion_locations_list if map_analysis is not None else bot.expansion_locations_list
+            self._bases = np.array([(p.x, p.y) for p in locations], dtype=float).reshape(-1, 2)
+        if len(self._bases) == 0:
+            return None
+        distances = np.hypot(*(self._bases - unit.position_tuple).T)
+        closest = int(np.argmin(distances))
+        return closest if distances[closest] < BASE_RADIUS else None
+
+    # Roles
+
+    def assign(self, unit: Union[Unit, int], role: str, exclusive: bool = False) -> None:
+        """Give a unit a role (one role per unit, the previous one is dropped), exclusive takes it from the others."""
+        if exclusive:
+            self.clear_role(role)
+        if unit is None:
+            return
+        tag = unit if isinstance(unit, int) else unit.tag
+        self.release(tag)
+        self.role_of[tag] = role
+        self.by_role[role][tag] = None
+
+    def release(self, unit_tag: int) -> None:
+        role = self.role_of.pop(unit_tag, None)
+        if role is not None:
+            del self.by_role[role][unit_tag]
+
+    def clear_role(self, role: str) -> None:
+        for tag in list(self.by_role[role]):
+            self.release(tag)
+
+    # Lookups
+
+    def _unit_map(self, bot: BotAI) -> dict[int, Unit]:
+        if self._game_loop != bot.state.game_loop:
+            self._game_loop = bot.state.game_loop
+            if self.polled:
+                self.sync(bot)
+            self._units = {unit.tag: unit for unit in bot.units}
+            self._units.update((structure.tag, structure) for structure in bot.structures)
+        return self._units
+
+    def _resolve(self, bot: BotAI, tags: Iterable[int]) -> Units:
+        units = self._unit_map(bot)
+        return Units([units[tag] for tag in tags if tag in units], bot)
+
+    def tags(self, unit_types: Union[UnitTypeId, Iterable[UnitTypeId]], ready: bool = False) -> set[int]:
+        if isinstance(unit_types, UnitTypeId):
+            unit_types = (unit_types,)
+        tags = set().union(*(self.by_type.get(unit_type, ()) for unit_type in unit_types))
+        return tags & self.ready if ready else tags
+
+    def units(self, bot: BotAI, unit_types: Union[UnitTypeId, Iterable[UnitTypeId]], ready: bool = False) -> Units:
+        """Own units or structures of some types, like bot.structures.of_type(...) without the scan."""
+        self._unit_map(bot)
+        return self._resolve(bot, self.tags(unit_types, ready))
+
+    def role(self, bot: BotAI, role: str) -> Units:
+        """Units with a role, in assignment order."""
+        self._unit_map(bot)
+        return self._resolve(bot, list(self.by_role.get(role, ())))
+
+    def first(self, bot: BotAI, role: str) -> Unit:
+        """The (first) unit with a role as seen this step, None if it died or nobody has the role."""
+        units = self.role(bot, role)
+        return units[0] if units else None
+
+    def at_base(self, bot: BotAI, expansion_id: int) -> Units:
+        """Structures of an expansion."""
+        self._unit_map(bot)
+        return self._resolve(bot, self.by_base.get(expansion_id, ()))
+
+
+def get_registry(bot: BotAI) -> UnitRegistry:
+    """The bot's unit registry, created on first use (without events, it is synced from the units every step)."""
+    registry = getattr(bot, "unit_registry", None)
+    if registry is None:
+        registry = bot.unit_registry = UnitRegistry()
+        registry.polled = True
+    return registry
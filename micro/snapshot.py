@@ -0,0 +1,106 @@
+from typing import Iterable
+
+import numpy as np
+from sc2.bot_ai import BotAI
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+from sc2.units import Units
+
+
+class UnitArrays:
+    """
+    Struct-of-arrays view of a set of units: one NumPy array per attribute, row i is units[i].
+    Masks and index arrays computed on it map back to Unit objects with select().
+    """
+
+    def __init__(self, units: Iterable[Unit], bot: BotAI):
+        self.bot = bot
+        self.units: list[Unit] = list(units)
+        self.index: dict[int, int] = {unit.tag: i for i, unit in enumerate(self.units)}  # tag -> row
+
+        n = len(self.units)
+        self.tag = np.fromiter((unit.tag for unit in self.units), dtype=np.int64, count=n)
+        self.type_id = np.fromiter((unit.type_id.value for unit in self.units), dtype=np.int32, count=n)
+        self.position = np.array([unit.position_tuple for unit in self.units], dtype=float).reshape(-1, 2)
+        self.x, self.y = self.position[:, 0], self.position[:, 1]
+        self.radius = np.fromiter((unit.radius for unit in self.units), dtype=float, count=n)
+        self.health = np.fromiter((unit.health for unit in self.units), dtype=float, count=n)
+        self.health_max = np.fromiter((unit.health_max for unit in self.units), dtype=float, count=n)
+        self.shield = np.fromiter((unit.shield for unit in self.units), dtype=float, count=n)
+        self.energy = np.fromiter((unit.energy for unit in self.units), dtype=float, count=n)
+        self.ground_range = np.fromiter((unit.ground_range for unit in self.units), dtype=float, count=n)
+        self.air_range = np.fromiter((unit.air_range for unit in self.units), dtype=float, count=n)
+        self.is_flying = np.fromiter((unit.is_flying for unit in self.units), dtype=bool, count=n)
+        self.is_ready = np.fromiter((unit.is_ready for unit in self.units), dtype=bool, count=n)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    @property
+    def health_percentage(self) -> np.ndarray:
+        return np.divide(self.health, self.health_max, out=np.zeros_like(self.health), where=self.health_max > 0)
+
+    def of_type(self, *unit_types: UnitTypeId) -> np.ndarray:
+        """Mask of the rows of these types."""
+        return np.isin(self.type_id, [unit_type.value for unit_type in unit_types])
+
+    def rows(self, units: Iterable[Unit]) -> np.ndarray:
+        """Row of each unit (by tag)."""
+        return np.fromiter((self.index[unit.tag] for unit in units), dtype=np.intp)
+
+    def select(self, rows) -> Units:
+        """Units of a mask or an index array, in row order."""
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return Units([self.units[i] for i in rows], self.bot)
+
+    def distances(self, other: "UnitArrays", rows=None, other_rows=None) -> np.ndarray:
+        """Center distance matrix [rows, other rows] (all rows by default)."""
+        a = self.position if rows is None else self.position[rows]
+        b = other.position if other_rows is None else other.position[other_rows]
+        return np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+
+    def in_attack_range(self, other: "UnitArrays", rows=None, other_rows=None, bonus_distance: float = 0) -> np.ndarray:
+        """Mask [rows, other rows]: the unit can attack the other unit from where it stands (Unit.target_in_range)."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        other_rows = np.arange(len(other)) if other_rows is None else np.asarray(other_rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        if other_rows.dtype == bool:
+            other_rows = np.flatnonzero(other_rows)
+
+        weapon_range = np.where(other.is_flying[other_rows][None, :], self.air_range[rows, None], self.ground_range[rows, None])
+        reach = weapon_range + self.radius[rows, None] + other.radius[other_rows][None, :] + bonus_distance
+        return (weapon_range > 0) & (self.distances(other, rows, other_rows) <= reach)
+
+
+class Snapshot:
+    """Own and enemy units of the current step as UnitArrays, each built on first use."""
+
+    def __init__(self, bot: BotAI):
+        self.bot = bot
+        self.game_loop = bot.state.game_loop
+        self._units = None
+        self._enemy_units = None
+
+    @property
+    def units(self) -> UnitArrays:
+        if self._units is None:
+            self._units = UnitArrays(self.bot.units, self.bot)
+        return self._units
+
+    @property
+    def enemy_units(self) -> UnitArrays:
+        if self._enemy_units is None:
+            self._enemy_units = UnitArrays(self.bot.enemy_units, self.bot)
+        return self._enemy_units
+
+
+def get_snapshot(bot: BotAI) -> Snapshot:
+    """The snapshot of the current step."""
+    snapshot = getattr(bot, "_snapshot", None)
+    if snapshot is None or snapshot.game_loop != bot.state.game_loop:
+        snapshot = Snapshot(bot)
+        bot._snapshot = snapshot
+    return snapshot
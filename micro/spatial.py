@@ -0,0 +1,119 @@
+from typing import Iterable, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+
+def _point(target: Union[Unit, Point2, tuple]) -> tuple:
+    return (target[0], target[1]) if isinstance(target, tuple) else target.position_tuple
+
+
+class SpatialIndex:
+    """
+    KD-tree over the positions of a set of units, for radius, k-nearest and batched queries.
+    Queries return Units (sorted by distance where it matters), so closest_to/filter keep working on the result.
+    """
+
+    def __init__(self, units: Iterable[Unit], bot: BotAI):
+        self.bot = bot
+        self.units: list[Unit] = list(units)
+        self.positions = np.array([unit.position_tuple for unit in self.units], dtype=float).reshape(-1, 2)
+        self.tree = cKDTree(self.positions) if self.units else None
+        self.max_radius = max((unit.radius for unit in self.units), default=0.0)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def _units(self, indices) -> Units:
+        return Units([self.units[i] for i in indices], self.bot)
+
+    def _sorted(self, center: tuple, indices: list) -> list:
+        if len(indices) < 2:
+            return indices
+        distances = np.hypot(*(self.positions[indices] - center).T)
+        return [indices[i] for i in np.argsort(distances, kind="stable")]
+
+    def in_radius(self, target: Union[Unit, Point2], radius: float, sort: bool = False) -> Units:
+        """Units whose center is within `radius` of the target, closest first if sorted."""
+        if self.tree is None:
+            return Units([], self.bot)
+        center = _point(target)
+        indices = self.tree.query_ball_point(center, radius)
+        return self._units(self._sorted(center, indices) if sort else sorted(indices))
+
+    def any_in_radius(self, target: Union[Unit, Point2], radius: float) -> bool:
+        if self.tree is None:
+            return False
+        return self.tree.query(_point(target), distance_upper_bound=radius)[0] <= radius
+
+    def nearest(self, target: Union[Unit, Point2], k: int = 1, max_distance: float = np.inf) -> Units:
+        """The k closest units (within max_distance), closest first."""
+        if self.tree is None:
+            return Units([], self.bot)
+        distances, indices = self.tree.query(_point(target), k=min(k, len(self.units)), distance_upper_bound=max_distance)
+        distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        return self._units(indices[np.isfinite(distances)])
+
+    def in_radius_batch(self, targets: Iterable[Union[Unit, Point2]], radius: float) -> list[Units]:
+        """in_radius for many targets with one tree query."""
+        centers = [_point(target) for target in targets]
+        if self.tree is None or not centers:
+            return [Units([], self.bot) for _ in centers]
+        return [self._units(sorted(indices)) for indices in self.tree.query_ball_point(centers, radius)]
+
+    def nearest_batch(self, targets: Iterable[Union[Unit, Point2]], max_distance: float = np.inf) -> list:
+        """The closest unit of each target (None when there is none within max_distance)."""
+        centers = [_point(target) for target in targets]
+        if self.tree is None or not centers:
+            return [None] * len(centers)
+        distances, indices = self.tree.query(centers, distance_upper_bound=max_distance)
+        return [self.units[i] if np.isfinite(d) else None for d, i in zip(distances, indices)]
+
+    def in_attack_range_of(self, unit: Unit, bonus_distance: float = 0) -> Units:
+        """Same as Units.in_attack_range_of, with the tree narrowing the candidates first."""
+        reach = max(unit.ground_range, unit.air_range) + unit.radius + self.max_radius + bonus_distance
+        return self.in_radius(unit, reach).filter(lambda target: unit.target_in_range(target, bonus_distance))
+
+
+class SpatialIndexes:
+    """Indexes of the current step, each built on first use."""
+
+    def __init__(self, bot: BotAI):
+        self.bot = bot
+        self.game_loop = bot.state.game_loop
+        self._indexes: dict[str, SpatialIndex] = {}
+
+    def _index(self, name: str, units: Iterable[Unit]) -> SpatialIndex:
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._indexes[name] = SpatialIndex(units, self.bot)
+        return index
+
+    @property
+    def units(self) -> SpatialIndex:
+        return self._index("units", self.bot.units)
+
+    @property
+    def structures(self) -> SpatialIndex:
+        return self._index("structures", self.bot.structures)
+
+    @property
+    def enemy_units(self) -> SpatialIndex:
+        return self._index("enemy_units", self.bot.enemy_units)
+
+    @property
+    def enemy_ground(self) -> SpatialIndex:
+        return self._index("enemy_ground", (unit for unit in self.bot.enemy_units if not unit.is_flying))
+
+
+def get_spatial(bot: BotAI) -> SpatialIndexes:
+    """The spatial indexes of the current step."""
+    spatial = getattr(bot, "_spatial", None)
+    if spatial is None or spatial.game_loop != bot.state.game_loop:
+        spatial = SpatialIndexes(bot)
+        bot._spatial = spatial
+    return spatial
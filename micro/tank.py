@@ -1,18 +1,68 @@
+import numpy as np
 from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.ability_id import AbilityId
+from sc2.unit import Unit
+
+from .commands import command
+from .snapshot import get_snapshot
+
+
+class SiegeEvaluator:
+    """
+    Siege/unsiege decisions for all tanks at once, from one tank x ground enemy distance matrix per step.
+    A tank sieges when an enemy is within its (unsieged) range and unsieges when none is within its sieged range
+    plus `hysteresis`. A tank keeps a mode for at least `min_duration` seconds.
+    """
+
+    def __init__(self, hysteresis: float = 1.0, min_duration: float = 3.0):
+        self.hysteresis = hysteresis
+        self.min_duration = min_duration
+        self.modes: dict[int, tuple[UnitTypeId, float]] = {}  # tank tag -> (mode, time the tank entered it)
+
+    def _update_modes(self, bot: BotAI, tanks: list[Unit]) -> None:
+        modes = {}
+        for tank in tanks:
+            mode, since = self.modes.get(tank.tag, (tank.type_id, -self.min_duration))
+            modes[tank.tag] = (mode, since) if mode == tank.type_id else (tank.type_id, bot.time)
+        self.modes = modes
+
+    def evaluate(self, bot: BotAI) -> tuple[list[Unit], list[Unit]]:
+        """Tanks to siege and tanks to unsiege this step."""
+        snapshot = get_snapshot(bot)
+        units, enemies = snapshot.units, snapshot.enemy_units
+        tank_rows = np.flatnonzero(units.of_type(UnitTypeId.SIEGETANK, UnitTypeId.SIEGETANKSIEGED) & units.is_ready)
+        tanks = units.select(tank_rows)
+        self._update_modes(bot, tanks)
+        if not tanks:
+            return [], []
+
+        # Distance from each tank's edge to each ground enemy's edge, tanks can't shoot air in either mode
+        ground_rows = np.flatnonzero(~enemies.is_flying)
+        gaps = units.distances(enemies, tank_rows, ground_rows) - units.radius[tank_rows, None] - enemies.radius[ground_rows][None, :]
+        closest = gaps.min(axis=1) if len(ground_rows) else np.full(len(tank_rows), np.inf)
+
+        sieged = units.type_id[tank_rows] == UnitTypeId.SIEGETANKSIEGED.value
+        weapon_range = units.ground_range[tank_rows]
+        settled = np.array([bot.time - self.modes[tank.tag][1] >= self.min_duration for tank in tanks], dtype=bool)
+
+        siege = settled & ~sieged & (closest <= weapon_range)
+        unsiege = settled & sieged & (closest > weapon_range + self.hysteresis)
+        return [tanks[i] for i in np.flatnonzero(siege)], [tanks[i] for i in np.flatnonzero(unsiege)]
+
+
+def get_siege_evaluator(bot: BotAI) -> SiegeEvaluator:
+    """The bot's siege evaluator, created on first use."""
+    evaluator = getattr(bot, "siege_evaluator", None)
+    if evaluator is None:
+        evaluator = bot.siege_evaluator = SiegeEvaluator()
+    return evaluator
 
 
 async def siege_on_enemy(bot: BotAI):
     """Siege tanks when enemies are in range, unsiege when no enemies."""
-    # Siege tanks if any enemy is in range
-    for tank in bot.units(UnitTypeId.SIEGETANK).ready:
-        enemies_in_range = bot.enemy_units.in_attack_range_of(tank)
-        if enemies_in_range:
-            tank(AbilityId.SIEGEMODE_SIEGEMODE)
-
-    # Unsiege tanks if no enemy is in range
-    for tank in bot.units(UnitTypeId.SIEGETANKSIEGED).ready:
-        enemies_in_range = bot.enemy_units.in_attack_range_of(tank)
-        if not enemies_in_range:
-            tank(AbilityId.UNSIEGE_UNSIEGE)
+    siege, unsiege = get_siege_evaluator(bot).evaluate(bot)
+    for tank in siege:
+        command(bot, tank, AbilityId.SIEGEMODE_SIEGEMODE)
+    for tank in unsiege:
+        command(bot, tank, AbilityId.UNSIEGE_UNSIEGE)
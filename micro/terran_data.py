@@ -3,6 +3,7 @@ Terran unit and structure data for StarCraft II bot development.
 Contains static information about unit costs, build times, and production structures.
 """
 
+from sc2.ids.ability_id import AbilityId
 from sc2.ids.unit_typeid import UnitTypeId
 
 # Global production structures mapping
@@ -149,6 +150,50 @@ TERRAN_UNIT_INFO = {
     },
 }
 
+# Morphs: morphed type -> (source type, morph ability)
+MORPHS = {
+    UnitTypeId.ORBITALCOMMAND: (UnitTypeId.COMMANDCENTER, AbilityId.UPGRADETOORBITAL_ORBITALCOMMAND),
+    UnitTypeId.PLANETARYFORTRESS: (UnitTypeId.COMMANDCENTER, AbilityId.UPGRADETOPLANETARYFORTRESS_PLANETARYFORTRESS),
+    UnitTypeId.SUPPLYDEPOTLOWERED: (UnitTypeId.SUPPLYDEPOT, AbilityId.MORPH_SUPPLYDEPOT_LOWER),
+    UnitTypeId.HELLIONTANK: (UnitTypeId.HELLION, AbilityId.MORPH_HELLBAT),
+}
+
+class CreationTables:
+    """Creation ability lookups of one game's data, morphs included (build_creation_tables)."""
+
+    def __init__(self, abilities: dict, created_units: dict):
+        self.abilities: dict[UnitTypeId, AbilityId] = abilities  # unit type -> ability that trains/builds it
+        self.created_units: dict[AbilityId, UnitTypeId] = created_units  # train/build/morph ability -> unit type it creates
+
+
+def build_creation_tables(game_data) -> CreationTables:
+    """Creation ability tables of the game data, morphs included."""
+    creation_abilities, created_units = {}, {}
+    for unit_id, unit_data in game_data.units.items():
+        try:
+            unit_type = UnitTypeId(unit_id)
+        except ValueError:
+            continue
+        creation_ability = unit_data.creation_ability
+        if creation_ability is None:
+            continue
+        creation_abilities[unit_type] = creation_ability.id
+        created_units.setdefault(creation_ability.id, unit_type)
+
+    # Morph orders are issued to the source unit, count them as the morphed type
+    for unit_type, (_, ability) in MORPHS.items():
+        created_units[ability] = unit_type
+
+    return CreationTables(creation_abilities, created_units)
+
+
+def get_creation_tables(bot) -> CreationTables:
+    """The bot's creation tables, built from its game data on first use."""
+    tables = getattr(bot, "creation_tables", None)
+    if tables is None:
+        tables = bot.creation_tables = build_creation_tables(bot.game_data)
+    return tables
+
 
 def get_terran_unit_info(bot=None):
     """Returns the static Terran unit info map."""
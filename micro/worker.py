@@ -2,16 +2,37 @@ from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.ability_id import AbilityId
 
+from .commands import command
+
+MULE_DURATION = 64  # game seconds a MULE mines
+
+
+def get_mule_targets(bot: BotAI) -> dict[int, float]:
+    """Mineral tag -> time of the last MULE called down on it, kept on the bot so every game has its own."""
+    targets = getattr(bot, "mule_targets", None)
+    if targets is None:
+        targets = bot.mule_targets = {}
+    return targets
 
-async def back_to_mining(bot_instance: BotAI):
-    """Send idle workers back to mining."""
-    for scv in bot_instance.workers.idle:
-        scv.gather(bot_instance.mineral_field.closest_to(scv))
 
 async def mule_drop(bot_instance: BotAI):
-    """Drop MULEs on mineral patches."""
+    """Drop MULEs on mineral patches, one MULE per patch while there are patches without one."""
+    targets = get_mule_targets(bot_instance)
+    for tag in [tag for tag, time in targets.items() if bot_instance.time - time >= MULE_DURATION]:
+        del targets[tag]
+
     for oc in bot_instance.structures(UnitTypeId.ORBITALCOMMAND).ready:
         if oc.energy >= 50:
-            mfs = bot_instance.mineral_field.closer_than(10, oc)
-            if mfs:
-                oc(AbilityId.CALLDOWNMULE_CALLDOWNMULE, mfs.random)
+            # Shortest trip of the base's mineral line (the mining manager's order), else the closest patch
+            mining = getattr(bot_instance, "mining", None)
+            line = mining.bases.get(oc.tag) if mining is not None else None
+            patches = bot_instance.mineral_field.tags_in(line) if line else None
+            if patches:
+                free = [m for m in patches if m.tag not in targets]
+                mf = min(free or patches, key=lambda m: line.index(m.tag))
+            else:
+                mfs = bot_instance.mineral_field.closer_than(10, oc)
+                free = [m for m in mfs if m.tag not in targets]
+                mf = min(free or mfs, key=lambda m: m.distance_to(oc)) if mfs else None
+            if mf is not None and command(bot_instance, oc, AbilityId.CALLDOWNMULE_CALLDOWNMULE, mf):
+                targets[mf.tag] = bot_instance.time
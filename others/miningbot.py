@@ -11,6 +11,8 @@ from sc2.position import Point2, Point3
 from sc2.unit import Unit
 from sc2.units import Units
 
+from micro.mining import WorkerAssignment
+
 
 class FastMiningBot(BotAI):
     def __init__(self):
@@ -18,7 +20,7 @@ class FastMiningBot(BotAI):
         self.last_step_time = 0
         self.target_worker_count = 0
         self.requested_workers = 15
-        self.worker_assignment = {}
+        self.mining = WorkerAssignment()
         self.start_time = None
         self.first_run = True
 
@@ -30,7 +32,6 @@ class FastMiningBot(BotAI):
         # Execute all mining tasks
         await self.build_workers()
         await self.distribute_workers()
-        await self.micro_workers()
         # await self.build_workers()
         # await self.build_supply()
         # await self.build_refineries()
@@ -62,47 +63,13 @@ class FastMiningBot(BotAI):
                     cc.train(UnitTypeId.SCV)
 
     async def distribute_workers(self):
-        nearby_mineral = []
-        nearby_gas = []
-
-        # list nearby mineral patches and gas
-        for cc in self.townhalls:
-            nearby_mineral.extend([m for m in self.mineral_field if m.distance_to(cc) < 10])
-            nearby_gas.extend([g for g in self.gas_buildings if g.distance_to(cc) < 10])
-
-        # assign (unassigned) workers
-        for worker in self.units(UnitTypeId.SCV):
-            if worker.tag in self.worker_assignment:
-                continue
-
-            def assigned_harvesters(resource):
-                return sum(1 for w in self.units(UnitTypeId.SCV) if w.tag in self.worker_assignment and self.worker_assignment[w.tag] == resource)
-
-            # Prioritize gas (up to 3 workers per geyser)
-            available_gas = [g for g in nearby_gas if assigned_harvesters(g) < 3]
-            if available_gas:
-                available_gas.sort(key=lambda g: (assigned_harvesters(g), g.distance_to(worker)))
-                self.worker_assignment[worker.tag] = available_gas[0]
-                worker.gather(available_gas[0])
-                continue
-
-            # Then assign to minerals (up to 3 workers per patch)
-            available_minerals = [m for m in nearby_mineral if assigned_harvesters(m) < 3]
-            if available_minerals:
-                # available_minerals.sort(key=lambda m: (assigned_harvesters(m), -getattr(m, "mineral_contents", 0), m.distance_to(worker)))
-                available_minerals.sort(key=lambda m: (assigned_harvesters(m), m.distance_to(worker)))
-                self.worker_assignment[worker.tag] = available_minerals[0]
-                worker.gather(available_minerals[0])
+        await self.mining.step(self)
 
-        # print({m.tag: sum(1 for w in self.units(UnitTypeId.SCV) if w in self.worker_assignment and self.worker_assignment[w.tag] == m) for m in nearby_mineral})
+    async def on_unit_created(self, unit: Unit):
+        self.mining.on_unit_created(unit)
 
-    async def micro_workers(self):
-        # send idle workers to gather resources
-        for worker_tag in self.worker_assignment:
-            worker = self.units.find_by_tag(worker_tag)
-            assigned_resource = self.worker_assignment[worker_tag]
-            if worker.is_idle:
-                worker.gather(assigned_resource)
+    async def on_unit_destroyed(self, unit_tag: int):
+        self.mining.on_unit_destroyed(unit_tag)
 
 def main():
     run_game(maps.get("PylonAIE_v4"), [Bot(Race.Terran, FastMiningBot()), Computer(Race.Zerg, Difficulty.Hard)], realtime=True)
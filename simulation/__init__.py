@@ -0,0 +1,3 @@
+"""
+Offline simulation of the bot's economy and build orders.
+"""
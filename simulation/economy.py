@@ -0,0 +1,696 @@
+"""
+Headless, deterministic Terran economy simulator.
+Runs Macro.produce against a fake bot: mining income, supply, build times, add-ons and tech requirements,
+without launching StarCraft II. Reports when every build order entry completes.
+
+Run from the repository root: python -m simulation.economy --order pig_gold
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Optional, Union
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from macro.macro import Macro
+from micro.terran_data import MORPHS, PRODUCTION_STRUCTURES, TERRAN_UNIT_INFO, build_creation_tables
+
+LOOPS_PER_SECOND = 22.4  # game loops per game second (faster speed), bot.time
+LOOPS_PER_BUILD_SECOND = 16  # build times are given in normal speed seconds
+
+# Mining rates per worker, in resources per game second
+MINERAL_RATE = 0.94  # first two workers on a patch
+MINERAL_RATE_THIRD = 0.45  # third worker on a patch
+GAS_RATE = 0.94
+PATCHES_PER_BASE = 8
+GEYSERS_PER_BASE = 2
+WORKERS_PER_REFINERY = 3
+
+WORKER_TRAVEL_TIME = 4.0  # game seconds from the build order to the structure placement
+MAX_SUPPLY = 200
+
+STRUCTURE_INFO = {
+    UnitTypeId.COMMANDCENTER: {"mineral_cost": 400, "gas_cost": 0, "build_time": 100.0, "supply_provided": 15, "requires": []},
+    UnitTypeId.ORBITALCOMMAND: {"mineral_cost": 150, "gas_cost": 0, "build_time": 35.0, "supply_provided": 15, "requires": [UnitTypeId.BARRACKS]},
+    UnitTypeId.PLANETARYFORTRESS: {"mineral_cost": 150, "gas_cost": 150, "build_time": 50.0, "supply_provided": 15, "requires": [UnitTypeId.ENGINEERINGBAY]},
+    UnitTypeId.SUPPLYDEPOT: {"mineral_cost": 100, "gas_cost": 0, "build_time": 30.0, "supply_provided": 8, "requires": []},
+    UnitTypeId.REFINERY: {"mineral_cost": 75, "gas_cost": 0, "build_time": 30.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.BARRACKS: {"mineral_cost": 150, "gas_cost": 0, "build_time": 65.0, "supply_provided": 0, "requires": [UnitTypeId.SUPPLYDEPOT]},
+    UnitTypeId.ENGINEERINGBAY: {"mineral_cost": 125, "gas_cost": 0, "build_time": 35.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.BUNKER: {"mineral_cost": 100, "gas_cost": 0, "build_time": 40.0, "supply_provided": 0, "requires": [UnitTypeId.BARRACKS]},
+    UnitTypeId.FACTORY: {"mineral_cost": 150, "gas_cost": 100, "build_time": 60.0, "supply_provided": 0, "requires": [UnitTypeId.BARRACKS]},
+    UnitTypeId.GHOSTACADEMY: {"mineral_cost": 150, "gas_cost": 50, "build_time": 40.0, "supply_provided": 0, "requires": [UnitTypeId.BARRACKS]},
+    UnitTypeId.STARPORT: {"mineral_cost": 150, "gas_cost": 100, "build_time": 50.0, "supply_provided": 0, "requires": [UnitTypeId.FACTORY]},
+    UnitTypeId.ARMORY: {"mineral_cost": 150, "gas_cost": 100, "build_time": 65.0, "supply_provided": 0, "requires": [UnitTypeId.FACTORY]},
+    UnitTypeId.FUSIONCORE: {"mineral_cost": 150, "gas_cost": 150, "build_time": 65.0, "supply_provided": 0, "requires": [UnitTypeId.STARPORT]},
+    UnitTypeId.BARRACKSTECHLAB: {"mineral_cost": 50, "gas_cost": 25, "build_time": 25.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.FACTORYTECHLAB: {"mineral_cost": 50, "gas_cost": 25, "build_time": 25.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.STARPORTTECHLAB: {"mineral_cost": 50, "gas_cost": 25, "build_time": 25.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.BARRACKSREACTOR: {"mineral_cost": 50, "gas_cost": 50, "build_time": 50.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.FACTORYREACTOR: {"mineral_cost": 50, "gas_cost": 50, "build_time": 50.0, "supply_provided": 0, "requires": []},
+    UnitTypeId.STARPORTREACTOR: {"mineral_cost": 50, "gas_cost": 50, "build_time": 50.0, "supply_provided": 0, "requires": []},
+}
+
+# Add-on ability -> (structure type, add-on type)
+ADDONS = {
+    AbilityId.BUILD_TECHLAB_BARRACKS: (UnitTypeId.BARRACKS, UnitTypeId.BARRACKSTECHLAB),
+    AbilityId.BUILD_TECHLAB_FACTORY: (UnitTypeId.FACTORY, UnitTypeId.FACTORYTECHLAB),
+    AbilityId.BUILD_TECHLAB_STARPORT: (UnitTypeId.STARPORT, UnitTypeId.STARPORTTECHLAB),
+    AbilityId.BUILD_REACTOR_BARRACKS: (UnitTypeId.BARRACKS, UnitTypeId.BARRACKSREACTOR),
+    AbilityId.BUILD_REACTOR_FACTORY: (UnitTypeId.FACTORY, UnitTypeId.FACTORYREACTOR),
+    AbilityId.BUILD_REACTOR_STARPORT: (UnitTypeId.STARPORT, UnitTypeId.STARPORTREACTOR),
+}
+TECHLABS = {UnitTypeId.BARRACKSTECHLAB, UnitTypeId.FACTORYTECHLAB, UnitTypeId.STARPORTTECHLAB}
+
+# Unit tech requirements: ready structures, and whether the producer needs a tech lab
+UNIT_REQUIREMENTS = {
+    UnitTypeId.MARAUDER: ([], True),
+    UnitTypeId.GHOST: ([UnitTypeId.GHOSTACADEMY], True),
+    UnitTypeId.SIEGETANK: ([], True),
+    UnitTypeId.THOR: ([UnitTypeId.ARMORY], True),
+    UnitTypeId.CYCLONE: ([], False),
+    UnitTypeId.HELLIONTANK: ([UnitTypeId.ARMORY], False),
+    UnitTypeId.BANSHEE: ([], True),
+    UnitTypeId.RAVEN: ([], True),
+    UnitTypeId.BATTLECRUISER: ([UnitTypeId.FUSIONCORE], True),
+}
+
+# Structures that also satisfy a requirement
+EQUIVALENT_STRUCTURES = {
+    UnitTypeId.SUPPLYDEPOT: {UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED},
+    UnitTypeId.COMMANDCENTER: {UnitTypeId.COMMANDCENTER, UnitTypeId.ORBITALCOMMAND, UnitTypeId.PLANETARYFORTRESS},
+}
+
+TOWNHALL_TYPES = {UnitTypeId.COMMANDCENTER, UnitTypeId.ORBITALCOMMAND, UnitTypeId.PLANETARYFORTRESS}
+GAS_BUILDINGS = {UnitTypeId.REFINERY, UnitTypeId.REFINERYRICH}
+UNSIMULATED = {UnitTypeId.MULE}  # build order entries accepted but never produced
+
+# Creation abilities, game_data.units stand-in for micro.terran_data.build_creation_tables
+SIMULATED_CREATION_ABILITIES = {
+    UnitTypeId.SCV: AbilityId.COMMANDCENTERTRAIN_SCV,
+    UnitTypeId.MARINE: AbilityId.BARRACKSTRAIN_MARINE,
+    UnitTypeId.REAPER: AbilityId.BARRACKSTRAIN_REAPER,
+    UnitTypeId.MARAUDER: AbilityId.BARRACKSTRAIN_MARAUDER,
+    UnitTypeId.GHOST: AbilityId.BARRACKSTRAIN_GHOST,
+    UnitTypeId.HELLION: AbilityId.FACTORYTRAIN_HELLION,
+    UnitTypeId.HELLIONTANK: AbilityId.TRAIN_HELLBAT,
+    UnitTypeId.WIDOWMINE: AbilityId.FACTORYTRAIN_WIDOWMINE,
+    UnitTypeId.SIEGETANK: AbilityId.FACTORYTRAIN_SIEGETANK,
+    UnitTypeId.CYCLONE: AbilityId.TRAIN_CYCLONE,
+    UnitTypeId.THOR: AbilityId.FACTORYTRAIN_THOR,
+    UnitTypeId.VIKINGFIGHTER: AbilityId.STARPORTTRAIN_VIKINGFIGHTER,
+    UnitTypeId.MEDIVAC: AbilityId.STARPORTTRAIN_MEDIVAC,
+    UnitTypeId.BANSHEE: AbilityId.STARPORTTRAIN_BANSHEE,
+    UnitTypeId.RAVEN: AbilityId.STARPORTTRAIN_RAVEN,
+    UnitTypeId.BATTLECRUISER: AbilityId.STARPORTTRAIN_BATTLECRUISER,
+    UnitTypeId.LIBERATOR: AbilityId.STARPORTTRAIN_LIBERATOR,
+    UnitTypeId.COMMANDCENTER: AbilityId.TERRANBUILD_COMMANDCENTER,
+    UnitTypeId.ORBITALCOMMAND: AbilityId.UPGRADETOORBITAL_ORBITALCOMMAND,
+    UnitTypeId.PLANETARYFORTRESS: AbilityId.UPGRADETOPLANETARYFORTRESS_PLANETARYFORTRESS,
+    UnitTypeId.SUPPLYDEPOT: AbilityId.TERRANBUILD_SUPPLYDEPOT,
+    UnitTypeId.REFINERY: AbilityId.TERRANBUILD_REFINERY,
+    UnitTypeId.BARRACKS: AbilityId.TERRANBUILD_BARRACKS,
+    UnitTypeId.ENGINEERINGBAY: AbilityId.TERRANBUILD_ENGINEERINGBAY,
+    UnitTypeId.BUNKER: AbilityId.TERRANBUILD_BUNKER,
+    UnitTypeId.FACTORY: AbilityId.TERRANBUILD_FACTORY,
+    UnitTypeId.GHOSTACADEMY: AbilityId.TERRANBUILD_GHOSTACADEMY,
+    UnitTypeId.STARPORT: AbilityId.TERRANBUILD_STARPORT,
+    UnitTypeId.ARMORY: AbilityId.TERRANBUILD_ARMORY,
+    UnitTypeId.FUSIONCORE: AbilityId.TERRANBUILD_FUSIONCORE,
+    **{addon: ability for ability, (_, addon) in ADDONS.items()},
+}
+
+
+def simulated_game_data() -> SimpleNamespace:
+    """Minimal game_data: units[type value].creation_ability.id"""
+    return SimpleNamespace(units={
+        unit_type.value: SimpleNamespace(creation_ability=SimpleNamespace(id=ability))
+        for unit_type, ability in SIMULATED_CREATION_ABILITIES.items()
+    })
+
+
+def build_loops(build_time: float) -> int:
+    return int(round(build_time * LOOPS_PER_BUILD_SECOND))
+
+
+@dataclass
+class SimOrder:
+    ability: SimpleNamespace  # order.ability.id, like sc2.unit.UnitOrder
+    creates: UnitTypeId
+    loops: int  # remaining game loops, only counted at the head of the queue
+    target: object = None
+    structure_tag: int = None  # worker build orders: the structure once placed
+
+
+class SimUnit:
+    """The part of sc2.unit.Unit that the production code reads."""
+
+    def __init__(self, sim: "EconomySimulator", tag: int, type_id: UnitTypeId, position: Point2, ready: bool = True):
+        self.sim = sim
+        self.tag = tag
+        self.type_id = type_id
+        self.position = position
+        self.is_ready = ready
+        self.orders: list[SimOrder] = []
+        self.passengers = []
+        self.add_on_tag = 0
+        self.job = None  # workers: "minerals", "gas", "build"
+        self.is_structure = type_id in STRUCTURE_INFO
+
+    def __repr__(self):
+        return f"SimUnit({self.type_id.name}, tag={self.tag})"
+
+    @property
+    def is_idle(self) -> bool:
+        return not self.orders
+
+    def distance_to(self, other) -> float:
+        return self.position.distance_to(other.position if hasattr(other, "position") else other)
+
+    def train(self, unit: UnitTypeId, queue: bool = False, can_afford_check: bool = False) -> bool:
+        return self.sim.order_train(self, unit)
+
+    def build(self, unit: UnitTypeId, position=None, queue: bool = False, can_afford_check: bool = False) -> bool:
+        if unit in MORPHS:
+            return self.sim.order_morph(self, unit)
+        return self.sim.order_build(unit, position, build_worker=self)
+
+    def __call__(self, ability: AbilityId, target=None, queue: bool = False, **kwargs) -> bool:
+        if ability in ADDONS:
+            return self.sim.order_addon(self, ability)
+        return False
+
+
+class SimUnits(list):
+    """The part of sc2.units.Units that the production code reads."""
+
+    def __call__(self, unit_types) -> "SimUnits":
+        unit_types = {unit_types} if isinstance(unit_types, UnitTypeId) else set(unit_types)
+        return SimUnits(unit for unit in self if unit.type_id in unit_types)
+
+    of_type = __call__
+
+    @property
+    def ready(self) -> "SimUnits":
+        return SimUnits(unit for unit in self if unit.is_ready)
+
+    @property
+    def not_ready(self) -> "SimUnits":
+        return SimUnits(unit for unit in self if not unit.is_ready)
+
+    @property
+    def idle(self) -> "SimUnits":
+        return SimUnits(unit for unit in self if unit.is_idle)
+
+    @property
+    def first(self) -> SimUnit:
+        return self[0]
+
+    @property
+    def amount(self) -> int:
+        return len(self)
+
+    @property
+    def exists(self) -> bool:
+        return bool(self)
+
+    def closest_to(self, position) -> SimUnit:
+        return min(self, key=lambda unit: unit.distance_to(position))
+
+    def closer_than(self, distance: float, position) -> "SimUnits":
+        return SimUnits(unit for unit in self if unit.distance_to(position) < distance)
+
+    def sorted_by_distance_to(self, position) -> "SimUnits":
+        return SimUnits(sorted(self, key=lambda unit: unit.distance_to(position)))
+
+    def tags_in(self, tags) -> "SimUnits":
+        return SimUnits(unit for unit in self if unit.tag in tags)
+
+
+class SimBot:
+    """The part of sc2.bot_ai.BotAI that Macro.produce reads, backed by the simulator."""
+
+    def __init__(self, sim: "EconomySimulator"):
+        self.sim = sim
+        self.state = SimpleNamespace(game_loop=0)
+        self.game_data = simulated_game_data()
+        self.creation_tables = sim.creation_tables
+        self._revision = -1
+        self._units = self._structures = None
+
+    def _split(self) -> None:
+        """Units and structures lists, rebuilt when the simulator changed."""
+        if self._revision != self.sim.revision:
+            self._units, self._structures = SimUnits(), SimUnits()
+            for unit in self.sim.units.values():
+                (self._structures if unit.is_structure else self._units).append(unit)
+            self._revision = self.sim.revision
+
+    @property
+    def time(self) -> float:
+        return self.state.game_loop / LOOPS_PER_SECOND
+
+    @property
+    def minerals(self) -> int:
+        return int(self.sim.minerals)
+
+    @property
+    def vespene(self) -> int:
+        return int(self.sim.vespene)
+
+    @property
+    def units(self) -> SimUnits:
+        self._split()
+        return self._units
+
+    @property
+    def structures(self) -> SimUnits:
+        self._split()
+        return self._structures
+
+    @property
+    def workers(self) -> SimUnits:
+        return self.units(UnitTypeId.SCV)
+
+    @property
+    def townhalls(self) -> SimUnits:
+        return self.structures(TOWNHALL_TYPES)
+
+    @property
+    def gas_buildings(self) -> SimUnits:
+        return self.structures(GAS_BUILDINGS)
+
+    @property
+    def vespene_geyser(self) -> SimUnits:
+        return SimUnits(self.sim.geysers)
+
+    @property
+    def supply_cap(self) -> int:
+        return self.sim.supply_cap()
+
+    @property
+    def supply_used(self) -> int:
+        return self.sim.supply_used()
+
+    @property
+    def supply_left(self) -> int:
+        return self.supply_cap - self.supply_used
+
+    @property
+    def supply_workers(self) -> int:
+        return self.sim.supply_workers()
+
+    def can_afford(self, item_id: UnitTypeId, check_supply_cost: bool = True) -> bool:
+        return self.sim.can_afford(item_id, check_supply_cost)
+
+    async def build(self, building: UnitTypeId, near: Union[SimUnit, Point2], max_distance: int = 20, build_worker: SimUnit = None,
+                    random_alternative: bool = True, placement_step: int = 2) -> bool:
+        return self.sim.order_build(building, near, build_worker)
+
+
+@dataclass
+class EntryResult:
+    position: int  # position in the build order
+    entry: Union[int, dict]
+    completed: Optional[float] = None  # game seconds, None if never completed
+
+
+@dataclass
+class SimulationReport:
+    duration: float
+    entries: list[EntryResult]
+    events: list[tuple] = field(default_factory=list)  # (game seconds, unit type) of every finished unit/structure
+    army_supply: list[tuple] = field(default_factory=list)  # (game seconds, army supply), once per game second
+    minerals: float = 0
+    vespene: float = 0
+    wall_time: float = 0
+
+    def time_to(self, unit_type: UnitTypeId, count: int) -> Optional[float]:
+        """Game time when `count` units/structures of a type are finished, morphs included."""
+        finished = 0
+        for t, finished_type in self.events:
+            if finished_type == unit_type:
+                finished += 1
+                if finished >= count:
+                    return t
+        return None
+
+    def army_supply_at(self, t: float) -> int:
+        supply = 0
+        for sample_time, sample in self.army_supply:
+            if sample_time > t:
+                break
+            supply = sample
+        return supply
+
+    def blocked_at(self) -> Optional[EntryResult]:
+        """First blocking (positive) entry that never completed."""
+        for result in self.entries:
+            if isinstance(result.entry, dict):
+                target = next(iter(result.entry.values()))
+                if target is not None and target > 0 and result.completed is None:
+                    return result
+        return None
+
+    def print(self) -> None:
+        print(f"Simulated {self.duration:.0f}s in {self.wall_time:.2f}s ({self.duration / max(self.wall_time, 1e-9):.0f}x real time)")
+        for result in self.entries:
+            completed = f"{int(result.completed) // 60}:{int(result.completed) % 60:02d}" if result.completed is not None else "-"
+            if isinstance(result.entry, dict):
+                unit_type, target = next(iter(result.entry.items()))
+                label = f"{unit_type.name}: {target}"
+            else:
+                label = f"wait {result.entry}s"
+            print(f"{result.position:3d} {label:<24} {completed}")
+        blocked = self.blocked_at()
+        if blocked is not None:
+            print(f"Blocked at entry {blocked.position}")
+        print(f"Army supply at 6:00: {self.army_supply_at(360)}, bank: {self.minerals:.0f} minerals, {self.vespene:.0f} gas")
+
+
+class EconomySimulator:
+    """
+    Deterministic Terran economy: 12 SCVs and a command center at the start, income from the workers on minerals and gas,
+    structures and units finish after their build time. Each step advances `game_step` game loops and calls
+    Macro.produce once, like the bot's on_step.
+
+    Simplifications: new command centers take the next expansion, refineries finished are saturated with 3 workers
+    (what micro.mining.WorkerAssignment does), no MULEs, upgrades, combat or unit movement.
+    Build order entries of a unit type the simulator does not know raise a ValueError.
+    """
+
+    def __init__(self, build_order: list, macro_type: type = Macro, game_step: int = 8, bases: int = 4):
+        self.build_order = build_order
+        self.game_step = game_step
+        for position, entry in enumerate(build_order):
+            unit_type = next(iter(entry)) if isinstance(entry, dict) else None
+            if unit_type is not None and unit_type not in TERRAN_UNIT_INFO and unit_type not in STRUCTURE_INFO and unit_type not in UNSIMULATED:
+                raise ValueError(f"Build order entry {position}: unknown unit type {unit_type.name}")
+
+        self.creation_tables = build_creation_tables(simulated_game_data())
+
+        self.minerals = 50.0
+        self.vespene = 0.0
+        self.next_tag = 1
+        self.revision = 0  # bumped on every change of units, orders or readiness
+        self._supply = None
+        self.units: dict[int, SimUnit] = {}
+        self.finished = Counter()  # type -> finished units/structures
+        self.events: list[tuple] = []
+
+        # Expansions along the x axis, geysers next to each of them
+        self.bases = [Point2((30.0 * i, 0.0)) for i in range(bases)]
+        self.taken_bases = 1
+        self.geysers = [
+            SimUnit(self, -1 - (2 * i + j), UnitTypeId.VESPENEGEYSER, base + Point2((7.0, 7.0 if j else -7.0)))
+            for i, base in enumerate(self.bases) for j in range(GEYSERS_PER_BASE)
+        ]
+
+        self.bot = SimBot(self)
+        self.spawn(UnitTypeId.COMMANDCENTER, self.bases[0])
+        for _ in range(12):
+            self.spawn(UnitTypeId.SCV, self.bases[0]).job = "minerals"
+        self.macro = macro_type(self.bot, build_order)
+
+    def spawn(self, unit_type: UnitTypeId, position: Point2, ready: bool = True) -> SimUnit:
+        unit = SimUnit(self, self.next_tag, unit_type, position, ready)
+        self.units[unit.tag] = unit
+        self.changed()
+        self.next_tag += 1
+        if ready:
+            self.finish(unit_type)
+        return unit
+
+    def changed(self) -> None:
+        self.revision += 1
+        self._supply = None
+
+    def finish(self, unit_type: UnitTypeId) -> None:
+        self.finished[unit_type] += 1
+        self.events.append((self.bot.time, unit_type))
+
+    # Supply and costs
+
+    def _supply_counts(self) -> tuple:
+        """(supply cap, supply used, worker supply), queued units included like the game does."""
+        if self._supply is None:
+            cap = used = workers = 0
+            for unit in self.units.values():
+                if unit.is_ready and unit.is_structure:
+                    cap += STRUCTURE_INFO[unit.type_id]["supply_provided"]
+                elif unit.type_id in TERRAN_UNIT_INFO:
+                    used += TERRAN_UNIT_INFO[unit.type_id]["supply_cost"]
+                    workers += unit.type_id is UnitTypeId.SCV
+                for order in unit.orders:
+                    if order.creates in TERRAN_UNIT_INFO:
+                        used += TERRAN_UNIT_INFO[order.creates]["supply_cost"]
+                        workers += order.creates is UnitTypeId.SCV
+            self._supply = (min(cap, MAX_SUPPLY), used, workers)
+        return self._supply
+
+    def supply_cap(self) -> int:
+        return self._supply_counts()[0]
+
+    def supply_used(self) -> int:
+        return self._supply_counts()[1]
+
+    def supply_workers(self) -> int:
+        return self._supply_counts()[2]
+
+    def cost(self, item_id: UnitTypeId) -> tuple:
+        info = TERRAN_UNIT_INFO.get(item_id) or STRUCTURE_INFO.get(item_id)
+        if info is None:
+            return None
+        return info["mineral_cost"], info["gas_cost"], info.get("supply_cost", 0)
+
+    def can_afford(self, item_id: UnitTypeId, check_supply_cost: bool = True) -> bool:
+        cost = self.cost(item_id)
+        if cost is None:
+            return False
+        minerals, gas, supply = cost
+        return self.minerals >= minerals and self.vespene >= gas and (not check_supply_cost or supply <= self.bot.supply_left)
+
+    def _pay(self, item_id: UnitTypeId) -> bool:
+        if not self.can_afford(item_id):
+            return False
+        minerals, gas, _ = self.cost(item_id)
+        self.minerals -= minerals
+        self.vespene -= gas
+        return True
+
+    def _has_structure(self, structure_type: UnitTypeId) -> bool:
+        types = EQUIVALENT_STRUCTURES.get(structure_type, {structure_type})
+        return any(unit.is_ready and unit.type_id in types for unit in self.units.values())
+
+    def _order(self, unit_type: UnitTypeId, loops: int, target=None) -> SimOrder:
+        return SimOrder(SimpleNamespace(id=self.creation_tables.abilities[unit_type]), unit_type, loops, target)
+
+    # Commands
+
+    def order_train(self, structure: SimUnit, unit_type: UnitTypeId) -> bool:
+        if not structure.is_ready or structure.type_id not in PRODUCTION_STRUCTURES.get(unit_type, []):
+            return False
+        requires, techlab = UNIT_REQUIREMENTS.get(unit_type, ([], False))
+        if not all(self._has_structure(required) for required in requires):
+            return False
+        if techlab:
+            addon = self.units.get(structure.add_on_tag)
+            if addon is None or not addon.is_ready or addon.type_id not in TECHLABS:
+                return False
+        if not self._pay(unit_type):
+            return False
+        structure.orders.append(self._order(unit_type, build_loops(TERRAN_UNIT_INFO[unit_type]["build_time"])))
+        self.changed()
+        return True
+
+    def order_morph(self, structure: SimUnit, morph_type: UnitTypeId) -> bool:
+        source_type, _ = MORPHS[morph_type]
+        info = STRUCTURE_INFO.get(morph_type)
+        if structure.type_id is not source_type or not structure.is_ready or info is None:
+            return False
+        if not all(self._has_structure(required) for required in info["requires"]) or not self._pay(morph_type):
+            return False
+        structure.orders.append(self._order(morph_type, build_loops(info["build_time"])))
+        self.changed()
+        return True
+
+    def order_addon(self, structure: SimUnit, ability: AbilityId) -> bool:
+        structure_type, addon_type = ADDONS[ability]
+        if structure.type_id is not structure_type or not structure.is_ready or structure.orders or structure.add_on_tag:
+            return False
+        if not self._pay(addon_type):
+            return False
+        addon = self.spawn(addon_type, structure.position + Point2((2.5, -0.5)), ready=False)
+        structure.add_on_tag = addon.tag
+        structure.orders.append(self._order(addon_type, build_loops(STRUCTURE_INFO[addon_type]["build_time"]), addon))
+        self.changed()
+        return True
+
+    def order_build(self, building: UnitTypeId, near, build_worker: SimUnit = None) -> bool:
+        info = STRUCTURE_INFO.get(building)
+        if info is None or building in MORPHS or building in TECHLABS or building.name.endswith("REACTOR"):
+            return False  # not built by workers
+        if not all(self._has_structure(required) for required in info["requires"]):
+            return False
+
+        if building in GAS_BUILDINGS:
+            if not isinstance(near, SimUnit) or near.type_id is not UnitTypeId.VESPENEGEYSER:
+                return False
+            position = near.position
+            if any(unit.type_id in GAS_BUILDINGS and unit.position == position for unit in self.units.values()):
+                return False  # geyser taken
+            if any(order.target == position for unit in self.units.values() for order in unit.orders):
+                return False  # a worker is on its way
+        elif building is UnitTypeId.COMMANDCENTER:
+            if self.taken_bases >= len(self.bases):
+                return False
+            position = self.bases[self.taken_bases]
+        else:
+            position = near.position if hasattr(near, "position") else near
+
+        worker = build_worker
+        if worker is None:
+            mining = [unit for unit in self.units.values() if unit.type_id is UnitTypeId.SCV and unit.job == "minerals"]
+            worker = mining[-1] if mining else None
+        if worker is None or worker.type_id is not UnitTypeId.SCV or not self._pay(building):
+            return False
+
+        if building is UnitTypeId.COMMANDCENTER:
+            self.taken_bases += 1
+        # The worker order lasts until the structure is finished, like an SCV constructing
+        worker.job = "build"
+        worker.orders = [self._order(building, int(WORKER_TRAVEL_TIME * LOOPS_PER_SECOND), position)]
+        self.changed()
+        return True
+
+    # Simulation
+
+    def _income(self, loops: int) -> None:
+        seconds = loops / LOOPS_PER_SECOND
+        bases = sum(1 for unit in self.units.values() if unit.type_id in TOWNHALL_TYPES and unit.is_ready)
+        on_minerals = sum(1 for unit in self.units.values() if unit.job == "minerals")
+        on_gas = sum(1 for unit in self.units.values() if unit.job == "gas")
+        refineries = sum(1 for unit in self.units.values() if unit.type_id in GAS_BUILDINGS and unit.is_ready)
+
+        two_per_patch = min(on_minerals, 2 * PATCHES_PER_BASE * bases)
+        third = min(on_minerals - two_per_patch, PATCHES_PER_BASE * bases)
+        self.minerals += (two_per_patch * MINERAL_RATE + third * MINERAL_RATE_THIRD) * seconds
+        self.vespene += min(on_gas, WORKERS_PER_REFINERY * refineries) * GAS_RATE * seconds
+
+    def _advance_orders(self, loops: int) -> None:
+        for unit in list(self.units.values()):
+            if not unit.orders:
+                continue
+            order = unit.orders[0]
+            order.loops -= loops
+            if order.loops > 0:
+                continue
+
+            if unit.type_id is UnitTypeId.SCV and order.creates in STRUCTURE_INFO:
+                self._advance_construction(unit, order)
+                continue
+
+            unit.orders.pop(0)
+            self.changed()
+            if order.creates in MORPHS:
+                previous_type = unit.type_id
+                unit.type_id = order.creates
+                self.finished[previous_type] -= 1
+                self.finish(order.creates)
+                self.macro.on_unit_lost(previous_type)
+            elif isinstance(order.target, SimUnit):  # add-on
+                order.target.is_ready = True
+                self.finish(order.creates)
+            else:
+                trained = self.spawn(order.creates, unit.position)
+                if trained.type_id is UnitTypeId.SCV:
+                    trained.job = "minerals"
+
+    def _advance_construction(self, worker: SimUnit, order: SimOrder) -> None:
+        """A worker build order: placement after the travel time, then the structure build time."""
+        structure = self.units.get(order.structure_tag)
+        if structure is None:
+            structure = self.spawn(order.creates, order.target, ready=False)
+            order.structure_tag = structure.tag
+            order.loops += build_loops(STRUCTURE_INFO[order.creates]["build_time"])
+            return
+
+        structure.is_ready = True
+        self.finish(structure.type_id)
+        worker.orders.pop(0)
+        self.changed()
+        worker.job = "minerals"
+
+        if structure.type_id in GAS_BUILDINGS:
+            # Saturate the refinery, like the worker assignment does
+            mining = [unit for unit in self.units.values() if unit.type_id is UnitTypeId.SCV and unit.job == "minerals"]
+            for unit in mining[-WORKERS_PER_REFINERY:]:
+                unit.job = "gas"
+
+    def _complete_entries(self, results: list[EntryResult]) -> None:
+        """Entries complete in build order: nothing after an unfinished blocking entry or time gate."""
+        for result in results:
+            if result.completed is None:
+                if isinstance(result.entry, int):
+                    if self.bot.time < result.entry:
+                        return
+                    result.completed = self.bot.time
+                elif isinstance(result.entry, dict):
+                    unit_type, target = next(iter(result.entry.items()))
+                    if target and self.finished[unit_type] >= abs(target):
+                        result.completed = self.bot.time
+            if result.completed is None and isinstance(result.entry, dict):
+                target = next(iter(result.entry.values()))
+                if target is not None and target > 0:
+                    return
+
+    async def run(self, duration: float = 600.0) -> SimulationReport:
+        """Simulate `duration` game seconds."""
+        start = time.perf_counter()
+        results = [EntryResult(i, entry) for i, entry in enumerate(self.build_order)]
+        army_supply = []
+        next_sample = 0.0
+
+        end_loop = int(duration * LOOPS_PER_SECOND)
+        while self.bot.state.game_loop < end_loop:
+            self._income(self.game_step)
+            self._advance_orders(self.game_step)
+            self.bot.state.game_loop += self.game_step
+
+            self._complete_entries(results)
+            if self.bot.time >= next_sample:
+                army_supply.append((next_sample, self.supply_used() - self.supply_workers()))
+                next_sample += 1.0
+
+            await self.macro.produce()
+
+        return SimulationReport(duration, results, list(self.events), army_supply, self.minerals, self.vespene, time.perf_counter() - start)
+
+
+def simulate(build_order: list, duration: float = 600.0, **kwargs) -> SimulationReport:
+    """Run a build order through the simulator, see EconomySimulator for the arguments."""
+    return asyncio.run(EconomySimulator(build_order, **kwargs).run(duration))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a build order without StarCraft II")
+    parser.add_argument("--order", choices=["macro", "pig_gold"], default="macro", help="macro.macro or strategy.pig_gold BUILD_ORDER")
+    parser.add_argument("--duration", type=float, default=600.0, help="game seconds to simulate")
+    parser.add_argument("--game-step", type=int, default=8, help="game loops per bot step")
+    args = parser.parse_args()
+
+    if args.order == "pig_gold":
+        from strategy.pig_gold import BUILD_ORDER
+    else:
+        from macro.macro import BUILD_ORDER
+
+    simulate(BUILD_ORDER, args.duration, game_step=args.game_step).print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Headless, deterministic mineral mining model.
+SCVs travel between townhalls and patches, wait for a busy patch (or bounce to a free one next to it, like the
+game does), mine and return cargo. One worker mines a patch at a time, which gives the 2-per-patch saturation
+curve. Worker-assignment code runs against the model's fake bot every bot step.
+
+Run from the repository root: python -m tools.mining_benchmark
+"""
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from .economy import LOOPS_PER_SECOND, SimUnits
+
+# Approximations at faster speed, in game seconds and distance units
+WORKER_SPEED = 3.94
+MINING_TIME = 2.0  # at the patch, for one trip
+DROPOFF_TIME = 0.2
+LEG_OVERHEAD = 0.35  # acceleration, deceleration and turning on each leg of a trip
+MINERALS_PER_TRIP = 5
+TOWNHALL_RADIUS = 2.75
+PATCH_RADIUS = 0.75
+BOUNCE_DISTANCE = 3.0  # a worker arriving at a busy patch takes a free patch this close
+WORKER_COST = 50
+WORKER_BUILD_TIME = 12.0
+
+
+def _distance(a, b) -> float:
+    return a.position.distance_to(b.position)
+
+
+class MiningStructure:
+    """Townhall or mineral patch, the part of sc2.unit.Unit that worker code reads."""
+
+    def __init__(self, tag: int, type_id: UnitTypeId, position: Point2):
+        self.tag = tag
+        self.type_id = type_id
+        self.position = position
+        self.is_ready = True
+        self.has_vespene = False
+        self.miner = None  # patches: worker mining it
+        self.queue: deque = deque()  # patches: workers waiting for it
+        self.training = 0.0  # townhalls: seconds left on the SCV in production
+
+    def distance_to(self, other) -> float:
+        return self.position.distance_to(other.position if hasattr(other, "position") else other)
+
+
+class MiningOrder:
+    """The part of sc2.unit.UnitOrder that worker code reads: order.ability.id and order.target."""
+
+    def __init__(self, ability: AbilityId, target: int = None):
+        self.ability = SimpleNamespace(id=ability)
+        self.target = target
+
+
+class MiningWorker:
+    """An SCV of the model, follows HARVEST_GATHER orders like sc2.unit.Unit."""
+
+    def __init__(self, model: "MiningModel", tag: int, position: Point2):
+        self.model = model
+        self.tag = tag
+        self.type_id = UnitTypeId.SCV
+        self.position = position
+        self.phase = "idle"  # idle, to_patch, wait, mining, to_townhall, dropoff
+        self.timer = 0.0
+        self.patch: MiningStructure = None  # gather target
+        self.is_carrying_resource = False
+
+    @property
+    def orders(self) -> list:
+        """The current order like sc2.unit.UnitOrder: gather the patch, or return the cargo."""
+        if self.phase == "idle":
+            return []
+        if self.phase in ("to_townhall", "dropoff"):
+            return [MiningOrder(AbilityId.HARVEST_RETURN, None)]
+        return [MiningOrder(AbilityId.HARVEST_GATHER, self.patch.tag)]
+
+    @property
+    def is_idle(self) -> bool:
+        return self.phase == "idle"
+
+    def distance_to(self, other) -> float:
+        return self.position.distance_to(other.position if hasattr(other, "position") else other)
+
+    def gather(self, target: MiningStructure, queue: bool = False) -> bool:
+        return self(AbilityId.HARVEST_GATHER, target, queue=queue)
+
+    def __call__(self, ability: AbilityId, target=None, queue: bool = False, **kwargs) -> bool:
+        if ability != AbilityId.HARVEST_GATHER or target is None:
+            return False  # returning cargo happens anyway
+        previous, self.patch = self.patch, self.model.patches[target.tag]
+        if self.phase == "idle":
+            self._travel(self.patch)
+        elif self.phase in ("to_patch", "wait") and previous is not self.patch:
+            if self in previous.queue:
+                previous.queue.remove(self)
+            self._travel(self.patch)
+        # Mining or returning: the new patch is used from the next trip
+        return True
+
+    def _travel(self, destination: MiningStructure) -> None:
+        clearance = (TOWNHALL_RADIUS if self.phase in ("idle", "dropoff") else 0.0) + PATCH_RADIUS
+        self.phase = "to_patch"
+        self.timer = max(0.0, _distance(self, destination) - clearance) / WORKER_SPEED + LEG_OVERHEAD
+
+    def _arrive(self) -> None:
+        self.position = self.patch.position
+        if self.patch.miner is None:
+            self._mine()
+            return
+        free = [
+            patch for patch in self.model.patches.values()
+            if patch.miner is None and not patch.queue and _distance(patch, self.patch) < BOUNCE_DISTANCE
+        ]
+        if free:
+            self.patch = min(free, key=lambda patch: _distance(patch, self))
+            self._travel(self.patch)
+        else:
+            self.phase = "wait"
+            self.patch.queue.append(self)
+
+    def _mine(self) -> None:
+        self.phase, self.timer = "mining", MINING_TIME
+        self.patch.miner = self
+
+    def advance(self, dt: float) -> None:
+        if self.phase in ("idle", "wait"):
+            return
+        self.timer -= dt
+        if self.timer > 0:
+            return
+
+        if self.phase == "to_patch":
+            self._arrive()
+        elif self.phase == "mining":
+            patch = self.patch
+            patch.miner = None
+            if patch.queue:
+                patch.queue.popleft()._mine()
+            self.is_carrying_resource = True
+            townhall = min(self.model.townhalls.values(), key=lambda townhall: _distance(townhall, patch))
+            self.phase = "to_townhall"
+            self.timer = max(0.0, _distance(townhall, patch) - TOWNHALL_RADIUS - PATCH_RADIUS) / WORKER_SPEED + LEG_OVERHEAD
+            self.position = townhall.position
+        elif self.phase == "to_townhall":
+            self.phase, self.timer = "dropoff", DROPOFF_TIME
+        elif self.phase == "dropoff":
+            self.model.mined += MINERALS_PER_TRIP
+            self.model.minerals += MINERALS_PER_TRIP
+            self.is_carrying_resource = False
+            self._travel(self.patch)
+
+
+@dataclass
+class BaseLayout:
+    center: tuple[float, float]
+    close: float = 6.0  # patch center distances to the townhall center
+    far: float = 7.0
+    facing: float = 0.0  # degrees, direction of the mineral line
+
+
+# Synthetic layouts: 8 patches on an arc per base, alternating close and far
+LAYOUTS = {
+    "standard": [BaseLayout((30.0, 30.0))],
+    "far": [BaseLayout((30.0, 30.0), close=6.5, far=7.5, facing=45.0)],
+    "two_base": [BaseLayout((30.0, 30.0)), BaseLayout((70.0, 30.0), facing=180.0)],
+}
+
+
+class MiningBot:
+    """The part of sc2.bot_ai.BotAI that worker-assignment code reads, backed by the model."""
+
+    def __init__(self, model: "MiningModel"):
+        self.model = model
+        self.state = type("State", (), {"game_loop": 0})()
+        self.game_data = None
+        self.gas_buildings = SimUnits()
+        self.vespene_geyser = SimUnits()
+
+    @property
+    def time(self) -> float:
+        return self.state.game_loop / LOOPS_PER_SECOND
+
+    @property
+    def minerals(self) -> int:
+        return int(self.model.minerals)
+
+    @property
+    def workers(self) -> SimUnits:
+        return SimUnits(self.model.workers.values())
+
+    @property
+    def units(self) -> SimUnits:
+        return self.workers
+
+    @property
+    def townhalls(self) -> SimUnits:
+        return SimUnits(self.model.townhalls.values())
+
+    @property
+    def mineral_field(self) -> SimUnits:
+        return SimUnits(self.model.patches.values())
+
+    resources = mineral_field
+
+
+class MiningModel:
+    """
+    Mining on a synthetic layout: `workers` SCVs at the first townhall, every townhall trains SCVs up to
+    `target_workers`. The policy gets on_unit_created(unit) for trained SCVs and `await step(bot)` every bot step.
+    """
+
+    def __init__(self, layout: str, workers: int = 12, target_workers: int = 16, game_step: int = 8):
+        self.game_step = game_step
+        self.target_workers = target_workers
+        self.minerals = 50.0
+        self.mined = 0
+        self.townhalls: dict[int, MiningStructure] = {}
+        self.patches: dict[int, MiningStructure] = {}
+        self.workers: dict[int, MiningWorker] = {}
+        self._next_tag = 1
+
+        for base in LAYOUTS[layout]:
+            center = Point2(base.center)
+            townhall = MiningStructure(self._tag(), UnitTypeId.COMMANDCENTER, center)
+            self.townhalls[townhall.tag] = townhall
+            for i in range(8):
+                angle = math.radians(base.facing - 60.0 + 120.0 * i / 7)
+                distance = base.close if i % 2 == 0 else base.far
+                position = Point2((center.x + distance * math.cos(angle), center.y + distance * math.sin(angle)))
+                patch = MiningStructure(self._tag(), UnitTypeId.MINERALFIELD, position)
+                self.patches[patch.tag] = patch
+
+        first = next(iter(self.townhalls.values()))
+        for _ in range(workers):
+            self._spawn(first)
+        self.bot = MiningBot(self)
+
+    def _tag(self) -> int:
+        self._next_tag += 1
+        return self._next_tag
+
+    def _spawn(self, townhall: MiningStructure) -> MiningWorker:
+        worker = MiningWorker(self, self._tag(), townhall.position)
+        self.workers[worker.tag] = worker
+        return worker
+
+    def _train(self, dt: float, policy) -> None:
+        training = sum(1 for townhall in self.townhalls.values() if townhall.training > 0)
+        for townhall in self.townhalls.values():
+            if townhall.training > 0:
+                townhall.training -= dt
+                if townhall.training <= 0:
+                    worker = self._spawn(townhall)
+                    if hasattr(policy, "on_unit_created"):
+                        policy.on_unit_created(worker)
+            elif len(self.workers) + training < self.target_workers and self.minerals >= WORKER_COST:
+                self.minerals -= WORKER_COST
+                townhall.training = WORKER_BUILD_TIME
+                training += 1
+
+    async def _run(self, policy, duration: float) -> int:
+        dt = 1.0 / LOOPS_PER_SECOND
+        for loop in range(int(duration * LOOPS_PER_SECOND)):
+            self.bot.state.game_loop = loop
+            if loop % self.game_step == 0:
+                await policy.step(self.bot)
+            self._train(dt, policy)
+            for worker in list(self.workers.values()):
+                worker.advance(dt)
+        return self.mined
+
+    def run(self, policy, duration: float = 60.0) -> int:
+        """Minerals mined in `duration` game seconds."""
+        return asyncio.run(self._run(policy, duration))
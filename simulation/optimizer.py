@@ -0,0 +1,146 @@
+"""
+Build order search on top of the economy simulator.
+Candidates are mutated (reorder, insert, remove, retarget entries), scored by simulation in a process pool, and the
+Pareto front of the metrics is kept. The result is printed in the list-of-dicts format MacroTwoBase takes.
+
+Run from the repository root: python -m simulation.optimizer --order pig_gold --generations 20
+"""
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from sc2.ids.unit_typeid import UnitTypeId
+
+from .economy import SimulationReport, simulate
+
+# Metric name -> (score function, True to maximize)
+METRICS: dict[str, tuple[Callable[[SimulationReport], float], bool]] = {
+    "time_to_5_barracks": (lambda report: report.time_to(UnitTypeId.BARRACKS, 5) or math.inf, False),
+    "army_supply_at_6:00": (lambda report: report.army_supply_at(360), True),
+}
+
+
+def evaluate(build_order: list, duration: float = 600.0, metrics: tuple = tuple(METRICS)) -> tuple:
+    """Simulate a build order, returns its metrics (in METRICS units)."""
+    report = simulate(build_order, duration)
+    return tuple(METRICS[name][0](report) for name in metrics)
+
+
+def dominates(a: tuple, b: tuple, maximize: tuple) -> bool:
+    """Whether scores `a` are at least as good as `b` on every metric and better on one."""
+    better = False
+    for x, y, up in zip(a, b, maximize):
+        if (x < y) if up else (x > y):
+            return False
+        if x != y:
+            better = True
+    return better
+
+
+def pareto_front(candidates: list[tuple[list, tuple]], maximize: tuple) -> list[tuple[list, tuple]]:
+    """Non-dominated (build order, scores) pairs, one per distinct score."""
+    front, seen = [], set()
+    for order, scores in candidates:
+        if scores in seen or any(dominates(other, scores, maximize) for _, other in candidates):
+            continue
+        seen.add(scores)
+        front.append((order, scores))
+    return front
+
+
+def mutate(build_order: list, rng: random.Random) -> list:
+    """A copy of the build order with one entry moved, inserted, removed or retargeted."""
+    order = [dict(entry) if isinstance(entry, dict) else entry for entry in build_order]
+    units = [entry for entry in order if isinstance(entry, dict)]
+    operation = rng.choice(["move", "insert", "remove", "retarget"])
+
+    if operation == "move" and len(order) > 1:
+        entry = order.pop(rng.randrange(len(order)))
+        order.insert(rng.randrange(len(order) + 1), entry)
+    elif operation == "insert" and units:
+        unit_type, target = next(iter(rng.choice(units).items()))
+        target = rng.choice([-1, 1]) * (abs(target) + rng.choice([0, 1])) if target else rng.choice([-1, 1])
+        order.insert(rng.randrange(len(order) + 1), {unit_type: target})
+    elif operation == "remove" and len(order) > 1:
+        order.pop(rng.randrange(len(order)))
+    elif units:
+        entry = rng.choice(units)
+        unit_type, target = next(iter(entry.items()))
+        if target is not None:
+            entry[unit_type] = target + rng.choice([-1, 1])
+    return order
+
+
+def optimize(
+    build_order: list,
+    generations: int = 20,
+    population: int = 32,
+    workers: int = None,
+    duration: float = 600.0,
+    seed: int = 0,
+    metrics: tuple = tuple(METRICS),
+) -> list[tuple[list, tuple]]:
+    """
+    Evolve the build order, returns the Pareto front as (build order, scores) pairs.
+    Each generation evaluates `population` mutants of the current front on `workers` processes (all cores by default).
+    """
+    rng = random.Random(seed)
+    maximize = tuple(METRICS[name][1] for name in metrics)
+    scored: dict[str, tuple[list, tuple]] = {}  # repr(build order) -> (build order, scores)
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        def score(candidates: list[list]) -> None:
+            fresh = {repr(candidate): candidate for candidate in candidates if repr(candidate) not in scored}
+            results = pool.map(evaluate, fresh.values(), [duration] * len(fresh), [metrics] * len(fresh))
+            for key, candidate, scores in zip(fresh, fresh.values(), results):
+                scored[key] = (candidate, scores)
+
+        score([build_order])
+        front = pareto_front(list(scored.values()), maximize)
+        for generation in range(generations):
+            score([mutate(rng.choice(front)[0], rng) for _ in range(population)])
+            front = pareto_front(list(scored.values()), maximize)
+            print(f"Generation {generation + 1}: {len(scored)} build orders, front {[scores for _, scores in front]}")
+
+    return front
+
+
+def format_build_order(build_order: list) -> str:
+    """Python source of a build order, as MacroTwoBase(build_order=[...]) takes it."""
+    lines = ["["]
+    for entry in build_order:
+        if isinstance(entry, dict):
+            unit_type, target = next(iter(entry.items()))
+            lines.append(f"    {{UnitTypeId.{unit_type.name}: {target}}},")
+        else:
+            lines.append(f"    {entry},")
+    lines.append("]")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search build orders with the economy simulator")
+    parser.add_argument("--order", choices=["macro", "pig_gold"], default="pig_gold", help="build order to start from")
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--population", type=int, default=32, help="mutants evaluated per generation")
+    parser.add_argument("--workers", type=int, default=None, help="processes, all cores by default")
+    parser.add_argument("--duration", type=float, default=600.0, help="game seconds to simulate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.order == "pig_gold":
+        from strategy.pig_gold import BUILD_ORDER
+    else:
+        from macro.macro import BUILD_ORDER
+
+    front = optimize(BUILD_ORDER, args.generations, args.population, args.workers, args.duration, args.seed)
+    for build_order, scores in front:
+        print(", ".join(f"{name}: {value}" for name, value in zip(METRICS, scores)))
+        print(format_build_order(build_order))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import math
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+# 4 of the 8 neighbour offsets, the graph is undirected so the other 4 come for free
+NEIGHBOUR_OFFSETS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+
+class DistanceFields:
+    """
+    Walking distance fields over the pathing grid.
+    Each field is a [x, y] uint16 array of the distance (in tenths of a tile) from its source,
+    computed once with Dijkstra over the 8-connected pathable tiles.
+    """
+
+    SCALE = 10  # stored value = distance in tiles * SCALE
+    UNREACHABLE = np.iinfo(np.uint16).max
+
+    def __init__(self, pathable: np.ndarray):
+        self.pathable = pathable.astype(bool)
+        self.width, self.height = self.pathable.shape
+        self.graph = None  # built on the first compute, not needed when the fields come from the cache
+        self.fields: dict[str, np.ndarray] = {}
+
+    def _build_graph(self):
+        """Sparse adjacency matrix between pathable tiles, node id = x * height + y."""
+        ids = np.arange(self.width * self.height).reshape(self.width, self.height)
+        sources, targets, weights = [], [], []
+
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            # Slices of the tiles (a) and their neighbour (b) that are both inside the map
+            ax = slice(max(-dx, 0), self.width - max(dx, 0))
+            bx = slice(max(dx, 0), self.width - max(-dx, 0))
+            ay = slice(max(-dy, 0), self.height - max(dy, 0))
+            by = slice(max(dy, 0), self.height - max(-dy, 0))
+
+            connected = self.pathable[ax, ay] & self.pathable[bx, by]
+            if dx and dy:
+                # No corner cutting: both orthogonal tiles of a diagonal step must be pathable
+                connected &= self.pathable[bx, ay] & self.pathable[ax, by]
+
+            sources.append(ids[ax, ay][connected])
+            targets.append(ids[bx, by][connected])
+            weights.append(np.full(np.count_nonzero(connected), math.hypot(dx, dy)))
+
+        n = self.width * self.height
+        return coo_matrix(
+            (np.concatenate(weights), (np.concatenate(sources), np.concatenate(targets))), shape=(n, n)
+        ).tocsr()
+
+    def _tile(self, point) -> tuple:
+        x = min(max(int(point[0]), 0), self.width - 1)
+        y = min(max(int(point[1]), 0), self.height - 1)
+        return x, y
+
+    def _source_node(self, point, search_radius: int = 5) -> int:
+        """Graph node of a source point, snapped to the closest pathable tile if needed."""
+        x, y = self._tile(point)
+        if not self.pathable[x, y]:
+            x0, x1 = max(x - search_radius, 0), min(x + search_radius + 1, self.width)
+            y0, y1 = max(y - search_radius, 0), min(y + search_radius + 1, self.height)
+            candidates = np.argwhere(self.pathable[x0:x1, y0:y1])
+            if len(candidates):
+                offsets = candidates + (x0 - x, y0 - y)
+                cx, cy = candidates[np.argmin((offsets ** 2).sum(axis=1))]
+                x, y = x0 + int(cx), y0 + int(cy)
+        return x * self.height + y
+
+    def compute(self, sources: dict) -> None:
+        """Compute one field per named source point in a single Dijkstra run."""
+        names = list(sources)
+        if not names:
+            return
+
+        if self.graph is None:
+            self.graph = self._build_graph()
+
+        nodes = [self._source_node(sources[name]) for name in names]
+        distances = dijkstra(self.graph, directed=False, indices=nodes)
+
+        scaled = np.rint(distances * self.SCALE)
+        scaled[~np.isfinite(scaled) | (scaled >= self.UNREACHABLE)] = self.UNREACHABLE
+        scaled = scaled.astype(np.uint16).reshape(len(names), self.width, self.height)
+
+        for name, field in zip(names, scaled):
+            self.fields[name] = field
+
+    def field(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def distance(self, name: str, point) -> float:
+        """Walking distance (in tiles) from the field's source to a point, inf if unreachable."""
+        value = self.fields[name][self._tile(point)]
+        return math.inf if value == self.UNREACHABLE else value / self.SCALE
+
+    def distances(self, name: str, points) -> np.ndarray:
+        """Walking distances (in tiles) from the field's source to many points at once."""
+        points = np.asarray([(p[0], p[1]) for p in points], dtype=float).reshape(-1, 2)
+        xs = np.clip(points[:, 0].astype(int), 0, self.width - 1)
+        ys = np.clip(points[:, 1].astype(int), 0, self.height - 1)
+        values = self.fields[name][xs, ys]
+        return np.where(values == self.UNREACHABLE, np.inf, values / self.SCALE)
+
+    def to_arrays(self) -> dict:
+        return {f"distance_{name}": field for name, field in self.fields.items()}
+
+    def load_arrays(self, arrays: dict) -> None:
+        for key, field in arrays.items():
+            if key.startswith("distance_"):
+                self.fields[key[len("distance_"):]] = field
+
+
+def expansion_field(expansion_id: int) -> str:
+    """Name of the distance field of an expansion location."""
+    return f"expansion_{expansion_id}"
@@ -2,6 +2,13 @@ import numpy as np
 import cv2
 from sc2.bot_ai import BotAI
 
+from .distance_field import DistanceFields, expansion_field
+from .map_cache import MapAnalysisCache
+from .mineral_lines import MineralLines
+from .occupancy import SlotOccupancy
+from .packed_mask import BitPlaneMask, CroppedMasks
+from .rect_index import FreeRectIndex
+
 class MapAnalysis:
     """
     Simplified map analysis module that generates obstruction and unobstructed masks.
@@ -16,26 +23,53 @@ class MapAnalysis:
     
     NUM_OBSTRUCTION_TYPES = 5
     
-    def __init__(self, bot: BotAI):
+    # unit_placement keys persisted in the cache
+    PLACEMENT_KINDS = ("barracks", "supply")
+    
+    def __init__(self, bot: BotAI, cache: MapAnalysisCache = None):
         self.bot = bot
+        self.cache = cache if cache is not None else MapAnalysisCache()
         self.width = bot.game_info.placement_grid.width
         self.height = bot.game_info.placement_grid.height
         
-        # Initialize the 3D mask [x, y, obstruction_type]
-        self.obstruction_mask = np.zeros((self.width, self.height, self.NUM_OBSTRUCTION_TYPES), dtype=bool)
+        # Initialize the 3D mask [x, y, obstruction_type], one bit per obstruction type
+        self.obstruction_mask = BitPlaneMask(self.width, self.height, self.NUM_OBSTRUCTION_TYPES)
         
         # Initialize unobstructed mask [x, y, expansion_id] - each expansion gets its own layer
         self.expansion_locations_list = list(self.bot.expansion_locations)
         self.num_expansions = len(self.expansion_locations_list)
-        self.unobstructed_mask = np.zeros((self.width, self.height, self.num_expansions), dtype=bool)
+        self.expansion_ids = {expansion: expansion_id for expansion_id, expansion in enumerate(self.expansion_locations_list)}
+        self.unobstructed_mask = CroppedMasks(self.width, self.height, self.num_expansions)
 
         # Initialize unit placement
         self.unit_placement = {}
+
+        # Live occupancy of the unit placement slots, built once the placement is known
+        self.occupancy: dict[str, SlotOccupancy] = {}
+
+        # Walking distance fields from the start, the main ramp and every expansion
+        self.distance_fields: DistanceFields = None
+        self.natural_expansion_id: int = None
+
+        # Walking distances between all expansions plus the enemy start (last row/column)
+        self.enemy_start_index = self.num_expansions
+        self.expansion_distances: np.ndarray = None
+        self._expansion_orders: np.ndarray = None
+        self._ramp_order: np.ndarray = None
+        self._start_order: np.ndarray = None
+
+        # Mineral patches, geysers, drop-off points and trip distances of every expansion
+        self.mineral_lines = MineralLines()
         
     def analyze_map(self):
         """
         Perform complete map analysis and populate obstruction masks.
+        Results are loaded from the on-disk cache when this map was analyzed before.
         """
+        if self._load_from_cache():
+            print("Map analysis loaded from cache")
+            return
+
         print("Starting map analysis...")
         
         # Analyze different obstruction types
@@ -44,6 +78,13 @@ class MapAnalysis:
         self._analyze_resource_obstructions()
         self._analyze_expansion_obstructions()
         self._analyze_ramp_structure_obstructions()
+
+        # Analyze walking distances over the pathing grid
+        self._analyze_distance_fields()
+        self._analyze_expansion_distances()
+
+        # Analyze the resource geometry of every expansion
+        self.mineral_lines.compute(self.bot, self.expansion_locations_list)
         
         # Analyze unobstructed areas for each expansion
         self._analyze_unobstructed_areas()
@@ -51,53 +92,80 @@ class MapAnalysis:
         # Analyze structure placement
         self._analyze_production_placement()
         self._analyze_supply_placement()
+
+        self.cache.save(self.bot, self._cache_arrays())
+        self._build_occupancy()
         
         print("Map analysis complete!")
+
+    def _cache_arrays(self) -> dict:
+        """Arrays persisted by the map analysis cache."""
+        arrays = {"obstruction_bits": self.obstruction_mask.bits}
+        arrays.update(self.unobstructed_mask.to_arrays("unobstructed"))
+        for kind in self.PLACEMENT_KINDS:
+            blocks = self.unit_placement.get(kind, [])
+            arrays[f"placement_{kind}"] = np.array(blocks, dtype=np.int32).reshape(-1, 4)
+        if self.distance_fields is not None:
+            arrays.update(self.distance_fields.to_arrays())
+            arrays["natural_expansion_id"] = np.int32(self.natural_expansion_id)
+        arrays.update(self.mineral_lines.to_arrays())
+        return arrays
+
+    def _load_from_cache(self) -> bool:
+        """Restore the masks and unit placement from the cache, returns False on a miss."""
+        arrays = self.cache.load(self.bot)
+        required = {"obstruction_bits", "unobstructed_bounds", "unobstructed_bits", "natural_expansion_id"}
+        required |= {f"placement_{kind}" for kind in self.PLACEMENT_KINDS}
+        required |= {f"distance_{name}" for name in self._distance_sources()}
+        required |= set(MineralLines.ARRAYS)
+        if arrays is None or not required <= set(arrays):
+            return False
+
+        if (arrays["obstruction_bits"].shape != self.obstruction_mask.bits.shape
+                or len(arrays["unobstructed_bounds"]) != self.num_expansions):
+            return False
+
+        self.obstruction_mask.bits = arrays["obstruction_bits"]
+        self.unobstructed_mask.load_arrays("unobstructed", arrays)
+        self.unit_placement = {
+            kind: arrays[f"placement_{kind}"].tolist() for kind in self.PLACEMENT_KINDS
+        }
+        self.distance_fields = DistanceFields(self._pathable_mask())
+        self.distance_fields.load_arrays(arrays)
+        self.natural_expansion_id = int(arrays["natural_expansion_id"])
+        self.mineral_lines.load_arrays(arrays)
+        self._analyze_expansion_distances()
+        self._build_occupancy()
+        return True
         
     def _analyze_terrain_obstructions(self):
         """Mark terrain obstructions (unbuildable terrain)."""
-        for x in range(self.width):
-            for y in range(self.height):
-                if not self.bot.game_info.placement_grid[x, y]:
-                    self.obstruction_mask[x, y, self.TERRAIN] = True
+        # data_numpy is [y, x], the masks are [x, y]
+        placement = self.bot.game_info.placement_grid.data_numpy.T
+        self.obstruction_mask[:, :, self.TERRAIN] = placement == 0
     
     def _analyze_pathing_obstructions(self):
         """Mark pathing obstructions (unwalkable terrain)."""
-        for x in range(self.width):
-            for y in range(self.height):
-                if not self.bot.game_info.pathing_grid[x, y]:
-                    self.obstruction_mask[x, y, self.PATHING] = True
+        pathing = self.bot.game_info.pathing_grid.data_numpy.T
+        self.obstruction_mask[:, :, self.PATHING] = pathing == 0
     
     def _analyze_resource_obstructions(self):
         """Mark mineral fields and vespene geysers as obstructions."""
         # Mineral field obstructions (2x1 size)
         for mineral in self.bot.mineral_field:
             mx, my = int(mineral.position.x), int(mineral.position.y)
-            for dx in range(-1, 1):  # 2 tiles wide
-                for dy in range(0, 1):   # 1 tile tall
-                    ox, oy = mx + dx, my + dy
-                    if 0 <= ox < self.width and 0 <= oy < self.height:
-                        self.obstruction_mask[ox, oy, self.RESOURCES] = True
+            self._mark_rect(self.RESOURCES, mx - 1, my, 2, 1)
         
         # Vespene geyser obstructions (3x3 size)
         for geyser in self.bot.vespene_geyser:
             gx, gy = int(geyser.position.x), int(geyser.position.y)
-            for dx in range(-1, 2):  # 3x3 around center
-                for dy in range(-1, 2):
-                    ox, oy = gx + dx, gy + dy
-                    if 0 <= ox < self.width and 0 <= oy < self.height:
-                        self.obstruction_mask[ox, oy, self.RESOURCES] = True
+            self._mark_rect(self.RESOURCES, gx - 1, gy - 1, 3, 3)
     
     def _analyze_expansion_obstructions(self):
         """Mark 5x5 expansion locations as obstructions."""
         for expansion in self.bot.expansion_locations:
             ex, ey = int(expansion.x), int(expansion.y)
-            # 5x5 area around expansion center
-            for dx in range(-2, 3):
-                for dy in range(-2, 3):
-                    ox, oy = ex + dx, ey + dy
-                    if 0 <= ox < self.width and 0 <= oy < self.height:
-                        self.obstruction_mask[ox, oy, self.EXPANSION] = True
+            self._mark_rect(self.EXPANSION, ex - 2, ey - 2, 5, 5)
     
     def _analyze_ramp_structure_obstructions(self):
         """Mark ramp depot and barracks locations as obstructions."""
@@ -105,10 +173,7 @@ class MapAnalysis:
             # Depot positions (2x2 size)
             for depot_pos in getattr(ramp, "corner_depots", []):
                 dx, dy = int(depot_pos.x), int(depot_pos.y)
-                for ox in range(dx - 1, dx + 1):  # 2x2
-                    for oy in range(dy - 1, dy + 1):
-                        if 0 <= ox < self.width and 0 <= oy < self.height:
-                            self.obstruction_mask[ox, oy, self.RAMP_STRUCTURES] = True
+                self._mark_rect(self.RAMP_STRUCTURES, dx - 1, dy - 1, 2, 2)
             
             # Barracks positions (3x3 size) - handle potential assertion errors
             barracks_positions = []
@@ -130,80 +195,170 @@ class MapAnalysis:
             
             for barracks_pos in barracks_positions:
                 bx, by = int(barracks_pos.x), int(barracks_pos.y)
-                for ox in range(bx - 1, bx + 2):  # 3x3
-                    for oy in range(by - 1, by + 2):
-                        if 0 <= ox < self.width and 0 <= oy < self.height:
-                            self.obstruction_mask[ox, oy, self.RAMP_STRUCTURES] = True
+                self._mark_rect(self.RAMP_STRUCTURES, bx - 1, by - 1, 3, 3)
+
+    def _mark_rect(self, obstruction_type: int, x: int, y: int, w: int, h: int):
+        """Mark a w x h rectangle with its corner at (x, y), clipped to the map."""
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        if x0 < x1 and y0 < y1:
+            self.obstruction_mask[x0:x1, y0:y1, obstruction_type] = True
     
+    def _pathable_mask(self) -> np.ndarray:
+        """Walkable tiles, including the 5x5 townhall footprints that hide the start location."""
+        return ~self.obstruction_mask[:, :, self.PATHING] | self.obstruction_mask[:, :, self.EXPANSION]
+
+    def _distance_sources(self) -> dict:
+        sources = {
+            "start": self.bot.start_location,
+            "ramp": self.bot.main_base_ramp.top_center,
+        }
+        for expansion_id, expansion in enumerate(self.expansion_locations_list):
+            sources[expansion_field(expansion_id)] = expansion
+        return sources
+
+    def _analyze_distance_fields(self):
+        """Compute the walking distance fields and pick the natural expansion."""
+        self.distance_fields = DistanceFields(self._pathable_mask())
+        self.distance_fields.compute(self._distance_sources())
+
+        # Natural: the expansion closest to the main ramp (by walking distance), excluding the main
+        candidates = [
+            expansion_id for expansion_id, expansion in enumerate(self.expansion_locations_list)
+            if expansion.distance_to(self.bot.start_location) > 2
+        ]
+        if candidates:
+            ramp_position = self.bot.main_base_ramp.top_center
+            self.natural_expansion_id = min(candidates, key=lambda expansion_id: (
+                self.distance_fields.distance("ramp", self.expansion_locations_list[expansion_id]),
+                self.expansion_locations_list[expansion_id].distance_to(ramp_position),
+            ))
+        else:
+            self.natural_expansion_id = -1
+
+    def _analyze_expansion_distances(self):
+        """Build the (N+1)x(N+1) walking distance matrix between expansions and the enemy start."""
+        points = list(self.expansion_locations_list)
+        if self.bot.enemy_start_locations:
+            points.append(self.bot.enemy_start_locations[0])
+        else:
+            points.append(self.bot.start_location)
+        n = len(points)
+
+        # Row i = field of expansion i sampled at every point, the enemy start row comes from symmetry
+        columns = np.array([self.distance_fields.distances(expansion_field(i), points) for i in range(self.num_expansions)]).reshape(self.num_expansions, n)
+        matrix = np.zeros((n, n), dtype=np.float32)
+        square = columns[:, :self.num_expansions]
+        matrix[:self.num_expansions, :self.num_expansions] = np.minimum(square, square.T)  # snapped sources may differ slightly
+        matrix[:self.num_expansions, self.enemy_start_index] = columns[:, self.enemy_start_index]
+        matrix[self.enemy_start_index, :self.num_expansions] = columns[:, self.enemy_start_index]
+        np.fill_diagonal(matrix, 0)
+
+        self.expansion_distances = matrix
+        # Expansion ids sorted by walking distance from each row (stable so ties keep the map order)
+        self._expansion_orders = np.argsort(matrix[:, :self.num_expansions], axis=1, kind="stable")
+
+        ramp = self.distance_fields.distances("ramp", self.expansion_locations_list)
+        self._ramp_order = np.argsort(ramp, kind="stable")
+        start = self.distance_fields.distances("start", self.expansion_locations_list)
+        self._start_order = np.argsort(start, kind="stable")
+
+    def nearest_bases(self, origin, k: int = None) -> list:
+        """
+        Expansion ids sorted by walking distance from an origin, the origin itself excluded.
+        origin: an expansion id, enemy_start_index, "ramp", "start", a position, or a list of ids (sum of distances).
+        """
+        if isinstance(origin, str):
+            order = self._ramp_order if origin == "ramp" else self._start_order
+            return order[:k].tolist()
+
+        if isinstance(origin, (list, tuple, np.ndarray)) and not hasattr(origin, "x"):
+            totals = self.expansion_distances[list(origin), :self.num_expansions].sum(axis=0)
+            return np.argsort(totals, kind="stable")[:k].tolist()
+
+        if not isinstance(origin, (int, np.integer)):
+            origin = self.expansion_id(origin)
+            if origin is None:
+                return []
+
+        order = self._expansion_orders[origin]
+        order = order[order != origin]
+        return order[:k].tolist()
+
+    def base_distance(self, a: int, b: int) -> float:
+        """Walking distance between two expansion ids (enemy_start_index for the enemy start)."""
+        return float(self.expansion_distances[a, b])
+
+    @property
+    def natural_location(self):
+        """Position of the natural expansion, or None if the map has none."""
+        if self.natural_expansion_id is None or self.natural_expansion_id < 0:
+            return None
+        return self.expansion_locations_list[self.natural_expansion_id]
+
+    def expansion_id(self, point) -> int:
+        """Index of the expansion location at (or within 1 tile of) a point, None if there is none."""
+        expansion_id = self.expansion_ids.get(point)
+        if expansion_id is None and self.expansion_locations_list:
+            closest = min(range(self.num_expansions), key=lambda i: self.expansion_locations_list[i].distance_to(point))
+            if self.expansion_locations_list[closest].distance_to(point) <= 1:
+                expansion_id = closest
+        return expansion_id
+
+    def walking_distance(self, name: str, point) -> float:
+        """Walking distance (in tiles) from a named source ("start", "ramp", "natural" or an expansion id) to a point."""
+        if name == "natural":
+            name = self.natural_expansion_id
+            if name is None or name < 0:
+                return float("inf")
+        if isinstance(name, int):
+            name = expansion_field(name)
+        return self.distance_fields.distance(name, point)
+
     def _analyze_unobstructed_areas(self):
         """Analyze unobstructed areas for each expansion location using connected components."""
         print(f"Analyzing unobstructed areas for {self.num_expansions} expansions...")
 
+        terrain = self.obstruction_mask[:, :, self.TERRAIN]
+        obstructed = self.obstruction_mask.any(axis=2)
+
         for expansion_id, expansion in enumerate(self.expansion_locations_list):
             ex, ey = int(expansion.x), int(expansion.y)
 
             # Create a mask for potential unobstructed positions within 15 tiles radius
             radius = 25 if expansion.position.distance_to(self.bot.start_location) < 5 else 15
             mask_size = radius * 2 + 1  # 31x31 mask
+
+            # Window of the map covered by the mask, clipped to the map bounds
+            x0, x1 = max(ex - radius, 0), min(ex + radius + 1, self.width)
+            y0, y1 = max(ey - radius, 0), min(ey + radius + 1, self.height)
+            mx0, mx1 = x0 - ex + radius, x1 - ex + radius
+            my0, my1 = y0 - ey + radius, y1 - ey + radius
+
+            # Fill mask [mask_y, mask_x] with unobstructed positions (inverse of TERRAIN) inside the radius
+            offsets = np.arange(-radius, radius + 1)
+            disk = offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius * radius
             temp_mask = np.zeros((mask_size, mask_size), dtype=np.uint8)
-            
-            # Fill mask with unobstructed positions (inverse of TERRAIN obstruction)
-            for dx in range(-radius, radius + 1):
-                for dy in range(-radius, radius + 1):
-                    map_x, map_y = ex + dx, ey + dy
-                    mask_x, mask_y = dx + radius, dy + radius  # Convert to mask coordinates
-                    
-                    # Check if position is within map bounds and within radius
-                    if (0 <= map_x < self.width and 
-                        0 <= map_y < self.height and
-                        dx * dx + dy * dy <= radius * radius):
-                        
-                        # Mark as unobstructed if not a TERRAIN obstruction
-                        if not self.obstruction_mask[map_x, map_y, self.TERRAIN]:
-                            temp_mask[mask_y, mask_x] = 255
+            if x0 < x1 and y0 < y1:
+                temp_mask[my0:my1, mx0:mx1] = ~terrain[x0:x1, y0:y1].T
+            temp_mask[~disk] = 0
+            temp_mask *= 255
             
             # Find connected components (blobs)
             num_labels, labels = cv2.connectedComponents(temp_mask, connectivity=8)
             
             # Find which blob contains the expansion location (center of mask)
-            expansion_mask_x, expansion_mask_y = radius, radius  # Expansion is at center of mask
-            expansion_blob_label = labels[expansion_mask_y, expansion_mask_x]
+            expansion_blob_label = labels[radius, radius]
             
-            # Only add positions from the expansion's blob to the unobstructed mask
+            # Only add positions from the expansion's blob to the unobstructed mask,
+            # minus every position that has any obstruction type
             if expansion_blob_label > 0:  # 0 is background
-                for mask_y in range(mask_size):
-                    for mask_x in range(mask_size):
-                        if labels[mask_y, mask_x] == expansion_blob_label:
-                            # Convert back to world coordinates
-                            dx, dy = mask_x - radius, mask_y - radius
-                            map_x, map_y = ex + dx, ey + dy
-                            
-                            # Double check bounds and mark in unobstructed mask
-                            if 0 <= map_x < self.width and 0 <= map_y < self.height:
-                                self.unobstructed_mask[map_x, map_y, expansion_id] = True
+                blob = (labels[my0:my1, mx0:mx1] == expansion_blob_label).T
+                unobstructed = blob & ~obstructed[x0:x1, y0:y1]
+                self.unobstructed_mask.set_layer(expansion_id, x0, y0, unobstructed)
                 
-                # Remove all other obstruction types from the unobstructed mask
-                # Check each position in the blob and remove if it has any obstruction
-                positions_to_remove = []
-                for x in range(self.width):
-                    for y in range(self.height):
-                        if self.unobstructed_mask[x, y, expansion_id]:
-                            # Check if this position has ANY obstruction type
-                            has_obstruction = False
-                            for obstruction_type in range(self.NUM_OBSTRUCTION_TYPES):
-                                if self.obstruction_mask[x, y, obstruction_type]:
-                                    has_obstruction = True
-                                    break
-                            
-                            if has_obstruction:
-                                positions_to_remove.append((x, y))
-                
-                # Remove obstructed positions from the unobstructed mask
-                for x, y in positions_to_remove:
-                    self.unobstructed_mask[x, y, expansion_id] = False
-                
-                blob_size = np.sum(self.unobstructed_mask[:, :, expansion_id])
-                removed_count = len(positions_to_remove)
+                blob_size = int(np.count_nonzero(unobstructed))
+                removed_count = int(np.count_nonzero(blob)) - blob_size
                 print(f"  Expansion {expansion_id} at ({ex}, {ey}): {blob_size} unobstructed tiles (removed {removed_count} obstructed positions)")
             else:
                 print(f"  Expansion {expansion_id} at ({ex}, {ey}): No unobstructed area found")
@@ -222,36 +377,19 @@ class MapAnalysis:
             print("Warning: Could not find start position expansion")
             return []
         
-        start_mask = self.unobstructed_mask[:, :, start_expansion_id].copy()
+        start_mask = self.unobstructed_mask[:, :, start_expansion_id]
         
         # Erode the mask by 1 pixel
         start_mask_uint8 = (start_mask * 255).astype(np.uint8)
         kernel = np.ones((3, 3), np.uint8)  # 3x3 kernel for erosion by 1
         eroded_mask = cv2.erode(start_mask_uint8, kernel, iterations=1)
-        working_mask = eroded_mask > 0
+        free_index = FreeRectIndex(eroded_mask > 0)
 
         # Greedy algorithm to find blocks
         block_heights = [12, 9, 6]  # Try largest first for better packing
         block_width = 6
         placed_blocks = []
         
-        def can_place_block(mask, x, y, w, h):
-            """Check if a block of size w x h can be placed at position (x, y)"""
-            if x + w > self.width or y + h > self.height:
-                return False
-            
-            for dx in range(w):
-                for dy in range(h):
-                    if not mask[x + dx, y + dy]:
-                        return False
-            return True
-        
-        def place_block(mask, x, y, w, h):
-            """Mark the block area as occupied in the mask"""
-            for dx in range(w):
-                for dy in range(h):
-                    mask[x + dx, y + dy] = False
-        
         # Keep placing blocks until no more can be placed
         blocks_placed = True
         while blocks_placed:
@@ -259,21 +397,13 @@ class MapAnalysis:
             
             # Try each block height in order (largest first)
             for block_height in block_heights:
-                best_position = None
-                
-                # Find the best position for this block height
-                for y in range(self.height - block_height + 1):
-                    for x in range(self.width - block_width + 1):
-                        if can_place_block(working_mask, x, y, block_width, block_height):
-                            best_position = (x, y)
-                            break
-                    if best_position:
-                        break
+                # Find the first free position for this block height (row by row)
+                best_position = free_index.first_free(block_width, block_height)
                 
                 # If we found a position, place the block
                 if best_position:
                     x, y = best_position
-                    place_block(working_mask, x, y, block_width, block_height)
+                    free_index.occupy(x, y, block_width, block_height)
                     placed_blocks.append([x, y, block_width, block_height])
                     blocks_placed = True
                     break  # Start over with largest blocks again
@@ -318,7 +448,7 @@ class MapAnalysis:
             return []
     
         # Get the unobstructed mask for the start position
-        mask = self.unobstructed_mask[:, :, start_expansion_id].copy()
+        mask = self.unobstructed_mask[:, :, start_expansion_id]
         
         # Debug: Check if mask has any True values
         total_unobstructed = np.sum(mask)
@@ -377,14 +507,43 @@ class MapAnalysis:
                 depot_positions.append([depot_x, depot_y, depot_size, depot_size])
                 used_tiles.update(depot_tiles)
 
-        # sort farthest from the ramp
-        ramp_position = self.bot.main_base_ramp.top_center
-        depot_positions.sort(key=lambda depot: ((depot[0] + 1 - ramp_position.x) ** 2 + (depot[1] + 1 - ramp_position.y) ** 2) ** 0.5, reverse=True)
+        # sort farthest from the ramp (walking distance, unreachable tiles last)
+        ramp_distances = self.distance_fields.distances("ramp", [(depot[0] + 1, depot[1] + 1) for depot in depot_positions])
+        ramp_distances[np.isinf(ramp_distances)] = -1
+        order = sorted(range(len(depot_positions)), key=lambda i: ramp_distances[i], reverse=True)
+        depot_positions = [depot_positions[i] for i in order]
 
         self.unit_placement["supply"] = depot_positions
 
         print(f"Found optimal supply depot layout with {len(depot_positions)}")
 
+    def _build_occupancy(self):
+        self.occupancy = {
+            kind: SlotOccupancy(self.width, self.height, self.unit_placement.get(kind, []))
+            for kind in self.PLACEMENT_KINDS
+        }
+
+    def on_building_construction_started(self, unit):
+        """Mark the placement slots under a new structure as used."""
+        radius = unit.footprint_radius
+        if radius is None:
+            return
+        for occupancy in self.occupancy.values():
+            occupancy.occupy(unit.tag, unit.position, radius)
+
+    def on_unit_destroyed(self, unit_tag: int):
+        """Free the placement slots of a destroyed structure."""
+        for occupancy in self.occupancy.values():
+            occupancy.release(unit_tag)
+
+    def next_free_slot(self, kind: str, skip: int = 0):
+        """First free [x, y, w, h] slot of a placement kind (after skipping `skip` free ones), or None."""
+        occupancy = self.occupancy.get(kind)
+        if occupancy is None:
+            return None
+        slot = occupancy.next_free(skip)
+        return None if slot is None else occupancy.blocks[slot]
+
     def _analyze_turret_placement(self):
         self.unit_placement["turret"] = []
         # mineral
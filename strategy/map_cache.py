@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+from sc2.bot_ai import BotAI
+
+# Bump whenever MapAnalysis changes what it computes, stale cache files are then ignored
+CACHE_VERSION = 4
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SC2BOT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "map_analysis"),
+)
+
+
+class MapAnalysisCache:
+    """
+    On-disk cache of MapAnalysis results, one compressed .npz file per map fingerprint.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, version: int = CACHE_VERSION):
+        self.cache_dir = cache_dir
+        self.version = version
+
+    def fingerprint(self, bot: BotAI) -> str:
+        """Hash of everything the analysis depends on: map name, grids, start and expansion locations."""
+        game_info = bot.game_info
+        digest = hashlib.sha1()
+        digest.update(f"v{self.version}|{game_info.map_name}|".encode())
+        for grid in (game_info.placement_grid, game_info.pathing_grid):
+            data = np.ascontiguousarray(grid.data_numpy)
+            digest.update(f"{data.shape}|".encode())
+            digest.update(data.tobytes())
+        digest.update(f"|{bot.start_location.x:.1f},{bot.start_location.y:.1f}|".encode())
+        for expansion in bot.expansion_locations_list:
+            digest.update(f"{expansion.x:.1f},{expansion.y:.1f};".encode())
+        return digest.hexdigest()
+
+    def path(self, bot: BotAI) -> str:
+        map_name = "".join(c for c in bot.game_info.map_name if c.isalnum()) or "map"
+        return os.path.join(self.cache_dir, f"{map_name}_{self.fingerprint(bot)[:16]}.npz")
+
+    def load(self, bot: BotAI) -> dict:
+        """Return the cached arrays for this map, or None on a miss or unreadable/stale file."""
+        path = self.path(bot)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {key: data[key] for key in data.files}
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Warning: Ignoring unreadable map analysis cache {path}: {e}")
+            return None
+
+        if int(arrays.pop("version", -1)) != self.version:
+            return None
+        return arrays
+
+    def save(self, bot: BotAI, arrays: dict) -> None:
+        """Atomically write the arrays for this map."""
+        path = self.path(bot)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez_compressed(f, version=np.int32(self.version), **arrays)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Warning: Could not write map analysis cache {path}: {e}")
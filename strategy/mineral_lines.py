@@ -0,0 +1,91 @@
+import numpy as np
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+
+TOWNHALL_RADIUS = 2.75
+
+
+def position_key(position) -> tuple:
+    """Resource positions are on half tiles, this key matches them exactly."""
+    return round(position[0] * 2), round(position[1] * 2)
+
+
+class MineralLines:
+    """
+    Resource geometry of every expansion, as arrays with one row per mineral patch (or geyser).
+    Patches are grouped by expansion id and sorted by trip distance within an expansion; `mineral_offsets[i]`
+    is the first row of expansion i. The trip is the walk from the townhall edge to the patch edge, the
+    drop-off point is on the townhall edge facing the patch and the gather point on the patch edge facing
+    the townhall.
+    """
+
+    ARRAYS = (
+        "mineral_offsets", "mineral_positions", "mineral_expansions", "mineral_trips", "mineral_dropoffs",
+        "mineral_gathers", "geyser_positions", "geyser_expansions",
+    )
+
+    def __init__(self):
+        self.mineral_offsets = np.zeros(1, dtype=np.int32)  # [expansions + 1]
+        self.mineral_positions = np.zeros((0, 2), dtype=np.float32)
+        self.mineral_expansions = np.zeros(0, dtype=np.int32)
+        self.mineral_trips = np.zeros(0, dtype=np.float32)
+        self.mineral_dropoffs = np.zeros((0, 2), dtype=np.float32)
+        self.mineral_gathers = np.zeros((0, 2), dtype=np.float32)
+        self.geyser_positions = np.zeros((0, 2), dtype=np.float32)
+        self.geyser_expansions = np.zeros(0, dtype=np.int32)
+        self._rows: dict[tuple, int] = None  # position key -> mineral row
+
+    def compute(self, bot: BotAI, expansion_locations: list[Point2]) -> None:
+        resources = bot.expansion_locations_dict
+        offsets, positions, expansions, trips, dropoffs, gathers = [0], [], [], [], [], []
+        geyser_positions, geyser_expansions = [], []
+
+        for expansion_id, expansion in enumerate(expansion_locations):
+            minerals = resources[expansion].mineral_field
+            lines = []
+            for mineral in minerals:
+                trip = max(0.0, expansion.distance_to(mineral) - TOWNHALL_RADIUS - mineral.radius)
+                lines.append((trip, mineral.position, expansion.towards(mineral.position, TOWNHALL_RADIUS),
+                              mineral.position.towards(expansion, mineral.radius)))
+            for trip, position, dropoff, gather in sorted(lines, key=lambda line: (line[0], line[1].x, line[1].y)):
+                positions.append(position)
+                expansions.append(expansion_id)
+                trips.append(trip)
+                dropoffs.append(dropoff)
+                gathers.append(gather)
+            offsets.append(len(positions))
+
+            for geyser in resources[expansion].vespene_geyser:
+                geyser_positions.append(geyser.position)
+                geyser_expansions.append(expansion_id)
+
+        self.mineral_offsets = np.array(offsets, dtype=np.int32)
+        self.mineral_positions = np.array(positions, dtype=np.float32).reshape(-1, 2)
+        self.mineral_expansions = np.array(expansions, dtype=np.int32)
+        self.mineral_trips = np.array(trips, dtype=np.float32)
+        self.mineral_dropoffs = np.array(dropoffs, dtype=np.float32).reshape(-1, 2)
+        self.mineral_gathers = np.array(gathers, dtype=np.float32).reshape(-1, 2)
+        self.geyser_positions = np.array(geyser_positions, dtype=np.float32).reshape(-1, 2)
+        self.geyser_expansions = np.array(geyser_expansions, dtype=np.int32)
+        self._rows = None
+
+    def patches(self, expansion_id: int) -> range:
+        """Mineral rows of an expansion, shortest trip first."""
+        return range(self.mineral_offsets[expansion_id], self.mineral_offsets[expansion_id + 1])
+
+    def geysers(self, expansion_id: int) -> np.ndarray:
+        return np.flatnonzero(self.geyser_expansions == expansion_id)
+
+    def row(self, position) -> int:
+        """Mineral row at a position, None if no patch was there at the start of the game."""
+        if self._rows is None:
+            self._rows = {position_key(p): i for i, p in enumerate(self.mineral_positions.tolist())}
+        return self._rows.get(position_key(position))
+
+    def to_arrays(self) -> dict:
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    def load_arrays(self, arrays: dict) -> None:
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self._rows = None
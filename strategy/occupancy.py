@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class SlotOccupancy:
+    """
+    Live occupancy of planned placement slots ([x, y, w, h] blocks, in preference order).
+    Slots are taken when a structure starts on any of their tiles and freed when it is destroyed.
+    """
+
+    def __init__(self, width: int, height: int, blocks: list):
+        self.blocks = blocks
+        self.width = width
+        self.height = height
+
+        # [x, y] slot id of every tile, -1 outside of the slots
+        self.grid = np.full((width, height), -1, dtype=np.int32)
+        for slot, (x, y, w, h) in enumerate(blocks):
+            self.grid[x:x + w, y:y + h] = slot
+
+        self.used = np.zeros(len(blocks), dtype=np.int16)  # number of structures on each slot
+        self.cursor = 0  # every slot before the cursor is used
+        self.tags: dict[int, list[int]] = {}  # structure tag -> slots it occupies
+
+    def occupy(self, tag: int, position, radius: float) -> list:
+        """Mark the slots under a structure footprint as used, returns the slot ids."""
+        x0, x1 = max(int(round(position.x - radius)), 0), min(int(round(position.x + radius)), self.width)
+        y0, y1 = max(int(round(position.y - radius)), 0), min(int(round(position.y + radius)), self.height)
+        slots = np.unique(self.grid[x0:x1, y0:y1])
+        slots = [int(slot) for slot in slots if slot >= 0]
+
+        for slot in slots:
+            self.used[slot] += 1
+        if slots:
+            self.tags.setdefault(tag, []).extend(slots)
+        return slots
+
+    def release(self, tag: int) -> None:
+        """Free the slots of a destroyed (or cancelled) structure."""
+        for slot in self.tags.pop(tag, []):
+            self.used[slot] -= 1
+            if not self.used[slot]:
+                self.cursor = min(self.cursor, slot)
+
+    def next_free(self, skip: int = 0):
+        """Index of the first free slot (after skipping `skip` free ones), or None."""
+        while self.cursor < len(self.used) and self.used[self.cursor]:
+            self.cursor += 1
+
+        for slot in range(self.cursor, len(self.used)):
+            if not self.used[slot]:
+                if skip == 0:
+                    return slot
+                skip -= 1
+        return None
@@ -0,0 +1,168 @@
+import numpy as np
+
+
+class BitPlaneMask:
+    """
+    [x, y, plane] boolean mask stored as one uint8 bitfield, bit `plane` of bits[x, y].
+    Indexing with a single plane reads/writes like the equivalent bool array.
+    """
+
+    MAX_PLANES = 8
+
+    def __init__(self, width: int, height: int, planes: int, bits: np.ndarray = None):
+        assert planes <= self.MAX_PLANES, f"{planes} planes do not fit in a uint8 bitfield"
+        self.planes = planes
+        self.bits = bits if bits is not None else np.zeros((width, height), dtype=np.uint8)
+
+    @property
+    def shape(self) -> tuple:
+        return self.bits.shape + (self.planes,)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def _split_key(self, key):
+        if not isinstance(key, tuple) or len(key) != 3:
+            raise IndexError("BitPlaneMask is indexed as [x, y, plane]")
+        return key[:2], key[2]
+
+    def __getitem__(self, key):
+        xy, plane = self._split_key(key)
+        bits = self.bits[xy]
+        if isinstance(plane, slice):
+            planes = np.arange(self.planes)[plane].astype(np.uint8)
+            return ((bits[..., None] >> planes) & 1).astype(bool)
+        return ((bits >> np.uint8(plane)) & 1).astype(bool)
+
+    def __setitem__(self, key, value):
+        xy, plane = self._split_key(key)
+        bit = np.uint8(1 << plane)
+        bits = self.bits[xy]
+        self.bits[xy] = np.where(value, bits | bit, bits & ~bit)
+
+    def any(self, axis=None):
+        """Tiles with any plane set (axis=2), or whether any bit is set at all."""
+        if axis in (2, -1):
+            return self.bits != 0
+        return bool(self.bits.any())
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:, :, :]
+        return array if dtype is None else array.astype(dtype)
+
+
+class CroppedMasks:
+    """
+    [x, y, layer] boolean masks where each layer only keeps the bounding box of its True tiles (clearing tiles
+    in place may leave it larger until the next set_layer).
+    Reading a whole layer (mask[:, :, i]) materializes a full-size array.
+    """
+
+    def __init__(self, width: int, height: int, layers: int):
+        self.width = width
+        self.height = height
+        # Per layer: (x0, y0, crop) with crop a [w, h] bool array, or None when the layer is empty
+        self.crops = [None] * layers
+
+    @property
+    def shape(self) -> tuple:
+        return (self.width, self.height, len(self.crops))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(crop[2].nbytes for crop in self.crops if crop is not None)
+
+    def set_layer(self, layer: int, x0: int, y0: int, mask: np.ndarray) -> None:
+        """Store a mask whose [0, 0] tile is at (x0, y0), trimmed to its bounding box."""
+        xs, ys = np.nonzero(mask)
+        if len(xs) == 0:
+            self.crops[layer] = None
+            return
+        x_min, x_max, y_min, y_max = xs.min(), xs.max() + 1, ys.min(), ys.max() + 1
+        self.crops[layer] = (x0 + int(x_min), y0 + int(y_min), mask[x_min:x_max, y_min:y_max].astype(bool, copy=True))
+
+    def layer(self, layer: int) -> np.ndarray:
+        """Full-size [x, y] copy of a layer."""
+        full = np.zeros((self.width, self.height), dtype=bool)
+        if self.crops[layer] is not None:
+            x0, y0, crop = self.crops[layer]
+            full[x0:x0 + crop.shape[0], y0:y0 + crop.shape[1]] = crop
+        return full
+
+    def __getitem__(self, key):
+        x, y, layer = key
+        if isinstance(x, (int, np.integer)) and isinstance(y, (int, np.integer)) and isinstance(layer, (int, np.integer)):
+            crop = self.crops[layer]
+            if crop is None:
+                return False
+            x0, y0, data = crop
+            return bool(0 <= x - x0 < data.shape[0] and 0 <= y - y0 < data.shape[1] and data[x - x0, y - y0])
+        if isinstance(layer, slice):
+            return np.stack([self.layer(i) for i in range(len(self.crops))[layer]], axis=-1)[x, y]
+        return self.layer(layer)[x, y]
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:, :, :]
+        return array if dtype is None else array.astype(dtype)
+
+    @staticmethod
+    def _shift(index, size: int, offset: int):
+        """The same index on an axis whose first tile is `offset`."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(size)
+            stop -= offset
+            return slice(start - offset, stop if stop >= 0 else None, step)
+        if isinstance(index, (int, np.integer)):
+            return (int(index) + size if index < 0 else int(index)) - offset
+        return np.arange(size)[index] - offset
+
+    def __setitem__(self, key, value):
+        """Write inside the layer's crop, the crop only grows (and is trimmed again) for writes outside it."""
+        x, y, layer = key
+        xs, ys = np.arange(self.width)[x], np.arange(self.height)[y]
+        if np.size(xs) == 0 or np.size(ys) == 0:
+            return
+        box = (int(np.min(xs)), int(np.min(ys)), int(np.max(xs)) + 1, int(np.max(ys)) + 1)
+
+        crop = self.crops[layer]
+        if crop is not None:
+            x0, y0, data = crop
+            if x0 <= box[0] and y0 <= box[1] and box[2] <= x0 + data.shape[0] and box[3] <= y0 + data.shape[1]:
+                data[self._shift(x, self.width, x0), self._shift(y, self.height, y0)] = value
+                return
+        elif not np.any(value):
+            return  # clearing an empty layer
+
+        # Grow to the union of the crop and the written box
+        if crop is not None:
+            box = (min(box[0], x0), min(box[1], y0), max(box[2], x0 + data.shape[0]), max(box[3], y0 + data.shape[1]))
+        region = np.zeros((box[2] - box[0], box[3] - box[1]), dtype=bool)
+        if crop is not None:
+            region[x0 - box[0]:x0 - box[0] + data.shape[0], y0 - box[1]:y0 - box[1] + data.shape[1]] = data
+        region[self._shift(x, self.width, box[0]), self._shift(y, self.height, box[1])] = value
+        self.set_layer(layer, box[0], box[1], region)
+
+    def bounds(self) -> np.ndarray:
+        """[layer, (x0, y0, w, h)] int32 table, zeros for empty layers."""
+        table = np.zeros((len(self.crops), 4), dtype=np.int32)
+        for i, crop in enumerate(self.crops):
+            if crop is not None:
+                table[i] = (crop[0], crop[1], crop[2].shape[0], crop[2].shape[1])
+        return table
+
+    def to_arrays(self, prefix: str) -> dict:
+        """Bounds table plus all crops bit-packed in one uint8 array."""
+        flat = [crop[2].ravel() for crop in self.crops if crop is not None]
+        data = np.concatenate(flat) if flat else np.zeros(0, dtype=bool)
+        return {f"{prefix}_bounds": self.bounds(), f"{prefix}_bits": np.packbits(data)}
+
+    def load_arrays(self, prefix: str, arrays: dict) -> None:
+        bounds, packed = arrays[f"{prefix}_bounds"], arrays[f"{prefix}_bits"]
+        data = np.unpackbits(packed).astype(bool)
+        offset = 0
+        self.crops = [None] * len(bounds)
+        for i, (x0, y0, w, h) in enumerate(bounds.tolist()):
+            if w and h:
+                self.crops[i] = (x0, y0, data[offset:offset + w * h].reshape(w, h))
+                offset += w * h
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class FreeRectIndex:
+    """
+    Summed-area table over a [x, y] free mask.
+    Answers "is this w x h rectangle free?" in O(1) and is updated in place when a rectangle is occupied.
+    """
+
+    def __init__(self, mask: np.ndarray):
+        self.free = mask.astype(bool)
+        self.width, self.height = self.free.shape
+
+        # sat[i, j] = number of free tiles in [0, i) x [0, j)
+        self.sat = np.zeros((self.width + 1, self.height + 1), dtype=np.int32)
+        self.sat[1:, 1:] = self.free.cumsum(axis=0).cumsum(axis=1)
+
+    def count(self, x: int, y: int, w: int, h: int) -> int:
+        """Number of free tiles in the w x h rectangle with its corner at (x, y)."""
+        sat = self.sat
+        return int(sat[x + w, y + h] - sat[x, y + h] - sat[x + w, y] + sat[x, y])
+
+    def is_free(self, x: int, y: int, w: int, h: int) -> bool:
+        """Check if a block of size w x h can be placed at position (x, y)."""
+        if x < 0 or y < 0 or x + w > self.width or y + h > self.height:
+            return False
+        return self.count(x, y, w, h) == w * h
+
+    def free_positions(self, w: int, h: int) -> np.ndarray:
+        """Boolean [x, y] array of every corner where a w x h rectangle is free."""
+        if w > self.width or h > self.height:
+            return np.zeros((0, 0), dtype=bool)
+
+        sat = self.sat
+        counts = sat[w:, h:] - sat[:self.width + 1 - w, h:] - sat[w:, :self.height + 1 - h] + sat[:self.width + 1 - w, :self.height + 1 - h]
+        return counts == w * h
+
+    def first_free(self, w: int, h: int):
+        """First free corner scanning rows (y) then columns (x), or None."""
+        positions = self.free_positions(w, h).T  # [y, x] so the flat order is row by row
+        if positions.size == 0:
+            return None
+
+        index = int(np.argmax(positions))
+        if not positions.flat[index]:
+            return None
+
+        y, x = divmod(index, positions.shape[1])
+        return x, y
+
+    def occupy(self, x: int, y: int, w: int, h: int) -> None:
+        """Mark the block area as occupied and update the table incrementally."""
+        # Free tiles removed inside every prefix of the block
+        removed = self.free[x:x + w, y:y + h].cumsum(axis=0).cumsum(axis=1)
+        if removed.size == 0 or removed[-1, -1] == 0:
+            return
+
+        self.free[x:x + w, y:y + h] = False
+
+        # Every table entry below/right of the corner loses the removed tiles inside its prefix
+        rows = np.minimum(np.arange(1, self.width - x + 1), removed.shape[0]) - 1
+        cols = np.minimum(np.arange(1, self.height - y + 1), removed.shape[1]) - 1
+        self.sat[x + 1:, y + 1:] -= removed[np.ix_(rows, cols)].astype(np.int32)
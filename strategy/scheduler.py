@@ -0,0 +1,81 @@
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from sc2.bot_ai import BotAI
+
+# Priorities: tasks below HIGH are skipped (deferred to the next step) when the step is over budget
+LOW = 0
+NORMAL = 1
+HIGH = 2
+
+PHASE_HORIZON = 840  # steps over which phases are balanced, lcm(1..8)
+
+
+@dataclass
+class Task:
+    name: str
+    function: Callable[[BotAI], Awaitable]
+    period: int = 1  # run every `period` steps
+    phase: int = 0  # on the steps where iteration % period == phase
+    priority: int = NORMAL
+    when: Optional[Callable[[], bool]] = None  # only run while this returns True
+    deferred: int = 0  # steps skipped over budget, retried every step until it runs (forced after a period)
+
+
+class TaskScheduler:
+    """
+    Runs on_step subsystems at their own frequency, in registration order.
+    Tasks added without a phase get the least loaded one, so the per-step cost stays flat. Each task is timed under its
+    own name (names are unique), tasks never run another scheduler so no time is measured twice.
+    With a budget (milliseconds), tasks below HIGH priority are deferred once the step is over it, for at most a period.
+    """
+
+    def __init__(self, bot: BotAI, budget_ms: float = None):
+        self.bot = bot
+        self.budget_ms = budget_ms
+        self.tasks: list[Task] = []
+        self.skipped = 0  # tasks deferred over budget
+        self.iteration = 0  # step being run
+
+    def _least_loaded_phase(self, period: int) -> int:
+        load = [0] * PHASE_HORIZON
+        for task in self.tasks:
+            for step in range(task.phase % task.period, PHASE_HORIZON, task.period):
+                load[step] += 1
+        return min(range(period), key=lambda phase: sum(load[phase::period]))
+
+    def add(self, name: str, function: Callable[[BotAI], Awaitable], period: int = 1, phase: int = None, priority: int = NORMAL,
+            when: Callable[[], bool] = None) -> Task:
+        """Register `await function(bot)`, phase None picks the least loaded one."""
+        assert all(task.name != name for task in self.tasks), f"task {name} is already scheduled"
+        period = max(1, period)
+        phase = self._least_loaded_phase(period) if phase is None else phase % period
+        task = Task(name, function, period, phase, priority, when)
+        self.tasks.append(task)
+        return task
+
+    async def run(self, iteration: int) -> None:
+        self.iteration = iteration
+        timer = getattr(self.bot, "timer", None)
+        started = timer.step_start if timer is not None and timer.step_start is not None else time.perf_counter()
+
+        for task in self.tasks:
+            if not task.deferred and iteration % task.period != task.phase:
+                continue
+            if task.when is not None and not task.when():
+                task.deferred = 0
+                continue
+
+            over_budget = self.budget_ms is not None and (time.perf_counter() - started) * 1000.0 > self.budget_ms
+            if over_budget and task.priority < HIGH and task.deferred < task.period:
+                task.deferred += 1
+                self.skipped += 1
+                continue
+
+            task.deferred = 0
+            if timer is not None:
+                with timer.measure(task.name):
+                    await task.function(self.bot)
+            else:
+                await task.function(self.bot)
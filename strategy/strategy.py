@@ -1,19 +1,44 @@
+import os
+
 import numpy as np
 from sc2.bot_ai import BotAI
 from sc2.position import Point2, Point3
 
 from macro.macro import Macro
+from micro.commands import CommandFilter
+from micro.mining import WorkerAssignment, manage_mining
+from micro.placement import PlacementService
+from micro.registry import UnitRegistry
+from micro.terran_data import build_creation_tables
 from .map_analysis import MapAnalysis
+from .scheduler import TaskScheduler, HIGH, LOW
+from .timing import StepTimer
+
+# Path of the step timing export written at game end (.csv or .json), none by default
+TIMING_EXPORT = os.environ.get("SC2BOT_TIMING_EXPORT")
 
 class Strategy(BotAI):
+    step_budget_ms: float = None  # over it, low priority subsystems wait for the next step
+
     def __init__(self, macro: Macro = None, tactics = None):
         self.macro = macro if macro else Macro(self)
         self.tactics = tactics
+        self.placement = PlacementService(self)
+        self.commands = CommandFilter(self)
+        self.mining = WorkerAssignment()
+        self.unit_registry = UnitRegistry()
+        self.timer = StepTimer()
 
     async def on_start(self):
+        self.creation_tables = build_creation_tables(self.game_data)
         self.map_analysis = MapAnalysis(self)
         self.map_analysis.analyze_map()
 
+        # Every subsystem of on_step, run once per step at most, the builds requested during the step ordered last
+        self.scheduler = TaskScheduler(self, budget_ms=self.step_budget_ms)
+        self.schedule(self.scheduler)
+        self.scheduler.add("placement", lambda bot: bot.placement.flush(), priority=HIGH)
+
         # # Create 2D arrays for min and max terrain heights
         # self.terrain_min = [[0 for _ in range(self.game_info.placement_grid.height)] for _ in range(self.game_info.placement_grid.width)]
         # self.terrain_max = [[0 for _ in range(self.game_info.placement_grid.height)] for _ in range(self.game_info.placement_grid.width)]
@@ -70,17 +95,51 @@ class Strategy(BotAI):
                 
         #         self.barracks_boxes.append((block_min, block_max, text_pos, unit_name, i))
 
+    def schedule(self, scheduler: TaskScheduler) -> None:
+        """Register the subsystems run by on_step, in order."""
+        scheduler.add("macro", lambda bot: bot.macro.on_step(bot.scheduler.iteration), priority=HIGH)
+        # Workers to minerals and gas
+        scheduler.add("mining", manage_mining, period=4, priority=LOW)
+        self.macro.schedule(scheduler)
+
+    async def on_building_construction_started(self, unit):
+        self.map_analysis.on_building_construction_started(unit)
+        self.unit_registry.on_building_construction_started(unit, self)
+        self.placement.invalidate()
+
+    async def on_building_construction_complete(self, unit):
+        self.unit_registry.on_building_construction_complete(unit, self)
+
+    async def on_unit_created(self, unit):
+        self.unit_registry.on_unit_created(unit)
+        self.mining.on_unit_created(unit)
+
+    async def on_unit_destroyed(self, unit_tag):
+        self.map_analysis.on_unit_destroyed(unit_tag)
+        self.commands.forget(unit_tag)
+        self.mining.on_unit_destroyed(unit_tag)
+        self.unit_registry.on_unit_destroyed(unit_tag)
+        if unit_tag in self._structures_previous_map or unit_tag in self._enemy_structures_previous_map:
+            self.placement.invalidate()
+
+        unit = self._units_previous_map.get(unit_tag) or self._structures_previous_map.get(unit_tag)
+        if unit is not None:
+            self.macro.on_unit_lost(unit.type_id)
+
+    async def on_unit_type_changed(self, unit, previous_type):
+        self.unit_registry.on_unit_type_changed(unit, previous_type)
+        self.macro.on_unit_lost(previous_type)
+
+    async def on_end(self, game_result):
+        self.timer.print_summary()
+        self.commands.report()
+        if TIMING_EXPORT:
+            self.timer.export(TIMING_EXPORT)
+
     async def on_step(self, iteration):
-        await self.macro.on_step(iteration)
-
-        # Saturate refineries with workers
-        for refinery in self.gas_buildings:
-            if refinery.assigned_harvesters < refinery.ideal_harvesters:
-                workers = self.workers.closer_than(20, refinery)
-                for worker in workers:
-                    if worker.is_gathering and not worker.is_carrying_minerals:
-                        worker.gather(refinery)
-                        break
+        self.timer.start_step()
+        await self.scheduler.run(iteration)
+        self.timer.end_step()
 
         # # Define colors for different expansions
         # for p_min, p_max, expansion_id in self.debug_boxes:
@@ -0,0 +1,90 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Histogram bin edges, in milliseconds
+HISTOGRAM_BINS = (0.0, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, np.inf)
+
+
+class StepTimer:
+    """
+    Wall time of each subsystem per step, kept in fixed-size ring buffers (the last `capacity` steps).
+    Times measured between start_step() and end_step() are summed per subsystem, the whole step is stored as 'step'.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.rings: dict[str, np.ndarray] = {}  # subsystem -> [capacity] milliseconds
+        self.counts: dict[str, int] = {}  # subsystem -> steps recorded (may exceed the capacity)
+        self.current: dict[str, float] = {}  # subsystem -> milliseconds during this step
+        self.step_start = None
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - start) * 1000.0
+
+    def start_step(self) -> None:
+        self.current = {}
+        self.step_start = time.perf_counter()
+
+    def end_step(self) -> None:
+        """Store this step's times in the rings."""
+        if self.step_start is not None:
+            self.current["step"] = (time.perf_counter() - self.step_start) * 1000.0
+        for name, elapsed in self.current.items():
+            ring = self.rings.get(name)
+            if ring is None:
+                ring = self.rings[name] = np.zeros(self.capacity, dtype=np.float32)
+                self.counts[name] = 0
+            ring[self.counts[name] % self.capacity] = elapsed
+            self.counts[name] += 1
+        self.current = {}
+        self.step_start = None
+
+    def samples(self, name: str) -> np.ndarray:
+        return self.rings[name][:min(self.counts[name], self.capacity)]
+
+    def summary(self) -> dict[str, dict]:
+        """Per subsystem: steps, mean/p50/p95/p99/max milliseconds and histogram counts over HISTOGRAM_BINS."""
+        summary = {}
+        for name in self.rings:
+            samples = self.samples(name)
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            summary[name] = {
+                "steps": self.counts[name],
+                "mean": float(samples.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+                "max": float(samples.max()),
+                "histogram": np.histogram(samples, bins=HISTOGRAM_BINS)[0].tolist(),
+            }
+        return summary
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        print(f"{'subsystem':<24}{'steps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]["p99"]):
+            print(f"{name:<24}{stats['steps']:>8}{stats['p50']:>9.3f}{stats['p95']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}")
+
+    def export(self, path: str) -> None:
+        """Write the summary as JSON, or CSV when the path ends with .csv."""
+        summary = self.summary()
+        if path.endswith(".csv"):
+            bins = [f"<{edge:g}ms" for edge in HISTOGRAM_BINS[1:-1]] + [f">={HISTOGRAM_BINS[-2]:g}ms"]
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["subsystem", "steps", "mean", "p50", "p95", "p99", "max"] + bins)
+                for name, stats in summary.items():
+                    writer.writerow([name] + [stats[key] for key in ("steps", "mean", "p50", "p95", "p99", "max")] + stats["histogram"])
+        else:
+            with open(path, "w") as file:
+                json.dump({"bins_ms": [edge if np.isfinite(edge) else None for edge in HISTOGRAM_BINS], "subsystems": summary}, file, indent=2)
+
@@ -0,0 +1,82 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from sc2.bot_ai import BotAI
+from sc2.position import Point2
+from sc2.unit import Unit
+
+UNREACHABLE = 1e6  # cost of a slot too far from the marine
+
+
+class GuardAssignment:
+    """
+    Marine -> guard slot matching, `support` slots in a circle around each tank.
+    Solved as a min-cost assignment on the marine x slot distance matrix, and kept as is until a tank or marine is
+    added or removed, so marines don't change slots between steps. A re-solve favours each marine's previous slot.
+    """
+
+    def __init__(self, support: int = 4, guard_distance: float = 3.5, max_distance: float = 15, stickiness: float = 2.0):
+        self.support = support
+        self.guard_distance = guard_distance
+        self.max_distance = max_distance  # marines further than this from a tank don't guard it
+        self.stickiness = stickiness  # cost bonus of the previous slot on a re-solve
+        self.tanks: frozenset = frozenset()
+        self.marines: frozenset = frozenset()
+        self.slots: dict[int, tuple[int, int]] = {}  # marine tag -> (tank tag, slot index)
+        self.solves = 0
+
+    def offset(self, slot: int) -> tuple[float, float]:
+        angle = 2 * np.pi * slot / self.support
+        return self.guard_distance * np.cos(angle), self.guard_distance * np.sin(angle)
+
+    def guard_position(self, tank: Unit, slot: int) -> Point2:
+        dx, dy = self.offset(slot)
+        return Point2((tank.position.x + dx, tank.position.y + dy))
+
+    def update(self, tanks: list[Unit], marines: list[Unit]) -> dict[int, tuple[int, int]]:
+        """Assignments for these units, re-solved only when the sets of tags changed."""
+        tank_tags = frozenset(tank.tag for tank in tanks)
+        marine_tags = frozenset(marine.tag for marine in marines)
+        if tank_tags == self.tanks and marine_tags == self.marines:
+            return self.slots
+        self.tanks, self.marines = tank_tags, marine_tags
+        self.solve(tanks, marines)
+        return self.slots
+
+    def solve(self, tanks: list[Unit], marines: list[Unit]) -> None:
+        self.solves += 1
+        if not tanks or not marines or self.support <= 0:
+            self.slots = {}
+            return
+
+        offsets = np.array([self.offset(slot) for slot in range(self.support)])
+        tank_positions = np.array([tank.position_tuple for tank in tanks], dtype=float)
+        marine_positions = np.array([marine.position_tuple for marine in marines], dtype=float)
+        slot_positions = (tank_positions[:, None, :] + offsets[None, :, :]).reshape(-1, 2)  # [tank * support + slot]
+
+        cost = np.hypot(*(marine_positions[:, None, :] - slot_positions[None, :, :]).transpose(2, 0, 1))
+        tank_distances = np.hypot(*(marine_positions[:, None, :] - tank_positions[None, :, :]).transpose(2, 0, 1))
+        cost[np.repeat(tank_distances >= self.max_distance, self.support, axis=1)] = UNREACHABLE
+
+        tank_index = {tank.tag: t for t, tank in enumerate(tanks)}
+        for m, marine in enumerate(marines):
+            previous = self.slots.get(marine.tag)
+            if previous is not None and previous[0] in tank_index and previous[1] < self.support:
+                column = tank_index[previous[0]] * self.support + previous[1]
+                if cost[m, column] < UNREACHABLE:
+                    cost[m, column] = max(0.0, cost[m, column] - self.stickiness)
+
+        rows, columns = linear_sum_assignment(cost)
+        self.slots = {
+            marines[m].tag: (tanks[column // self.support].tag, column % self.support)
+            for m, column in zip(rows, columns)
+            if cost[m, column] < UNREACHABLE
+        }
+
+
+def get_guard_assignment(bot: BotAI, support: int = 4) -> GuardAssignment:
+    """The bot's guard assignment, created on first use (a new one if `support` changed)."""
+    guards = getattr(bot, "guard_assignment", None)
+    if guards is None or guards.support != support:
+        guards = GuardAssignment(support)
+        bot.guard_assignment = guards
+    return guards
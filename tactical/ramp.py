@@ -2,60 +2,61 @@ from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.ability_id import AbilityId
 
-# Global dictionary to track depot command timestamps
-_depot_command_times = {}
+from micro.commands import command
+from micro.registry import get_registry
+from micro.spatial import get_spatial
+
+DEPOT_TYPES = {UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED}
+# Structures with a unit rally point, townhalls excluded
+RALLY_TYPES = {UnitTypeId.BARRACKS, UnitTypeId.FACTORY, UnitTypeId.STARPORT, UnitTypeId.BUNKER}
+
+
+def get_depot_command_times(bot: BotAI) -> dict[int, float]:
+    """Depot tag -> time of its last raise/lower command, kept on the bot so every game has its own."""
+    times = getattr(bot, "depot_command_times", None)
+    if times is None:
+        times = bot.depot_command_times = {}
+    return times
+
 
 async def rally_on_ramp(bot: BotAI):
     """Set all structure rally points to the ramp (except cc)."""
-    for structure in bot.structures:
-        excluded = [UnitTypeId.COMMANDCENTER, UnitTypeId.ORBITALCOMMAND, UnitTypeId.PLANETARYFORTRESS]
-        if structure.is_ready and not structure.type_id in excluded:
-            structure(AbilityId.RALLY_UNITS, bot.main_base_ramp.top_center)
+    for structure in get_registry(bot).units(bot, RALLY_TYPES, ready=True):
+        command(bot, structure, AbilityId.RALLY_UNITS, bot.main_base_ramp.top_center)
 
 
 async def handle_ramp_depots(bot: BotAI, distance: float = 7, cooldown: float = 5.0):
     """Raise depots when ground enemies are nearby, lower when safe."""
-    global _depot_command_times
-    
-    # Get all ground enemies (filter out flying units)
-    ground_enemies = bot.enemy_units.filter(lambda u: not u.is_flying)
+    command_times = get_depot_command_times(bot)
+
+    # Ground enemies (flying units filtered out), indexed once per step
+    ground_enemies = get_spatial(bot).enemy_ground
+    registry = get_registry(bot)
 
     # Handle lowered depots - raise them if ground enemies are nearby
-    for depot in bot.structures(UnitTypeId.SUPPLYDEPOTLOWERED).ready:
+    for depot in registry.units(bot, UnitTypeId.SUPPLYDEPOTLOWERED, ready=True):
         # Check if depot is on cooldown
-        if depot.tag in _depot_command_times:
-            if bot.time - _depot_command_times[depot.tag] < cooldown:
+        if depot.tag in command_times:
+            if bot.time - command_times[depot.tag] < cooldown:
                 continue
         
         # Check if depot should be raised
-        should_raise = False
-        for unit in ground_enemies:
-            if unit.distance_to(depot) < distance:
-                should_raise = True
-                break
-        
-        if should_raise:
-            depot(AbilityId.MORPH_SUPPLYDEPOT_RAISE)
-            _depot_command_times[depot.tag] = bot.time
+        should_raise = ground_enemies.any_in_radius(depot, distance)
+        if should_raise and command(bot, depot, AbilityId.MORPH_SUPPLYDEPOT_RAISE):
+            command_times[depot.tag] = bot.time
 
     # Handle raised depots - lower them if no ground enemies are nearby
-    for depot in bot.structures(UnitTypeId.SUPPLYDEPOT).ready:
+    for depot in registry.units(bot, UnitTypeId.SUPPLYDEPOT, ready=True):
         # Check if depot is on cooldown
-        if depot.tag in _depot_command_times:
-            if bot.time - _depot_command_times[depot.tag] < cooldown:
+        if depot.tag in command_times:
+            if bot.time - command_times[depot.tag] < cooldown:
                 continue
         
         # Check if any enemies are nearby
-        enemy_nearby = False
-        for unit in ground_enemies:
-            if unit.distance_to(depot) < distance:
-                enemy_nearby = True
-                break
-        
-        if not enemy_nearby:
-            depot(AbilityId.MORPH_SUPPLYDEPOT_LOWER)
-            _depot_command_times[depot.tag] = bot.time
+        enemy_nearby = ground_enemies.any_in_radius(depot, distance)
+        if not enemy_nearby and command(bot, depot, AbilityId.MORPH_SUPPLYDEPOT_LOWER):
+            command_times[depot.tag] = bot.time
     
-    # Clean up old entries from the command times dictionary
-    current_depot_tags = {depot.tag for depot in bot.structures.of_type({UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED})}
-    _depot_command_times = {tag: time for tag, time in _depot_command_times.items() if tag in current_depot_tags}
+    # Clean up the entries of destroyed depots (the registry already dropped them)
+    for tag in command_times.keys() - registry.tags(DEPOT_TYPES):
+        del command_times[tag]
@@ -1,7 +1,13 @@
+import numpy as np
 from sc2.bot_ai import BotAI
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.ids.ability_id import AbilityId
 
+from micro.commands import command
+from micro.snapshot import get_snapshot
+from micro.spatial import SpatialIndex, get_spatial
+from .guard import get_guard_assignment
+
 
 async def manage_army_positioning(bot: BotAI):
     """Basic army positioning and movement."""
@@ -9,12 +15,26 @@ async def manage_army_positioning(bot: BotAI):
         {UnitTypeId.MARINE, UnitTypeId.MARAUDER, UnitTypeId.REAPER, UnitTypeId.HELLION, UnitTypeId.SIEGETANK, UnitTypeId.MEDIVAC}
     )
     
+    spatial = get_spatial(bot)
+
     if army_units and bot.supply_army > 75:
-        units_at_enemy = bot.units.closer_than(15, bot.enemy_start_locations[0])
-        enemies_at_enemy = bot.enemy_units.closer_than(15, bot.enemy_start_locations[0])
+        units_at_enemy = spatial.units.any_in_radius(bot.enemy_start_locations[0], 15)
+        enemies_at_enemy = spatial.enemy_units.any_in_radius(bot.enemy_start_locations[0], 15)
 
         if units_at_enemy and not enemies_at_enemy:
-            locations = bot.expansion_locations_list[1:] if len(bot.enemy_units) == 0 else [bot.enemy_start_locations[0]]
+            if len(bot.enemy_units) > 0:
+                locations = [bot.enemy_start_locations[0]]
+            elif hasattr(bot, 'map_analysis') and bot.map_analysis.expansion_distances is not None:
+                # Sweep the bases closest to the enemy start first, past the enemy main (the nearest) and not our own
+                map_analysis = bot.map_analysis
+                own_start = map_analysis.expansion_id(bot.start_location)
+                locations = [
+                    map_analysis.expansion_locations_list[i]
+                    for i in map_analysis.nearest_bases(map_analysis.enemy_start_index)[1:]
+                    if i != own_start
+                ]
+            else:
+                locations = bot.expansion_locations_list[1:]
             for i, unit in enumerate(army_units):
                 target_loc = locations[i % len(locations)]
                 unit.attack(target_loc)
@@ -23,33 +43,33 @@ async def manage_army_positioning(bot: BotAI):
             for unit in army_units:
                 unit.attack(bot.enemy_start_locations[0])
 
-    for structure in bot.structures:
-        if structure.health > 0:
-            enemies_nearby = bot.enemy_units.closer_than(10, structure)
-            if len(enemies_nearby) > 1:
-                for unit in army_units:
-                    unit.attack(enemies_nearby.closest_to(unit))
-                break
+    structures = [structure for structure in bot.structures if structure.health > 0]
+    for structure, enemies_nearby in zip(structures, spatial.enemy_units.in_radius_batch(structures, 10)):
+        if len(enemies_nearby) > 1:
+            targets = SpatialIndex(enemies_nearby, bot).nearest_batch(army_units)
+            for unit, target in zip(army_units, targets):
+                unit.attack(target)
+            break
 
 async def medivac_support_marine(bot: BotAI):
     """Make medivacs follow marines and heal them when needed."""
-    medivacs = bot.units(UnitTypeId.MEDIVAC).ready
-    marines = bot.units(UnitTypeId.MARINE).ready
+    units = get_snapshot(bot).units
+    medivac_rows = np.flatnonzero(units.of_type(UnitTypeId.MEDIVAC) & units.is_ready)
+    marine_rows = np.flatnonzero(units.of_type(UnitTypeId.MARINE) & units.is_ready)
     
-    if not medivacs or not marines:
+    if not len(medivac_rows) or not len(marine_rows):
         return
     
-    for medivac in medivacs:
-        # Find the closest marine to this medivac
-        closest_marine = marines.closest_to(medivac)
-        
-        # Check if any marines need healing (below 80% health)
-        injured_marines = marines.filter(lambda m: m.health_percentage < 0.8)
-        
-        if injured_marines:
+    # Distance of every medivac to every marine, and marines that need healing (below 80% health)
+    distances = units.distances(units, medivac_rows, marine_rows)
+    injured = np.flatnonzero(units.health_percentage[marine_rows] < 0.8)
+    
+    for i, medivac in enumerate(units.select(medivac_rows)):
+        if len(injured):
             # Heal the closest injured marine
-            injured_marine = injured_marines.closest_to(medivac)
-            if medivac.distance_to(injured_marine) > 4:
+            j = injured[np.argmin(distances[i, injured])]
+            injured_marine = units.units[marine_rows[j]]
+            if distances[i, j] > 4:
                 # Move closer to heal
                 medivac.move(injured_marine.position)
             else:
@@ -57,11 +77,13 @@ async def medivac_support_marine(bot: BotAI):
                 medivac(AbilityId.HEAL_MEDICHEAL, injured_marine)
         else:
             # No injured marines, follow the closest marine
-            if medivac.distance_to(closest_marine) > 6:
+            j = np.argmin(distances[i])
+            closest_marine = units.units[marine_rows[j]]
+            if distances[i, j] > 6:
                 # Stay close but not too close (6 range)
                 follow_position = closest_marine.position.towards(medivac.position, 4)
                 medivac.move(follow_position)
-            elif medivac.distance_to(closest_marine) < 3:
+            elif distances[i, j] < 3:
                 # Too close, back away a bit
                 back_position = closest_marine.position.towards(medivac.position, -2)
                 medivac.move(back_position)
@@ -69,63 +91,46 @@ async def medivac_support_marine(bot: BotAI):
 async def marine_guard_tank(bot: BotAI, support: int = 4):
     """Assign marines to guard each tank, ensuring proper positioning around tanks."""
     # Get all tanks (both regular and sieged)
-    tanks = bot.units.of_type({UnitTypeId.SIEGETANK, UnitTypeId.SIEGETANKSIEGED}).ready
-    marines = bot.units(UnitTypeId.MARINE).ready
+    units = get_snapshot(bot).units
+    tank_rows = np.flatnonzero(units.of_type(UnitTypeId.SIEGETANK, UnitTypeId.SIEGETANKSIEGED) & units.is_ready)
+    marine_rows = np.flatnonzero(units.of_type(UnitTypeId.MARINE) & units.is_ready)
     
-    if not tanks or not marines:
+    if not len(tank_rows) or not len(marine_rows):
         return
     
-    # Dictionary to track which marines are assigned to which tank
-    assigned_marines = {}
-    
-    for tank in tanks:
-        # Find marines within reasonable distance of this tank
-        nearby_marines = marines.closer_than(15, tank)
-        
-        # Sort marines by distance to tank
-        nearby_marines = nearby_marines.sorted(lambda m: m.distance_to(tank))
-        
-        # Assign up to 'support' number of marines to this tank
-        tank_marines = nearby_marines[:support]
-        assigned_marines[tank.tag] = tank_marines
+    tanks, marines = units.select(tank_rows), units.select(marine_rows)
+    spatial = get_spatial(bot)
+
+    # Guard slots around the tanks, kept until a tank or marine is added or removed
+    guards = get_guard_assignment(bot, support)
+    slots = guards.update(tanks, marines)
+    tanks_by_tag = {tank.tag: tank for tank in tanks}
+
+    unassigned = []
+    for j, marine in enumerate(marines):
+        if marine.tag not in slots:
+            unassigned.append(j)
+            continue
+
+        tank_tag, slot = slots[marine.tag]
+        guard_position = guards.guard_position(tanks_by_tag[tank_tag], slot)
         
-        # Position marines around the tank in a defensive formation
-        for i, marine in enumerate(tank_marines):
-            # Calculate position around the tank (spread marines in a circle)
-            angle = (i * 360 / support) if support > 0 else 0
-            import math
-            angle_rad = math.radians(angle)
-            
-            # Position marines 3-4 units away from tank in a circular formation
-            guard_distance = 3.5
-            target_x = tank.position.x + guard_distance * math.cos(angle_rad)
-            target_y = tank.position.y + guard_distance * math.sin(angle_rad)
-            
-            from sc2.position import Point2
-            guard_position = Point2((target_x, target_y))
-            
-            # Only move if marine is not already in position or under attack
-            if marine.distance_to(guard_position) > 2 and not marine.is_attacking:
-                # Check for enemies nearby - if enemies present, marines should engage
-                enemies_nearby = bot.enemy_units.closer_than(8, marine)
-                if enemies_nearby:
-                    # Attack closest enemy
-                    marine.attack(enemies_nearby.closest_to(marine))
-                else:
-                    # Move to guard position
-                    marine.move(guard_position)
+        # Only move if marine is not already in position or under attack
+        if marine.distance_to(guard_position) > 2 and not marine.is_attacking:
+            # Check for enemies nearby - if enemies present, marines should engage
+            closest_enemy = spatial.enemy_units.nearest(marine, max_distance=8)
+            if closest_enemy:
+                # Attack closest enemy
+                command(bot, marine, AbilityId.ATTACK, closest_enemy[0])
+            else:
+                # Move to guard position
+                command(bot, marine, AbilityId.MOVE_MOVE, guard_position)
     
     # Handle unassigned marines - make them guard the closest tank
-    all_assigned = set()
-    for tank_marines in assigned_marines.values():
-        for marine in tank_marines:
-            all_assigned.add(marine.tag)
-    
-    unassigned_marines = marines.filter(lambda m: m.tag not in all_assigned)
-    
-    for marine in unassigned_marines:
-        if tanks:
-            closest_tank = tanks.closest_to(marine)
+    if unassigned:
+        distances = units.distances(units, tank_rows, marine_rows[unassigned])
+        for k, t in enumerate(np.argmin(distances, axis=0)):
+            marine, closest_tank = marines[unassigned[k]], tanks[t]
             # Move towards the closest tank that needs more support
-            if marine.distance_to(closest_tank) > 5:
-                marine.move(closest_tank.position.towards(marine.position, 3))
+            if distances[t, k] > 5:
+                command(bot, marine, AbilityId.MOVE_MOVE, closest_tank.position.towards(marine.position, 3))
@@ -0,0 +1,82 @@
+"""
+Stand-ins for sc2.unit.Unit and sc2.bot_ai.BotAI with the attributes the tested code reads.
+Commands sent to a fake unit are recorded in unit.commands as (ability, target, queue).
+"""
+from types import SimpleNamespace
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from simulation.economy import SimUnits
+
+
+def order(ability: AbilityId, target=None) -> SimpleNamespace:
+    """A sc2.unit.UnitOrder: order.ability.id and order.target."""
+    return SimpleNamespace(ability=SimpleNamespace(id=ability), target=target)
+
+
+class FakeUnit:
+    def __init__(self, tag: int, type_id: UnitTypeId, position=(0, 0), orders=None, structure: bool = False, **attributes):
+        self.tag = tag
+        self.type_id = type_id
+        self.position = Point2(position)
+        self.orders = list(orders or [])
+        self.is_structure = structure
+        self.is_ready = True
+        self.is_carrying_resource = False
+        self.is_flying = False
+        self.radius = 0.375
+        self.commands = []
+        self.__dict__.update(attributes)
+
+    def __repr__(self):
+        return f"FakeUnit({self.type_id.name}, tag={self.tag})"
+
+    @property
+    def position_tuple(self) -> tuple:
+        return self.position.x, self.position.y
+
+    @property
+    def is_idle(self) -> bool:
+        return not self.orders
+
+    def distance_to(self, other) -> float:
+        return self.position.distance_to(other.position if hasattr(other, "position") else other)
+
+    def __call__(self, ability: AbilityId, target=None, queue: bool = False, **kwargs) -> bool:
+        self.commands.append((ability, target, queue))
+        return True
+
+
+class FakeBot:
+    def __init__(self, units=(), structures=(), mineral_field=(), vespene_geyser=(), enemy_units=()):
+        self.units = SimUnits(units)
+        self.structures = SimUnits(structures)
+        self.mineral_field = SimUnits(mineral_field)
+        self.vespene_geyser = SimUnits(vespene_geyser)
+        self.enemy_units = SimUnits(enemy_units)
+        self.state = SimpleNamespace(game_loop=0)
+        self.time = 0.0
+        self.game_data = SimpleNamespace(abilities={})  # no remapping: abilities are their own generic id
+        self.expansion_locations_list = []
+
+    def step(self, seconds: float = 1.0) -> None:
+        self.state.game_loop += int(seconds * 22.4)
+        self.time = self.state.game_loop / 22.4
+
+    @property
+    def workers(self) -> SimUnits:
+        return self.units(UnitTypeId.SCV)
+
+    @property
+    def townhalls(self) -> SimUnits:
+        return self.structures({UnitTypeId.COMMANDCENTER, UnitTypeId.ORBITALCOMMAND})
+
+    @property
+    def gas_buildings(self) -> SimUnits:
+        return self.structures(UnitTypeId.REFINERY)
+
+    @property
+    def resources(self) -> SimUnits:
+        return SimUnits(list(self.mineral_field) + list(self.vespene_geyser))
@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from micro.commands import CommandFilter
+from micro.worker import mule_drop
+from tests.fakes import FakeBot, FakeUnit, order
+
+MULE = AbilityId.CALLDOWNMULE_CALLDOWNMULE
+
+
+def test_repeated_command_is_dropped_within_the_window():
+    bot = FakeBot()
+    commands = CommandFilter(bot, window=2.0)
+    marine = FakeUnit(1, UnitTypeId.MARINE)
+
+    assert commands.issue(marine, AbilityId.MOVE_MOVE, Point2((5, 5)))
+    assert not commands.issue(marine, AbilityId.MOVE_MOVE, Point2((5.2, 5)))  # within the tolerance
+    assert commands.issue(marine, AbilityId.MOVE_MOVE, Point2((8, 5)))  # another target
+    bot.step(2.5)
+    assert commands.issue(marine, AbilityId.MOVE_MOVE, Point2((8, 5)))
+    assert len(marine.commands) == 3
+    assert commands.saved[AbilityId.MOVE_MOVE] == 1
+
+
+def test_current_order_and_rally_are_not_repeated():
+    bot = FakeBot()
+    commands = CommandFilter(bot)
+    marine = FakeUnit(1, UnitTypeId.MARINE, orders=[order(AbilityId.MOVE_MOVE, Point2((5, 5)))])
+    barracks = FakeUnit(2, UnitTypeId.BARRACKS, structure=True, rally_targets=[SimpleNamespace(point=Point2((9, 9)), tag=None)])
+
+    assert not commands.issue(marine, AbilityId.MOVE_MOVE, Point2((5, 5)))
+    assert commands.issue(marine, AbilityId.MOVE_MOVE, Point2((5, 5)), queue=True)  # queued commands always pass
+    assert not commands.issue(barracks, AbilityId.RALLY_UNITS, Point2((9, 9)))
+    assert commands.issue(barracks, AbilityId.RALLY_UNITS, Point2((12, 9)))
+
+
+def test_mules_are_only_dropped_when_repeated_on_the_same_patch():
+    bot = FakeBot()
+    commands = CommandFilter(bot)
+    first, second = FakeUnit(1, UnitTypeId.ORBITALCOMMAND, structure=True), FakeUnit(2, UnitTypeId.ORBITALCOMMAND, structure=True)
+    patch, other_patch = FakeUnit(10, UnitTypeId.MINERALFIELD), FakeUnit(11, UnitTypeId.MINERALFIELD)
+
+    assert commands.issue(first, MULE, patch)
+    assert commands.issue(first, MULE, other_patch)  # 100 energy: a second MULE on another patch
+    assert commands.issue(second, MULE, patch)  # another orbital
+    assert not commands.issue(second, MULE, patch)
+
+
+def test_mule_drop_from_two_orbitals():
+    patches = [FakeUnit(10 + i, UnitTypeId.MINERALFIELD, (i, 5)) for i in range(4)]
+    orbitals = [
+        FakeUnit(1, UnitTypeId.ORBITALCOMMAND, (0, 0), structure=True, energy=50),
+        FakeUnit(2, UnitTypeId.ORBITALCOMMAND, (30, 0), structure=True, energy=50),
+    ]
+    bot = FakeBot(structures=orbitals, mineral_field=patches)
+    bot.mining = SimpleNamespace(bases={1: [10, 11], 2: [12, 13]})
+    bot.commands = CommandFilter(bot)
+
+    asyncio.run(mule_drop(bot))
+
+    assert orbitals[0].commands == [(MULE, patches[0], False)]
+    assert orbitals[1].commands == [(MULE, patches[2], False)]
+
+
+def test_mules_spread_over_the_patches_of_a_shared_line():
+    patches = [FakeUnit(10 + i, UnitTypeId.MINERALFIELD, (i, 5)) for i in range(4)]
+    orbitals = [
+        FakeUnit(1, UnitTypeId.ORBITALCOMMAND, (0, 0), structure=True, energy=100),
+        FakeUnit(2, UnitTypeId.ORBITALCOMMAND, (2, 0), structure=True, energy=50),
+    ]
+    bot = FakeBot(structures=orbitals, mineral_field=patches)
+    bot.mining = SimpleNamespace(bases={1: [10, 11, 12, 13], 2: [10, 11, 12, 13]})
+    bot.commands = CommandFilter(bot)
+
+    asyncio.run(mule_drop(bot))
+    bot.step()
+    orbitals[1].energy = 0
+    asyncio.run(mule_drop(bot))
+
+    # Every calldown went through, each on a patch without a MULE
+    assert orbitals[0].commands == [(MULE, patches[0], False), (MULE, patches[2], False)]
+    assert orbitals[1].commands == [(MULE, patches[1], False)]
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+
+from micro.census import UnitCensus
+from micro.terran_data import build_creation_tables, get_creation_tables
+from simulation.economy import EconomySimulator
+from tests.fakes import FakeBot, FakeUnit, order
+
+
+def game_data(abilities: dict) -> SimpleNamespace:
+    return SimpleNamespace(units={
+        unit_type.value: SimpleNamespace(creation_ability=SimpleNamespace(id=ability)) for unit_type, ability in abilities.items()
+    })
+
+
+def test_tables_include_morphs():
+    tables = build_creation_tables(game_data({UnitTypeId.MARINE: AbilityId.BARRACKSTRAIN_MARINE}))
+
+    assert tables.abilities == {UnitTypeId.MARINE: AbilityId.BARRACKSTRAIN_MARINE}
+    assert tables.created_units[AbilityId.BARRACKSTRAIN_MARINE] is UnitTypeId.MARINE
+    assert tables.created_units[AbilityId.UPGRADETOORBITAL_ORBITALCOMMAND] is UnitTypeId.ORBITALCOMMAND
+
+
+def test_each_bot_keeps_the_tables_of_its_own_game_data():
+    first, second = FakeBot(), FakeBot()
+    first.game_data = game_data({UnitTypeId.MARINE: AbilityId.BARRACKSTRAIN_MARINE})
+    second.game_data = game_data({UnitTypeId.REAPER: AbilityId.BARRACKSTRAIN_REAPER})
+    tables = get_creation_tables(first)
+
+    # Another bot and a simulator in the same process build their own tables
+    get_creation_tables(second)
+    EconomySimulator([])
+
+    assert get_creation_tables(first) is tables
+    assert UnitTypeId.REAPER not in tables.abilities
+    barracks = FakeUnit(1, UnitTypeId.BARRACKS, structure=True, orders=[order(AbilityId.BARRACKSTRAIN_MARINE)])
+    first.structures.append(barracks)
+    assert UnitCensus(first).in_production(UnitTypeId.MARINE) == 1
@@ -0,0 +1,29 @@
+import pytest
+from sc2.ids.unit_typeid import UnitTypeId
+
+from macro.macro import BUILD_ORDER
+from simulation.economy import EconomySimulator, simulate
+from strategy.pig_gold import BUILD_ORDER as PIG_GOLD_BUILD_ORDER
+
+
+def test_second_refinery_goes_on_the_free_geyser():
+    report = simulate(BUILD_ORDER, duration=300)
+
+    refineries = [result for result in report.entries if result.entry == {UnitTypeId.REFINERY: 2}]
+    assert refineries[0].completed is not None
+    # The entries after it are no longer blocked
+    bunker = report.entries[refineries[0].position + 1]
+    assert bunker.completed is not None
+
+
+@pytest.mark.parametrize("build_order", [BUILD_ORDER, PIG_GOLD_BUILD_ORDER])
+def test_shipped_build_orders_are_not_blocked(build_order):
+    report = simulate(build_order, duration=400)
+
+    blocking = [result for result in report.entries if isinstance(result.entry, dict) and (next(iter(result.entry.values())) or 0) > 0]
+    assert all(result.completed is not None for result in blocking)
+
+
+def test_unknown_unit_types_are_rejected():
+    with pytest.raises(ValueError, match="entry 1: unknown unit type VIKING"):
+        EconomySimulator([{UnitTypeId.SCV: -14}, {UnitTypeId.VIKING: 1}])
@@ -0,0 +1,74 @@
+from sc2.ids.unit_typeid import UnitTypeId
+
+from tactical.guard import GuardAssignment, get_guard_assignment
+from tests.fakes import FakeBot, FakeUnit
+
+
+def tank(tag, position):
+    return FakeUnit(tag, UnitTypeId.SIEGETANKSIEGED, position)
+
+
+def marine(tag, position):
+    return FakeUnit(tag, UnitTypeId.MARINE, position)
+
+
+def test_marines_take_the_closest_slots_one_each():
+    guards = GuardAssignment(support=4, guard_distance=3.5)
+    tanks = [tank(1, (20, 20))]
+    # Next to slot 0 (east), 1 (north), 2 (west), 3 (south)
+    marines = [marine(10, (24, 20)), marine(11, (20, 24)), marine(12, (16, 20)), marine(13, (20, 16))]
+
+    slots = guards.update(tanks, marines)
+
+    assert slots == {10: (1, 0), 11: (1, 1), 12: (1, 2), 13: (1, 3)}
+
+
+def test_assignment_is_kept_until_the_units_change():
+    guards = GuardAssignment(support=2)
+    tanks = [tank(1, (20, 20))]
+    marines = [marine(10, (24, 20)), marine(11, (16, 20))]
+    slots = guards.update(tanks, marines)
+
+    # Same tags, moved around: no re-solve
+    marines[0].position, marines[1].position = marines[1].position, marines[0].position
+    assert guards.update(tanks, marines) == slots
+    assert guards.solves == 1
+
+    marines.append(marine(12, (20, 25)))
+    guards.update(tanks, marines)
+    assert guards.solves == 2
+
+
+def test_resolve_keeps_the_previous_slot_when_almost_as_close():
+    guards = GuardAssignment(support=2, guard_distance=3.5, stickiness=2.0)
+    tanks = [tank(1, (20, 20))]
+    marines = [marine(10, (16.5, 20))]
+    assert guards.update(tanks, marines) == {10: (1, 1)}
+
+    # Now 1 closer to slot 0 than to its slot 1, a new marine as far from both
+    marines[0].position = marines[0].position.offset((4, 1))
+    marines.append(marine(11, (20, 30)))
+    assert guards.update(tanks, marines) == {10: (1, 1), 11: (1, 0)}
+
+    # Without the bonus it would have switched
+    fresh = GuardAssignment(support=2, guard_distance=3.5, stickiness=0.0)
+    assert fresh.update(tanks, marines) == {10: (1, 0), 11: (1, 1)}
+
+
+def test_extra_and_distant_marines_are_unassigned():
+    guards = GuardAssignment(support=2, max_distance=15)
+    tanks = [tank(1, (20, 20))]
+    marines = [marine(10, (24, 20)), marine(11, (16, 20)), marine(12, (20, 24)), marine(13, (60, 60))]
+
+    slots = guards.update(tanks, marines)
+
+    assert len(slots) == 2
+    assert 13 not in slots
+    assert sorted(slot for _, slot in slots.values()) == [0, 1]
+
+
+def test_guard_assignment_is_kept_per_bot():
+    first, second = FakeBot(), FakeBot()
+    assert get_guard_assignment(first) is get_guard_assignment(first)
+    assert get_guard_assignment(first) is not get_guard_assignment(second)
+    assert get_guard_assignment(first, support=6).support == 6
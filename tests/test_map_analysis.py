@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+from sc2.position import Point2
+
+from strategy.map_analysis import MapAnalysis
+from strategy.map_cache import MapAnalysisCache
+
+NUM_OBSTRUCTION_TYPES = MapAnalysis.NUM_OBSTRUCTION_TYPES
+
+
+class Grid:
+    """game_info.placement_grid / pathing_grid: data_numpy is [y, x], indexing is [x, y]."""
+
+    def __init__(self, data: np.ndarray):
+        self.data_numpy = data
+        self.height, self.width = data.shape
+
+    def __getitem__(self, position):
+        return int(self.data_numpy[position[1], position[0]])
+
+
+def synthetic_bot(seed: int, width: int = 64, height: int = 56):
+    """Random buildable plateaus with holes, resources, ramps, and expansions on and at the edge of the map."""
+    rng = np.random.default_rng(seed)
+    placement = np.zeros((height, width), np.uint8)
+    for _ in range(12):
+        x, y = rng.integers(0, width - 6), rng.integers(0, height - 6)
+        placement[y:y + rng.integers(6, 24), x:x + rng.integers(6, 24)] = 1
+    for _ in range(20):
+        x, y = rng.integers(0, width), rng.integers(0, height)
+        placement[y:y + rng.integers(1, 4), x:x + rng.integers(1, 4)] = 0
+    pathing = placement.copy()
+    pathing[rng.random((height, width)) < 0.02] = 1
+
+    def point(offset: float = 0.0, margin: int = 0):
+        return Point2((float(rng.integers(margin, width - margin)) + offset, float(rng.integers(margin, height - margin)) + offset))
+
+    ys, xs = np.nonzero(placement)
+    expansions = [Point2((xs[i] + 0.5, ys[i] + 0.5)) for i in rng.choice(len(xs), 5, replace=False)]
+    expansions += [Point2((1.5, 1.5)), Point2((width - 1.5, height - 2.5))]
+    ramps = [
+        SimpleNamespace(
+            corner_depots=[point(margin=1), point(margin=1)],
+            barracks_correct_placement=point(0.5, margin=1),
+            barracks_in_middle=point(0.5, margin=1),
+        )
+        for _ in range(2)
+    ]
+    return SimpleNamespace(
+        game_info=SimpleNamespace(placement_grid=Grid(placement), pathing_grid=Grid(pathing), map_ramps=ramps),
+        expansion_locations={expansion: None for expansion in expansions},
+        mineral_field=[SimpleNamespace(position=point()) for _ in range(15)] + [SimpleNamespace(position=Point2((0.0, 0.0)))],
+        vespene_geyser=[SimpleNamespace(position=point(0.5)) for _ in range(4)] + [SimpleNamespace(position=Point2((width - 0.5, height - 0.5)))],
+        start_location=expansions[0],
+    )
+
+
+def loop_masks(bot) -> tuple[np.ndarray, np.ndarray]:
+    """The masks as the per-tile loops computed them before vectorization."""
+    width, height = bot.game_info.placement_grid.width, bot.game_info.placement_grid.height
+    expansions = list(bot.expansion_locations)
+    obstruction = np.zeros((width, height, NUM_OBSTRUCTION_TYPES), dtype=bool)
+    unobstructed = np.zeros((width, height, len(expansions)), dtype=bool)
+
+    def mark(obstruction_type, xs, ys):
+        for ox in xs:
+            for oy in ys:
+                if 0 <= ox < width and 0 <= oy < height:
+                    obstruction[ox, oy, obstruction_type] = True
+
+    for x in range(width):
+        for y in range(height):
+            if not bot.game_info.placement_grid[x, y]:
+                obstruction[x, y, MapAnalysis.TERRAIN] = True
+            if not bot.game_info.pathing_grid[x, y]:
+                obstruction[x, y, MapAnalysis.PATHING] = True
+    for mineral in bot.mineral_field:
+        mx, my = int(mineral.position.x), int(mineral.position.y)
+        mark(MapAnalysis.RESOURCES, range(mx - 1, mx + 1), range(my, my + 1))
+    for geyser in bot.vespene_geyser:
+        gx, gy = int(geyser.position.x), int(geyser.position.y)
+        mark(MapAnalysis.RESOURCES, range(gx - 1, gx + 2), range(gy - 1, gy + 2))
+    for expansion in expansions:
+        ex, ey = int(expansion.x), int(expansion.y)
+        mark(MapAnalysis.EXPANSION, range(ex - 2, ex + 3), range(ey - 2, ey + 3))
+    for ramp in bot.game_info.map_ramps:
+        for depot in ramp.corner_depots:
+            dx, dy = int(depot.x), int(depot.y)
+            mark(MapAnalysis.RAMP_STRUCTURES, range(dx - 1, dx + 1), range(dy - 1, dy + 1))
+        for barracks in (ramp.barracks_correct_placement, ramp.barracks_in_middle):
+            bx, by = int(barracks.x), int(barracks.y)
+            mark(MapAnalysis.RAMP_STRUCTURES, range(bx - 1, bx + 2), range(by - 1, by + 2))
+
+    for expansion_id, expansion in enumerate(expansions):
+        ex, ey = int(expansion.x), int(expansion.y)
+        radius = 25 if expansion.distance_to(bot.start_location) < 5 else 15
+        mask_size = radius * 2 + 1
+        temp_mask = np.zeros((mask_size, mask_size), dtype=np.uint8)
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                map_x, map_y = ex + dx, ey + dy
+                if 0 <= map_x < width and 0 <= map_y < height and dx * dx + dy * dy <= radius * radius:
+                    if not obstruction[map_x, map_y, MapAnalysis.TERRAIN]:
+                        temp_mask[dy + radius, dx + radius] = 255
+        _, labels = cv2.connectedComponents(temp_mask, connectivity=8)
+        label = labels[radius, radius]
+        if label > 0:
+            for mask_y in range(mask_size):
+                for mask_x in range(mask_size):
+                    map_x, map_y = ex + mask_x - radius, ey + mask_y - radius
+                    if labels[mask_y, mask_x] == label and 0 <= map_x < width and 0 <= map_y < height:
+                        unobstructed[map_x, map_y, expansion_id] = not obstruction[map_x, map_y].any()
+    return obstruction, unobstructed
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_vectorized_masks_match_the_loops(seed, tmp_path):
+    bot = synthetic_bot(seed)
+    analysis = MapAnalysis(bot, cache=MapAnalysisCache(str(tmp_path)))
+    analysis._analyze_terrain_obstructions()
+    analysis._analyze_pathing_obstructions()
+    analysis._analyze_resource_obstructions()
+    analysis._analyze_expansion_obstructions()
+    analysis._analyze_ramp_structure_obstructions()
+    analysis._analyze_unobstructed_areas()
+
+    obstruction, unobstructed = loop_masks(bot)
+    for obstruction_type in range(NUM_OBSTRUCTION_TYPES):
+        assert np.array_equal(analysis.obstruction_mask[:, :, obstruction_type], obstruction[:, :, obstruction_type])
+    for expansion_id in range(analysis.num_expansions):
+        assert np.array_equal(analysis.unobstructed_mask[:, :, expansion_id], unobstructed[:, :, expansion_id])
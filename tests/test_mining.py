@@ -0,0 +1,122 @@
+import asyncio
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+
+from micro.mining import WorkerAssignment
+from micro.registry import UnitRegistry
+from tests.fakes import FakeBot, FakeUnit, order
+
+
+def make_base(workers: int):
+    townhall = FakeUnit(1, UnitTypeId.COMMANDCENTER, (0, 0), structure=True)
+    minerals = [FakeUnit(100 + i, UnitTypeId.MINERALFIELD, (7, i - 4)) for i in range(8)]
+    scvs = [FakeUnit(10 + i, UnitTypeId.SCV, (2, 0)) for i in range(workers)]
+    return FakeBot(units=scvs, structures=[townhall], mineral_field=minerals), scvs
+
+
+def run_step(mining: WorkerAssignment, bot: FakeBot) -> None:
+    asyncio.run(mining.step(bot))
+    bot.step()
+
+
+def start_mining(mining: WorkerAssignment, bot: FakeBot, scvs: list) -> None:
+    """First step, then every worker is on its way to the assigned patch."""
+    run_step(mining, bot)
+    for scv in scvs:
+        scv.orders = [order(AbilityId.HARVEST_GATHER, mining.assignments[scv.tag])]
+        scv.commands.clear()
+
+
+def test_workers_spread_two_per_patch():
+    bot, scvs = make_base(16)
+    mining = WorkerAssignment()
+    run_step(mining, bot)
+
+    assert all(len(mining.workers[mineral]) == 2 for mineral in mining.bases[1])
+    assert all(scv.commands == [(AbilityId.HARVEST_GATHER, bot.mineral_field.tags_in({mining.assignments[scv.tag]})[0], False)] for scv in scvs)
+
+
+def test_gas_only_takes_harvesting_workers_without_a_role():
+    bot, scvs = make_base(16)
+    mining = WorkerAssignment()
+    start_mining(mining, bot, scvs)
+
+    # Every worker but three is busy with something else
+    builder, rallied, role_holder = scvs[0], scvs[1], scvs[2]
+    builder.orders = [order(AbilityId.TERRANBUILD_SUPPLYDEPOT, None)]
+    rallied.orders = [order(AbilityId.MOVE, None)]
+    bot.unit_registry = UnitRegistry()
+    bot.unit_registry.assign(role_holder, "builder")
+    for scv in scvs[6:]:
+        scv.orders = [order(AbilityId.EFFECT_REPAIR, 1)]
+
+    refinery = FakeUnit(50, UnitTypeId.REFINERY, (0, 7), structure=True, has_vespene=True, assigned_harvesters=0)
+    bot.structures.append(refinery)
+    run_step(mining, bot)
+
+    taken = mining.workers[refinery.tag]
+    assert taken == {scv.tag for scv in scvs[3:6]}
+    assert all(scv.commands == [(AbilityId.HARVEST_GATHER, refinery, False)] for scv in scvs[3:6])
+    assert not builder.commands and not rallied.commands and not role_holder.commands
+
+
+def test_returning_worker_is_moved_after_its_cargo():
+    bot, scvs = make_base(4)
+    mining = WorkerAssignment()
+    start_mining(mining, bot, scvs)
+    for scv in scvs:
+        scv.orders = [order(AbilityId.HARVEST_RETURN, 1)]
+        scv.is_carrying_resource = True
+
+    refinery = FakeUnit(50, UnitTypeId.REFINERY, (0, 7), structure=True, has_vespene=True, assigned_harvesters=0)
+    bot.structures.append(refinery)
+    run_step(mining, bot)
+
+    moved = [scv for scv in scvs if mining.assignments[scv.tag] == refinery.tag]
+    assert len(moved) == 3
+    assert all(scv.commands == [(AbilityId.HARVEST_RETURN, None, False), (AbilityId.HARVEST_GATHER, refinery, True)] for scv in moved)
+
+
+def test_new_worker_on_a_rally_is_left_alone_until_idle():
+    bot, scvs = make_base(4)
+    mining = WorkerAssignment()
+    start_mining(mining, bot, scvs)
+
+    rallied = FakeUnit(20, UnitTypeId.SCV, (2, 0), orders=[order(AbilityId.MOVE, None)])
+    bot.units.append(rallied)
+    mining.on_unit_created(rallied)
+    run_step(mining, bot)
+    assert not rallied.commands and rallied.tag not in mining.assignments
+
+    rallied.orders = []
+    run_step(mining, bot)
+    assert rallied.tag in mining.assignments
+    assert rallied.commands[0][0] == AbilityId.HARVEST_GATHER
+
+
+def test_destroyed_patch_releases_its_workers():
+    bot, scvs = make_base(16)
+    mining = WorkerAssignment()
+    start_mining(mining, bot, scvs)
+
+    patch = mining.bases[1][0]
+    miners = set(mining.workers[patch])
+    bot.mineral_field = bot.mineral_field.__class__(m for m in bot.mineral_field if m.tag != patch)
+    mining.on_unit_destroyed(patch)
+
+    assert patch not in mining.bases[1]
+    assert miners <= mining.pending
+    run_step(mining, bot)
+    assert all(mining.assignments[tag] in mining.bases[1] for tag in miners)
+
+
+def test_empty_patches_of_another_base_before_doubling_up():
+    bot, scvs = make_base(12)
+    bot.structures.append(FakeUnit(2, UnitTypeId.COMMANDCENTER, (40, 0), structure=True))
+    bot.mineral_field.extend(FakeUnit(200 + i, UnitTypeId.MINERALFIELD, (47, i - 4)) for i in range(8))
+    mining = WorkerAssignment()
+    run_step(mining, bot)
+
+    assert all(len(mining.workers[mineral]) == 1 for mineral in mining.bases[1])
+    assert mining.base_workers[1] == 8 and mining.base_workers[2] == 4
@@ -0,0 +1,37 @@
+from sc2.position import Point2
+
+from strategy.occupancy import SlotOccupancy
+
+# Three 3x3 slots side by side, in preference order
+BLOCKS = [[0, 0, 3, 3], [3, 0, 3, 3], [6, 0, 3, 3]]
+
+
+def test_structures_take_the_slots_under_their_footprint():
+    occupancy = SlotOccupancy(12, 6, BLOCKS)
+    assert occupancy.next_free() == 0
+
+    assert occupancy.occupy(1, Point2((1.5, 1.5)), 1.5) == [0]
+    assert occupancy.next_free() == 1
+    assert occupancy.next_free(skip=1) == 2
+    assert occupancy.next_free(skip=2) is None
+
+    # Placed across two slots: both are taken
+    assert occupancy.occupy(2, Point2((6.0, 1.5)), 1.5) == [1, 2]
+    assert occupancy.next_free() is None
+    # Outside of every slot
+    assert occupancy.occupy(3, Point2((10.5, 4.5)), 1.0) == []
+
+
+def test_released_slots_are_free_again_once_empty():
+    occupancy = SlotOccupancy(12, 6, BLOCKS)
+    occupancy.occupy(1, Point2((1.5, 1.5)), 1.5)
+    occupancy.occupy(2, Point2((1.5, 1.5)), 1.0)  # a second structure on slot 0
+    occupancy.occupy(3, Point2((4.5, 1.5)), 1.5)
+    assert occupancy.next_free() == 2
+
+    occupancy.release(1)
+    assert occupancy.next_free() == 2
+    occupancy.release(2)
+    assert occupancy.next_free() == 0
+    occupancy.release(4)  # unknown tag
+    assert occupancy.next_free(skip=1) == 2
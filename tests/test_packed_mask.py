@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from strategy.packed_mask import BitPlaneMask, CroppedMasks
+
+
+def test_bit_planes_read_and_write_like_a_bool_array():
+    rng = np.random.default_rng(0)
+    reference = rng.random((12, 9, 5)) > 0.5
+    mask = BitPlaneMask(12, 9, 5)
+    for plane in range(5):
+        mask[:, :, plane] = reference[:, :, plane]
+
+    assert mask.shape == reference.shape
+    assert mask.nbytes == 12 * 9
+    assert np.array_equal(np.asarray(mask), reference)
+    assert np.array_equal(mask[3:7, 2, 1:4], reference[3:7, 2, 1:4])
+    assert mask[4, 5, 2] == reference[4, 5, 2]
+    assert np.array_equal(mask.any(axis=2), reference.any(axis=2))
+
+    # Clearing one plane leaves the others
+    mask[2:5, :, 3] = False
+    reference[2:5, :, 3] = False
+    assert np.array_equal(np.asarray(mask), reference)
+
+
+def test_bit_planes_need_three_indexes():
+    mask = BitPlaneMask(4, 4, 2)
+    with pytest.raises(IndexError):
+        mask[1, 1]
+    with pytest.raises(AssertionError):
+        BitPlaneMask(4, 4, 9)
+
+
+def test_cropped_masks_round_trip():
+    reference = np.zeros((16, 12, 3), dtype=bool)
+    reference[2:5, 3:6, 0] = True
+    reference[10, 11, 0] = True
+    reference[7:9, 0:2, 2] = True  # layer 1 is empty
+    masks = CroppedMasks(16, 12, 3)
+    for layer in range(3):
+        masks.set_layer(layer, 0, 0, reference[:, :, layer])
+
+    assert np.array_equal(np.asarray(masks), reference)
+    assert masks[3, 4, 0] and not masks[3, 4, 2] and not masks[0, 0, 1]
+    assert masks.bounds().tolist() == [[2, 3, 9, 9], [0, 0, 0, 0], [7, 0, 2, 2]]
+
+    loaded = CroppedMasks(16, 12, 3)
+    loaded.load_arrays("mask", masks.to_arrays("mask"))
+    assert np.array_equal(np.asarray(loaded), reference)
+
+
+def test_cropped_masks_write_in_place_and_grow_when_needed():
+    reference = np.zeros((16, 12, 2), dtype=bool)
+    masks = CroppedMasks(16, 12, 2)
+    writes = [
+        ((slice(4, 8), slice(3, 6), 0), True),
+        ((5, 4, 0), False),  # inside the crop
+        ((slice(4, 8), 5, 0), np.array([True, False, True, False])),
+        ((-1, -2, 0), True),  # outside, the crop grows
+        ((np.array([1, 2]), np.array([0, 1]), 1), True),
+        ((slice(None), slice(None), 1), False),
+        ((slice(7, 2, -2), slice(3, 5), 0), False),
+        ((0, 0, 1), False),  # clearing an empty layer
+    ]
+    for (x, y, layer), value in writes:
+        masks[x, y, layer] = value
+        reference[x, y, layer] = value
+        assert np.array_equal(np.asarray(masks), reference)
+
+    # A write inside the crop keeps its array
+    data = masks.crops[0][2]
+    masks[6, 4, 0] = True
+    assert masks.crops[0][2] is data and masks[6, 4, 0]
+    assert masks.crops[1] is None  # cleared layers are trimmed away
@@ -0,0 +1,58 @@
+import asyncio
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+
+from tactical.ramp import get_depot_command_times, handle_ramp_depots
+from tests.fakes import FakeBot, FakeUnit
+
+
+class StubClient:
+    """Advances the bot's game loop on each step and yields to the event loop, like a client round trip."""
+
+    def __init__(self, bot: FakeBot):
+        self.bot = bot
+
+    async def step(self) -> None:
+        await asyncio.sleep(0)
+        self.bot.step(0.5)
+
+
+async def play(bot: FakeBot, steps: int) -> None:
+    client = StubClient(bot)
+    for _ in range(steps):
+        await handle_ramp_depots(bot)
+        await client.step()
+
+
+def make_bot(enemy_near: bool):
+    # Same depot tag in both games: tags are only unique within a game
+    depot = FakeUnit(7, UnitTypeId.SUPPLYDEPOTLOWERED, (10, 10), structure=True)
+    enemies = [FakeUnit(99, UnitTypeId.ZERGLING, (12, 10))] if enemy_near else []
+    return FakeBot(structures=[depot], enemy_units=enemies), depot
+
+
+def test_concurrent_bots_keep_their_own_depot_cooldowns():
+    attacked, attacked_depot = make_bot(enemy_near=True)
+    quiet, quiet_depot = make_bot(enemy_near=False)
+
+    async def games():
+        await asyncio.gather(play(attacked, 4), play(quiet, 4))
+
+    asyncio.run(games())
+
+    assert get_depot_command_times(attacked) == {7: 0.0}
+    assert get_depot_command_times(quiet) == {}
+    assert get_depot_command_times(attacked) is not get_depot_command_times(quiet)
+    assert [command[0] for command in attacked_depot.commands] == [AbilityId.MORPH_SUPPLYDEPOT_RAISE]
+    assert quiet_depot.commands == []
+
+
+def test_destroyed_depot_cooldown_is_dropped():
+    bot, depot = make_bot(enemy_near=True)
+    asyncio.run(play(bot, 1))
+    assert 7 in get_depot_command_times(bot)
+
+    bot.structures.remove(depot)
+    asyncio.run(play(bot, 1))
+    assert get_depot_command_times(bot) == {}
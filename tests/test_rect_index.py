@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from strategy.rect_index import FreeRectIndex
+
+
+def brute_free(free, x, y, w, h):
+    width, height = free.shape
+    return 0 <= x and 0 <= y and x + w <= width and y + h <= height and bool(free[x:x + w, y:y + h].all())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_queries_match_a_brute_force_scan_after_occupying(seed):
+    rng = np.random.default_rng(seed)
+    free = rng.random((20, 16)) > 0.15
+    index = FreeRectIndex(free)
+
+    for _ in range(6):
+        x, y, w, h = int(rng.integers(0, 18)), int(rng.integers(0, 14)), int(rng.integers(1, 5)), int(rng.integers(1, 5))
+        index.occupy(x, y, w, h)
+        free[x:x + w, y:y + h] = False
+
+    # The table is updated in place exactly like a rebuilt one
+    assert np.array_equal(index.sat, FreeRectIndex(free).sat)
+    for w, h in ((1, 1), (2, 3), (3, 3), (5, 2)):
+        positions = index.free_positions(w, h)
+        for x in range(-1, 21):
+            for y in range(-1, 17):
+                expected = brute_free(free, x, y, w, h)
+                assert index.is_free(x, y, w, h) == expected
+                if 0 <= x < positions.shape[0] and 0 <= y < positions.shape[1]:
+                    assert positions[x, y] == expected
+
+
+def test_first_free_scans_rows_then_columns():
+    free = np.ones((6, 5), dtype=bool)
+    free[:, 0] = False  # bottom row taken
+    free[0:2, 1] = False
+    index = FreeRectIndex(free)
+
+    assert index.first_free(2, 2) == (2, 1)
+    index.occupy(2, 1, 4, 4)
+    assert index.first_free(2, 2) == (0, 2)
+    index.occupy(0, 0, 6, 5)
+    assert index.first_free(1, 1) is None
+    assert index.first_free(7, 1) is None
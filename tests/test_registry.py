@@ -0,0 +1,100 @@
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from micro.registry import UnitRegistry, get_registry
+from tests.fakes import FakeBot, FakeUnit
+
+
+def make_bot():
+    command_center = FakeUnit(1, UnitTypeId.COMMANDCENTER, (10, 10), structure=True)
+    workers = [FakeUnit(10 + i, UnitTypeId.SCV, (12, 10)) for i in range(3)]
+    bot = FakeBot(units=workers, structures=[command_center])
+    bot.expansion_locations_list = [Point2((10, 10)), Point2((50, 10))]
+    return bot
+
+
+def test_events_index_by_type_and_base():
+    bot = make_bot()
+    registry = UnitRegistry()
+    registry.on_building_construction_complete(bot.structures[0], bot)  # starting townhall
+    for worker in bot.units:
+        registry.on_unit_created(worker)
+    depot = FakeUnit(2, UnitTypeId.SUPPLYDEPOT, (14, 14), structure=True, is_ready=False)
+    bot.structures.append(depot)
+    registry.on_building_construction_started(depot, bot)
+
+    assert registry.tags(UnitTypeId.SCV) == {10, 11, 12}
+    assert registry.tags(UnitTypeId.SUPPLYDEPOT) == {2}
+    assert registry.tags(UnitTypeId.SUPPLYDEPOT, ready=True) == set()
+    assert {unit.tag for unit in registry.at_base(bot, 0)} == {1, 2}
+    assert not registry.at_base(bot, 1)
+
+    registry.on_building_construction_complete(depot, bot)
+    assert [unit.tag for unit in registry.units(bot, UnitTypeId.SUPPLYDEPOT, ready=True)] == [2]
+
+    depot.type_id = UnitTypeId.SUPPLYDEPOTLOWERED
+    registry.on_unit_type_changed(depot, UnitTypeId.SUPPLYDEPOT)
+    assert registry.tags(UnitTypeId.SUPPLYDEPOT) == set()
+    assert registry.tags((UnitTypeId.SUPPLYDEPOT, UnitTypeId.SUPPLYDEPOTLOWERED), ready=True) == {2}
+
+    registry.on_unit_destroyed(2)
+    assert registry.tags(UnitTypeId.SUPPLYDEPOTLOWERED) == set()
+    assert 2 not in registry.by_base[0]
+
+
+def test_roles_are_unique_per_unit_and_released_on_death():
+    bot = make_bot()
+    registry = UnitRegistry()
+    for worker in bot.units:
+        registry.on_unit_created(worker)
+
+    registry.assign(bot.units[0], "scout")
+    registry.assign(bot.units[1], "builder")
+    registry.assign(bot.units[2], "builder")
+    assert [unit.tag for unit in registry.role(bot, "builder")] == [11, 12]  # assignment order
+
+    registry.assign(bot.units[1], "scout")  # one role per unit
+    assert registry.role_of[11] == "scout"
+    assert [unit.tag for unit in registry.role(bot, "builder")] == [12]
+
+    registry.assign(bot.units[2], "scout", exclusive=True)
+    assert [unit.tag for unit in registry.role(bot, "scout")] == [12]
+    assert 10 not in registry.role_of and 11 not in registry.role_of
+
+    registry.on_unit_destroyed(12)
+    assert registry.first(bot, "scout") is None
+    assert not registry.by_role["scout"]
+
+
+def test_role_lookup_skips_units_not_seen_this_step():
+    bot = make_bot()
+    registry = UnitRegistry()
+    for worker in bot.units:
+        registry.on_unit_created(worker)
+    registry.assign(bot.units[0], "scout")
+    assert registry.first(bot, "scout").tag == 10
+
+    # Loaded in a transport: still registered, but not resolved
+    bot.units.pop(0)
+    bot.step()
+    assert registry.first(bot, "scout") is None
+    assert registry.role_of[10] == "scout"
+
+
+def test_polled_registry_syncs_from_the_observation():
+    bot = make_bot()
+    registry = get_registry(bot)
+    assert registry.polled and get_registry(bot) is registry
+
+    assert registry.tags(UnitTypeId.SCV) == set()  # nothing looked up yet
+    assert len(registry.units(bot, UnitTypeId.SCV)) == 3
+    assert registry.tags(UnitTypeId.COMMANDCENTER, ready=True) == {1}
+
+    # Next step: a worker died, the command center became an orbital
+    bot.units.pop(0)
+    bot.structures[0].type_id = UnitTypeId.ORBITALCOMMAND
+    bot.step()
+    assert {unit.tag for unit in registry.units(bot, UnitTypeId.SCV)} == {11, 12}
+    assert registry.tags(UnitTypeId.ORBITALCOMMAND) == {1}
+    assert registry.tags(UnitTypeId.COMMANDCENTER) == set()
+    assert 10 not in registry.type_of
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from strategy.scheduler import HIGH, LOW, TaskScheduler
+from strategy.timing import StepTimer
+from tests.fakes import FakeBot
+
+
+def recorder(runs: list, name: str):
+    async def function(bot):
+        runs.append(name)
+    return function
+
+
+def run_steps(scheduler: TaskScheduler, steps: range) -> None:
+    async def play():
+        for iteration in steps:
+            await scheduler.run(iteration)
+    asyncio.run(play())
+
+
+def test_tasks_run_on_their_period_and_phase():
+    runs = []
+    scheduler = TaskScheduler(FakeBot())
+    scheduler.add("every", recorder(runs, "every"))
+    scheduler.add("fourth", recorder(runs, "fourth"), period=4, phase=1)
+
+    run_steps(scheduler, range(8))
+
+    assert runs.count("every") == 8
+    assert runs.count("fourth") == 2
+    # Phases not given are spread over the least loaded steps
+    assert scheduler.add("other", recorder(runs, "other"), period=4).phase != 1
+
+
+def test_conditional_tasks_only_run_while_enabled():
+    runs, enabled = [], [False]
+    scheduler = TaskScheduler(FakeBot())
+    scheduler.add("hand_over", recorder(runs, "hand_over"), when=lambda: enabled[0])
+
+    run_steps(scheduler, range(3))
+    enabled[0] = True
+    run_steps(scheduler, range(3, 5))
+
+    assert runs == ["hand_over", "hand_over"]
+
+
+def test_low_priority_tasks_wait_when_over_budget():
+    runs = []
+    scheduler = TaskScheduler(FakeBot(), budget_ms=-1.0)  # always over budget
+    scheduler.add("low", recorder(runs, "low"), period=2, phase=0, priority=LOW)
+    scheduler.add("high", recorder(runs, "high"), priority=HIGH)
+
+    run_steps(scheduler, range(4))
+
+    assert runs.count("high") == 4
+    # Deferred for at most a period: skipped on steps 0-1, forced on step 2
+    assert runs == ["high", "high", "low", "high", "high"]
+    assert scheduler.skipped == 2
+
+
+def test_each_task_is_timed_once_per_step():
+    bot = FakeBot()
+    bot.timer = StepTimer()
+    scheduler = TaskScheduler(bot)
+    scheduler.add("macro", recorder([], "macro"))
+    scheduler.add("mining", recorder([], "mining"), period=2, phase=0)
+    with pytest.raises(AssertionError):
+        scheduler.add("mining", recorder([], "mining"))
+
+    async def play():
+        for iteration in range(4):
+            bot.timer.start_step()
+            await scheduler.run(iteration)
+            bot.timer.end_step()
+    asyncio.run(play())
+
+    assert bot.timer.counts == {"macro": 4, "mining": 2, "step": 4}
@@ -0,0 +1,125 @@
+"""
+Benchmark of the build-order counting functions on a synthetic 200-supply Terran state.
+Compares one census per step (what Macro.produce does) with rebuilding it on every call
+(the per-call scans the counting functions used to do).
+
+Run from the repository root: python -m tools.census_benchmark
+"""
+import random
+import time
+from types import SimpleNamespace
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+
+from macro.macro import BUILD_ORDER, PRODUCTION_STRUCTURES as MACRO_STRUCTURES
+from micro.production import count_structure, count_units
+
+CREATION_ABILITIES = {
+    UnitTypeId.SCV: AbilityId.COMMANDCENTERTRAIN_SCV,
+    UnitTypeId.MARINE: AbilityId.BARRACKSTRAIN_MARINE,
+    UnitTypeId.REAPER: AbilityId.BARRACKSTRAIN_REAPER,
+    UnitTypeId.SIEGETANK: AbilityId.FACTORYTRAIN_SIEGETANK,
+    UnitTypeId.MEDIVAC: AbilityId.STARPORTTRAIN_MEDIVAC,
+    UnitTypeId.VIKINGFIGHTER: AbilityId.STARPORTTRAIN_VIKINGFIGHTER,
+    UnitTypeId.MULE: AbilityId.CALLDOWNMULE_CALLDOWNMULE,
+    UnitTypeId.SUPPLYDEPOT: AbilityId.TERRANBUILD_SUPPLYDEPOT,
+    UnitTypeId.BARRACKS: AbilityId.TERRANBUILD_BARRACKS,
+    UnitTypeId.REFINERY: AbilityId.TERRANBUILD_REFINERY,
+    UnitTypeId.COMMANDCENTER: AbilityId.TERRANBUILD_COMMANDCENTER,
+    UnitTypeId.FACTORY: AbilityId.TERRANBUILD_FACTORY,
+    UnitTypeId.STARPORT: AbilityId.TERRANBUILD_STARPORT,
+    UnitTypeId.BUNKER: AbilityId.TERRANBUILD_BUNKER,
+    UnitTypeId.ORBITALCOMMAND: AbilityId.UPGRADETOORBITAL_ORBITALCOMMAND,
+    UnitTypeId.BARRACKSTECHLAB: AbilityId.BUILD_TECHLAB_BARRACKS,
+    UnitTypeId.FACTORYTECHLAB: AbilityId.BUILD_TECHLAB_FACTORY,
+    UnitTypeId.STARPORTTECHLAB: AbilityId.BUILD_TECHLAB_STARPORT,
+}
+
+
+class FakeGameData:
+    def __init__(self):
+        self.units = {
+            unit_type.value: SimpleNamespace(creation_ability=SimpleNamespace(id=CREATION_ABILITIES[unit_type]) if unit_type in CREATION_ABILITIES else None)
+            for unit_type in UnitTypeId
+        }
+
+
+def order(ability: AbilityId):
+    return SimpleNamespace(ability=SimpleNamespace(id=ability))
+
+
+def unit(unit_type: UnitTypeId, orders=(), ready=True, passengers=()):
+    return SimpleNamespace(type_id=unit_type, orders=list(orders), is_ready=ready, passengers=list(passengers))
+
+
+def synthetic_state(seed: int = 0) -> SimpleNamespace:
+    """A 200 supply army: 70 SCVs, 60 marines, 10 tanks, 8 medivacs and the structures to go with them."""
+    rng = random.Random(seed)
+    units = []
+    for _ in range(70):
+        orders = [order(AbilityId.HARVEST_GATHER)]
+        if rng.random() < 0.05:
+            orders = [order(rng.choice([AbilityId.TERRANBUILD_SUPPLYDEPOT, AbilityId.TERRANBUILD_BARRACKS]))]
+        units.append(unit(UnitTypeId.SCV, orders))
+    units += [unit(UnitTypeId.MARINE, [order(AbilityId.ATTACK)]) for _ in range(56)]
+    units += [unit(UnitTypeId.SIEGETANK) for _ in range(10)]
+    units += [unit(UnitTypeId.MEDIVAC, passengers=[unit(UnitTypeId.MARINE)]) for _ in range(8)]
+
+    structures = [unit(UnitTypeId.ORBITALCOMMAND, [order(AbilityId.COMMANDCENTERTRAIN_SCV)]) for _ in range(3)]
+    structures += [unit(UnitTypeId.BARRACKS, [order(AbilityId.BARRACKSTRAIN_MARINE)] * 2) for _ in range(10)]
+    structures += [unit(UnitTypeId.FACTORY, [order(AbilityId.FACTORYTRAIN_SIEGETANK)]) for _ in range(3)]
+    structures += [unit(UnitTypeId.STARPORT, [order(AbilityId.STARPORTTRAIN_MEDIVAC)]) for _ in range(2)]
+    structures += [unit(UnitTypeId.SUPPLYDEPOTLOWERED) for _ in range(24)]
+    structures += [unit(UnitTypeId.REFINERY) for _ in range(6)]
+    structures += [unit(UnitTypeId.BARRACKSTECHLAB) for _ in range(3)]
+    structures += [unit(UnitTypeId.BUNKER, passengers=[unit(UnitTypeId.MARINE)] * 4)]
+
+    return SimpleNamespace(
+        units=units,
+        structures=structures,
+        state=SimpleNamespace(game_loop=0),
+        game_data=FakeGameData(),
+        supply_workers=70,
+    )
+
+
+def count_build_order(bot, rebuild: bool = False) -> None:
+    """The counting Macro.produce does for every build-order entry, optionally without the per-step cache."""
+    for entry in BUILD_ORDER:
+        if isinstance(entry, dict):
+            if rebuild:
+                bot._census = None
+            unit_type, _ = next(iter(entry.items()))
+            if unit_type in MACRO_STRUCTURES | {UnitTypeId.SUPPLYDEPOT}:
+                count_structure(bot, unit_type)
+            else:
+                count_units(bot, unit_type)
+
+
+def benchmark(steps: int = 500) -> dict:
+    bot = synthetic_state()
+    results = {}
+
+    # One census per step
+    start = time.perf_counter()
+    for step in range(steps):
+        bot.state.game_loop = step
+        count_build_order(bot)
+    results["per_step"] = (time.perf_counter() - start) / steps
+
+    # Census rebuilt on every call, as expensive as scanning the units per call
+    start = time.perf_counter()
+    for step in range(steps):
+        bot.state.game_loop = step
+        count_build_order(bot, rebuild=True)
+    results["per_call"] = (time.perf_counter() - start) / steps
+
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print(f"Census built once per step: {results['per_step'] * 1e6:8.1f} us/step")
+    print(f"Census rebuilt per call:    {results['per_call'] * 1e6:8.1f} us/step")
+    print(f"Speedup: {results['per_call'] / results['per_step']:.1f}x")
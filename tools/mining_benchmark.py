@@ -0,0 +1,122 @@
+"""
+Offline mining-throughput benchmark of the worker-assignment strategies, on the synthetic layouts of
+simulation.mining. The model is deterministic: scores are compared exactly against the JSON baseline.
+
+Run from the repository root: python -m tools.mining_benchmark [--update]
+"""
+import argparse
+import json
+import os
+import sys
+
+from sc2.ids.unit_typeid import UnitTypeId
+
+from micro.mining import WorkerAssignment
+from simulation.mining import MiningModel
+
+BASELINE = os.path.join(os.path.dirname(__file__), "mining_baseline.json")
+
+# Scenario -> (layout, starting workers, workers trained up to, game seconds)
+SCENARIOS = {
+    "standard_16_60s": ("standard", 12, 16, 60.0),
+    "standard_24_180s": ("standard", 12, 24, 180.0),
+    "far_20_120s": ("far", 12, 20, 120.0),
+    "two_base_32_180s": ("two_base", 12, 32, 180.0),
+}
+
+
+class BackToMining:
+    """The former micro.worker.back_to_mining: idle workers go to the closest patch."""
+
+    async def step(self, bot):
+        for scv in bot.workers.idle:
+            scv.gather(bot.mineral_field.closest_to(scv))
+
+
+class FastMining:
+    """The former FastMiningBot.distribute_workers + micro_workers: fewest assigned patch, up to 3, then closest."""
+
+    def __init__(self):
+        self.worker_assignment = {}
+
+    async def step(self, bot):
+        nearby_mineral = []
+        for cc in bot.townhalls:
+            nearby_mineral.extend([m for m in bot.mineral_field if m.distance_to(cc) < 10])
+
+        for worker in bot.units(UnitTypeId.SCV):
+            if worker.tag in self.worker_assignment:
+                continue
+
+            def assigned_harvesters(resource):
+                return sum(1 for w in bot.units(UnitTypeId.SCV) if self.worker_assignment.get(w.tag) == resource)
+
+            available_minerals = [m for m in nearby_mineral if assigned_harvesters(m) < 3]
+            if available_minerals:
+                available_minerals.sort(key=lambda m: (assigned_harvesters(m), m.distance_to(worker)))
+                self.worker_assignment[worker.tag] = available_minerals[0]
+                worker.gather(available_minerals[0])
+
+        for worker in bot.workers.idle:
+            if worker.tag in self.worker_assignment:
+                worker.gather(self.worker_assignment[worker.tag])
+
+
+STRATEGIES = {
+    "back_to_mining": BackToMining,
+    "fast_mining": FastMining,
+    "assignment_manager": WorkerAssignment,  # micro.mining, what the bots run now
+}
+
+
+def benchmark(strategies=tuple(STRATEGIES), scenarios=tuple(SCENARIOS)) -> dict[str, dict[str, int]]:
+    """Minerals mined per strategy and scenario."""
+    results = {}
+    for strategy in strategies:
+        results[strategy] = {}
+        for scenario in scenarios:
+            layout, workers, target_workers, duration = SCENARIOS[scenario]
+            model = MiningModel(layout, workers, target_workers)
+            results[strategy][scenario] = model.run(STRATEGIES[strategy](), duration)
+    return results
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """Print the results next to the baseline, returns the regressions."""
+    regressions = []
+    print(f"{'strategy':<20}{'scenario':<20}{'mined':>8}{'baseline':>10}")
+    for strategy, scores in results.items():
+        for scenario, mined in scores.items():
+            expected = baseline.get(strategy, {}).get(scenario)
+            print(f"{strategy:<20}{scenario:<20}{mined:>8}{expected if expected is not None else '-':>10}")
+            if expected is not None and mined < expected:
+                regressions.append(f"{strategy} {scenario}: {mined} < {expected}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worker assignment on a deterministic mining model")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), action="append", help="all by default")
+    parser.add_argument("--update", action="store_true", help=f"write the results as the new baseline ({BASELINE})")
+    args = parser.parse_args()
+
+    results = benchmark(tuple(args.strategy or STRATEGIES))
+    if args.update:
+        with open(BASELINE, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+        print(f"Baseline written to {BASELINE}")
+        return
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as file:
+            baseline = json.load(file)
+    regressions = compare(results, baseline)
+    if regressions:
+        print("Regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()